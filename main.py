@@ -1,11 +1,31 @@
-from PyQt6.QtGui import QIcon
-from PyQt6.QtWidgets import QApplication
 import sys
-from src.ui.main_window import MainWindow
 
-if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    app.setWindowIcon(QIcon("data/icon.png"))
-    window = MainWindow()
+from src.utils.startup_timer import startup_timer
+
+
+def run_gui():
+    with startup_timer.measure("import PyQt6"):
+        from PyQt6.QtCore import QTimer
+        from PyQt6.QtGui import QIcon
+        from PyQt6.QtWidgets import QApplication
+    with startup_timer.measure("import src.ui.main_window"):
+        from src.ui.main_window import MainWindow
+
+    with startup_timer.measure("QApplication"):
+        app = QApplication(sys.argv)
+        app.setWindowIcon(QIcon("data/icon.png"))
+    with startup_timer.measure("MainWindow"):
+        window = MainWindow()
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    # Olay döngüsü başlayıp pencere çizildikten sonra çalışır
+    QTimer.singleShot(0, window.on_startup_finished)
+    return app.exec()
+
+
+if __name__ == "__main__":
+    # Komut satırı alt komutları PyQt6'yı hiç yüklemez
+    if len(sys.argv) > 1 and sys.argv[1] == "label":
+        from src.cli import main
+
+        sys.exit(main(sys.argv[1:]))
+    sys.exit(run_gui())
@@ -0,0 +1,186 @@
+"""
+Arayüzsüz toplu etiketleme
+
+    python main.py label --model m.pt --conf 0.4 --workers 8 KLASÖR
+
+Bu yol PyQt6'yı hiç içe aktarmaz; ekranı olmayan sunucularda ve
+zamanlanmış görevlerde çalışır.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from src.utils.annotation_manager import AnnotationManager
+from src.utils.model_handler import IMAGE_EXTENSIONS, ModelHandler
+
+# Çıkış kodları
+EXIT_OK = 0
+EXIT_FAILED_IMAGES = 1  # Bazı resimler işlenemedi
+EXIT_ERROR = 2  # Model yüklenemedi, klasör/resim yok vb.
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="main.py label",
+        description="Bir klasördeki resimleri YOLOv8 modeliyle etiketler (arayüzsüz)",
+    )
+    parser.add_argument("folder", help="Resimlerin bulunduğu klasör")
+    parser.add_argument("--model", required=True, help="Model dosyası (.pt ya da .onnx)")
+    parser.add_argument(
+        "--conf", type=float, default=0.5, help="Güven eşiği (varsayılan: 0.5)"
+    )
+    parser.add_argument(
+        "--output",
+        default="",
+        help="Etiket klasörü (varsayılan: KLASÖR/annotations, arayüzle aynı)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["yolo", "standard"],
+        default="yolo",
+        help="Etiket biçimi (varsayılan: yolo)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["pytorch", "onnx", "onnx_int8"],
+        default="pytorch",
+        help="Çıkarım arka ucu (varsayılan: pytorch)",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=8, help="Bir ileri geçişteki resim sayısı"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="İşçi işlem sayısı; her biri modelin kendi kopyasını yükler (varsayılan: 1)",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=0,
+        help="İşlem başına çıkarım iş parçacığı (0: çekirdekler işlemlere bölünür)",
+    )
+    parser.add_argument(
+        "--decode-workers",
+        type=int,
+        default=0,
+        help="Resimleri ayrı işlemlerde çözen işçi sayısı (0: iş parçacıkları)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Yarım kalan son çalışmayı sürdürür (aynı model ve eşikle etiketlenmiş resimler atlanır)",
+    )
+    return parser
+
+
+def list_images(folder_path):
+    """Klasördeki resimler (arayüzdeki gibi alt klasörlere inilmez)"""
+    return sorted(
+        os.path.join(folder_path, name)
+        for name in os.listdir(folder_path)
+        if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+    )
+
+
+def run_label(args):
+    """label komutunu çalıştırır ve çıkış kodunu döndürür"""
+    if not os.path.isdir(args.folder):
+        print(f"Klasör bulunamadı: {args.folder}", file=sys.stderr)
+        return EXIT_ERROR
+
+    if not os.path.isfile(args.model):
+        print(f"Model dosyası bulunamadı: {args.model}", file=sys.stderr)
+        return EXIT_ERROR
+
+    image_paths = list_images(args.folder)
+    if not image_paths:
+        print(f"Klasörde resim bulunamadı: {args.folder}", file=sys.stderr)
+        return EXIT_ERROR
+
+    output_dir = args.output or os.path.join(args.folder, "annotations")
+    os.makedirs(output_dir, exist_ok=True)
+
+    annotation_manager = AnnotationManager()
+    annotation_manager.output_format = args.format
+    # Mevcut etiketler okunmaz; tespitler onların yerine yazılır
+    annotation_manager.initialize(image_paths, output_dir, lazy=True)
+
+    model_handler = ModelHandler(annotation_manager)
+    model_handler.backend_name = args.backend
+    model_handler.confidence_threshold = args.conf
+    model_handler.batch_size = max(1, args.batch_size)
+    model_handler.processes = max(1, args.workers)
+    model_handler.threads_per_process = max(0, args.threads)
+    model_handler.decode_processes = max(0, args.decode_workers)
+
+    try:
+        success, message = model_handler.load_model(args.model)
+        if not success:
+            print(message, file=sys.stderr)
+            return EXIT_ERROR
+
+        failed = []
+        processed = [0]
+        last_report = [time.perf_counter()]
+        started = time.perf_counter()
+
+        def on_progress(done, total, image_path, num_objects):
+            processed[0] = done
+            if num_objects < 0:
+                failed.append(image_path)
+                print(f"Hata: Nesne tespiti başarısız - {image_path}", file=sys.stderr)
+            now = time.perf_counter()
+            if now - last_report[0] >= 2.0 or done == total:
+                last_report[0] = now
+                rate = done / (now - started) if now > started else 0.0
+                print(f"{done}/{total} resim, {rate:.1f} resim/sn")
+
+        try:
+            success, message = model_handler.detect_batch(
+                image_paths,
+                progress_callback=on_progress,
+                save_format=args.format,
+                resume=args.resume,
+            )
+        except KeyboardInterrupt:
+            print("İşlem kesildi; --resume ile kaldığı yerden sürdürülebilir", file=sys.stderr)
+            return EXIT_ERROR
+        except Exception as e:
+            print(f"Toplu işlem sırasında hata: {e}", file=sys.stderr)
+            return EXIT_ERROR
+        elapsed = time.perf_counter() - started
+        if not success:
+            print(message, file=sys.stderr)
+            return EXIT_ERROR
+
+        annotation_manager.save_classes()
+        print(message)
+        print(
+            f"Süre: {elapsed:.1f} sn, {processed[0] / elapsed:.1f} resim/sn "
+            f"({model_handler.processes} işlem, arka uç: {model_handler.backend_name})"
+        )
+        print(f"Etiketler: {output_dir}")
+        return EXIT_FAILED_IMAGES if failed else EXIT_OK
+    finally:
+        model_handler.detection_cache.close()
+        annotation_manager.close()
+
+
+def main(argv):
+    """
+    Komut satırı girişi
+
+    Args:
+        argv (list): Alt komut ve argümanları (ör. ["label", "--model", ...])
+
+    Returns:
+        int: Çıkış kodu
+    """
+    if not argv or argv[0] != "label":
+        print("Kullanım: python main.py label --model MODEL [seçenekler] KLASÖR")
+        return EXIT_ERROR
+    return run_label(build_parser().parse_args(argv[1:]))
@@ -0,0 +1,120 @@
+import threading
+import time
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+
+class BatchWorker(QThread):
+    """Toplu otomatik etiketlemeyi GUI iş parçacığının dışında çalıştırır"""
+
+    # Her resim işlendiğinde: (resim yolu, tespitler ya da None)
+    image_done = pyqtSignal(str, object)
+    # Sabit aralıklarla: (işlenen, toplam, son resim yolu, toplam nesne)
+    progress = pyqtSignal(int, int, str, int)
+    # İş bittiğinde: (iptal edildi mi, işlenen, başarısız, toplam nesne,
+    # tamamlandı mı - tüm resimler hatasız işlendiyse True)
+    finished_run = pyqtSignal(bool, int, int, int, bool)
+    error = pyqtSignal(str)
+
+    def __init__(
+        self, model_handler, image_paths, batch_size=None, writer=None, parent=None
+    ):
+        super().__init__(parent)
+        self.model_handler = model_handler
+        self.image_paths = list(image_paths)
+        self.batch_size = batch_size
+        self.writer = writer  # Etiketleri bittikçe diske yazan yazma aşaması
+        self.progress_interval = 0.1  # İlerleme sinyalleri arası en az süre (sn)
+
+        self._cancelled = False
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+
+    def run(self):
+        total = len(self.image_paths)
+        done = 0
+        failed = 0
+        total_objects = 0
+        last_emit = 0.0
+        last_path = ""
+        errored = False
+
+        detections_iter = self.model_handler.iter_detections(
+            self.image_paths, self.batch_size, writer=self.writer
+        )
+        try:
+            for image_path, detections in detections_iter:
+                done += 1
+                last_path = image_path
+                if detections is None:
+                    failed += 1
+                else:
+                    total_objects += len(detections)
+
+                # Sonuçlar GUI iş parçacığında annotation manager'a yazılır
+                self.image_done.emit(image_path, detections)
+
+                # İlerlemeyi sabit hızla bildir
+                now = time.monotonic()
+                if now - last_emit >= self.progress_interval:
+                    self.progress.emit(done, total, image_path, total_objects)
+                    last_emit = now
+
+                # Duraklatıldıysa devam edilene kadar bekle
+                self._resume_event.wait()
+                if self._cancelled:
+                    break
+        except Exception as e:
+            print(f"Toplu işlem sırasında hata: {e}")
+            errored = True
+            self.error.emit(str(e))
+        finally:
+            # Okuyucuları durdur ve bekleyen yazmaları tamamla
+            detections_iter.close()
+
+        completed = (
+            not self._cancelled and not errored and not failed and done == total
+        )
+        self.progress.emit(done, total, last_path, total_objects)
+        self.finished_run.emit(self._cancelled, done, failed, total_objects, completed)
+
+    def pause(self):
+        """İşlemi bir sonraki resimden sonra duraklatır"""
+        self._resume_event.clear()
+
+    def resume(self):
+        """Duraklatılmış işlemi sürdürür"""
+        self._resume_event.set()
+
+    def is_paused(self):
+        return not self._resume_event.is_set()
+
+    def cancel(self):
+        """İşlemi iptal eder (duraklatılmışsa da)"""
+        self._cancelled = True
+        self._resume_event.set()
+
+
+class ModelTaskWorker(QThread):
+    """
+    Uzun süren tek bir model işini (arka uç karşılaştırması, INT8 nicemleme)
+    GUI iş parçacığının dışında çalıştırır
+
+    task, (success, message) döndüren bir fonksiyondur; sonuç
+    finished_task sinyaliyle GUI iş parçacığına iletilir.
+    """
+
+    # İş bittiğinde: (başarılı mı, mesaj)
+    finished_task = pyqtSignal(bool, str)
+
+    def __init__(self, task, parent=None):
+        super().__init__(parent)
+        self.task = task
+
+    def run(self):
+        try:
+            success, message = self.task()
+        except Exception as e:
+            print(f"İşlem sırasında hata: {e}")
+            success, message = False, f"İşlem sırasında hata: {e}"
+        self.finished_task.emit(success, message)
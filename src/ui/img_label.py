@@ -1,7 +1,49 @@
 from PyQt6.QtWidgets import QLabel
 
-from PyQt6.QtGui import QPainter, QPen, QColor, QMouseEvent, QCursor
-from PyQt6.QtCore import Qt, QRect, QPoint
+from PyQt6.QtGui import QPainter, QPen, QColor, QMouseEvent, QCursor, QPixmap, QStaticText
+from PyQt6.QtCore import Qt, QRect, QPoint, QPointF
+
+from src.ui.rect_index import RectIndex, resize_handle_at
+
+# Sınıf renkleri (sınıf sayısına göre artırılabilir)
+CLASS_COLORS = [
+    QColor(255, 0, 0),  # Kırmızı (default)
+    QColor(0, 255, 0),  # Yeşil
+    QColor(0, 0, 255),  # Mavi
+    QColor(255, 255, 0),  # Sarı
+    QColor(255, 0, 255),  # Magenta
+    QColor(0, 255, 255),  # Cyan
+    QColor(255, 165, 0),  # Turuncu
+    QColor(128, 0, 128),  # Mor
+    QColor(165, 42, 42),  # Kahverengi
+    QColor(0, 128, 0),  # Koyu yeşil
+]
+
+# Seçili dikdörtgenin tutamaç boyutu
+HANDLE_SIZE = 8
+
+_class_pens = {}
+
+
+def class_pens(class_id):
+    """
+    Sınıfın (renk, normal kalem, seçili kalem, üzerine gelme kalemi) dörtlüsü
+
+    Kalemler her sınıf rengi için bir kez oluşturulur.
+    """
+    color_index = class_id % len(CLASS_COLORS)
+    pens = _class_pens.get(color_index)
+    if pens is None:
+        color = CLASS_COLORS[color_index]
+        # Üzerine gelme çizgisi sınıf rengiyle zıt renkte, noktalı çizilir
+        contrast = (
+            QColor(0, 0, 0) if color.lightness() > 127 else QColor(255, 255, 255)
+        )
+        hover_pen = QPen(contrast, 2)
+        hover_pen.setStyle(Qt.PenStyle.DashLine)
+        pens = (color, QPen(color, 2), QPen(color, 3), hover_pen)
+        _class_pens[color_index] = pens
+    return pens
 
 
 class ImageLabel(QLabel):
@@ -10,6 +52,11 @@ class ImageLabel(QLabel):
         self.parent = parent
         self.rectangles = []  # Dikdörtgenler
         self.rectangle_classes = []  # Dikdörtgenlere karşılık gelen sınıflar
+        self.rect_index = RectIndex()  # Nokta sorguları için uzamsal indeks
+        # Çizim önbelleği: seçili olmayan dikdörtgenlerin katmanı ve sınıf etiketleri
+        self._layer = None
+        self._layer_size = None
+        self._class_texts = {}  # class_id -> QStaticText
         self.current_rect = None
         self.drawing = False
         self.start_point = QPoint()
@@ -32,11 +79,24 @@ class ImageLabel(QLabel):
         self.scaled_width = 0
         self.scaled_height = 0
 
+        # Yakınlaştırılmış görünüm (MainWindow tarafından atanır)
+        self.viewport = None  # TiledViewport
+        self.image_info = None  # ImageInfo
+        self.panning = False
+        self.pan_start_point = QPoint()
+
     def mousePressEvent(self, event: QMouseEvent):
+        if event.button() == Qt.MouseButton.MiddleButton:
+            # Orta tuşla sürükleyerek kaydırma
+            self.panning = True
+            self.pan_start_point = event.position().toPoint()
+            self.setCursor(QCursor(Qt.CursorShape.ClosedHandCursor))
+            return
+
         if event.button() == Qt.MouseButton.LeftButton:
             # Mevcut bir dikdörtgenin üzerinde mi kontrol et
-            self.selected_rect_index = self.get_rect_at_position(
-                event.position().toPoint()
+            self.set_selected_index(
+                self.get_rect_at_position(event.position().toPoint())
             )
 
             if self.selected_rect_index >= 0:
@@ -69,8 +129,19 @@ class ImageLabel(QLabel):
     def mouseMoveEvent(self, event: QMouseEvent):
         pos = event.position().toPoint()
 
+        if self.panning:
+            delta = pos - self.pan_start_point
+            self.pan_start_point = pos
+            self.parent.pan_by(delta.x(), delta.y())
+            return
+
         # Hangi dikdörtgenin üzerindeyiz?
-        self.hover_rect_index = self.get_rect_at_position(pos)
+        hover_index = self.get_rect_at_position(pos)
+        if hover_index != self.hover_rect_index:
+            # Yalnızca eski ve yeni vurgunun bulunduğu bölgeler yeniden çizilir
+            self.update_box(self.hover_rect_index)
+            self.hover_rect_index = hover_index
+            self.update_box(hover_index)
 
         # Fare imlecini güncelle
         if self.hover_rect_index >= 0:
@@ -96,25 +167,39 @@ class ImageLabel(QLabel):
 
         if self.drawing:
             # Yeni dikdörtgen çiziliyor
+            old_rect = self.current_rect
             self.end_point = pos
             self.current_rect = QRect(self.start_point, self.end_point)
-            self.update()
+            self.update(
+                old_rect.normalized()
+                .united(self.current_rect.normalized())
+                .adjusted(-3, -3, 3, 3)
+            )
         elif self.dragging and self.selected_rect_index >= 0:
             # Dikdörtgen taşınıyor
             delta = pos - self.drag_start_point
             rect = self.rectangles[self.selected_rect_index]
-            self.rectangles[self.selected_rect_index] = rect.translated(delta)
+            self.update_box(self.selected_rect_index)
+            self.set_rectangle_geometry(
+                self.selected_rect_index, rect.translated(delta)
+            )
             self.drag_start_point = pos
-            self.update()
+            self.update_box(self.selected_rect_index)
         elif self.resize_mode and self.selected_rect_index >= 0:
             # Dikdörtgen yeniden boyutlandırılıyor
             rect = self.rectangles[self.selected_rect_index]
             new_rect = self.resize_rectangle(rect, pos, self.resize_handle)
             if new_rect.width() > 5 and new_rect.height() > 5:
-                self.rectangles[self.selected_rect_index] = new_rect
-            self.update()
+                self.update_box(self.selected_rect_index)
+                self.set_rectangle_geometry(self.selected_rect_index, new_rect)
+                self.update_box(self.selected_rect_index)
 
     def mouseReleaseEvent(self, event: QMouseEvent):
+        if event.button() == Qt.MouseButton.MiddleButton and self.panning:
+            self.panning = False
+            self.setCursor(QCursor(Qt.CursorShape.ArrowCursor))
+            return
+
         if event.button() == Qt.MouseButton.LeftButton:
             if self.drawing:
                 # Yeni dikdörtgen oluşturma tamamlandı
@@ -128,8 +213,7 @@ class ImageLabel(QLabel):
                     class_id = self.parent.get_selected_class_id()
 
                     # Dikdörtgeni ve sınıfını ekle
-                    self.rectangles.append(rect)
-                    self.rectangle_classes.append(class_id)
+                    self.add_rectangle(rect, class_id)
 
                     # Ana pencereye bildir
                     self.parent.add_rectangle_to_current_image(rect, class_id)
@@ -153,88 +237,105 @@ class ImageLabel(QLabel):
 
             self.update()
 
+    def wheelEvent(self, event):
+        # Fare tekerleği ile imlecin bulunduğu nokta etrafında yakınlaştır
+        steps = event.angleDelta().y() / 120
+        if steps:
+            self.parent.zoom_at(event.position(), 1.25**steps)
+        event.accept()
+
     def set_rect_class(self, class_id):
         """Seçili dikdörtgenin sınıfını değiştirir"""
         if self.selected_rect_index >= 0 and self.selected_rect_index < len(
             self.rectangle_classes
         ):
             self.rectangle_classes[self.selected_rect_index] = class_id
-            rect = self.rectangles[self.selected_rect_index]
-            self.parent.update_rectangle(self.selected_rect_index, rect, class_id)
+            self.parent.set_rectangle_class(self.selected_rect_index, class_id)
             self.update()
 
     def get_rect_at_position(self, pos):
         """Verilen pozisyonda bir dikdörtgen varsa indeksini döndürür, yoksa -1"""
-        for i in range(
-            len(self.rectangles) - 1, -1, -1
-        ):  # Sondan başa doğru kontrol et (üstteki dikdörtgenler öncelikli)
-            if self.rectangles[i].contains(pos):
-                return i
-        return -1
+        # Üst üste binenlerde en üstteki (listede en sondaki) döner
+        return self.rect_index.at(pos.x(), pos.y())
 
     def get_resize_handle(self, rect, pos, handle_size=10):
         """Pozisyonun dikdörtgenin hangi yeniden boyutlandırma tutamaçında olduğunu döndürür"""
-        # Köşe tutamaçları
-        if QRect(
-            int(rect.topLeft().x() - handle_size / 2),
-            int(rect.topLeft().y() - handle_size / 2),
-            handle_size,
-            handle_size,
-        ).contains(pos):
-            return "top-left"
-        if QRect(
-            int(rect.topRight().x() - handle_size / 2),
-            int(rect.topRight().y() - handle_size / 2),
-            handle_size,
-            handle_size,
-        ).contains(pos):
-            return "top-right"
-        if QRect(
-            int(rect.bottomLeft().x() - handle_size / 2),
-            int(rect.bottomLeft().y() - handle_size / 2),
-            handle_size,
-            handle_size,
-        ).contains(pos):
-            return "bottom-left"
-        if QRect(
-            int(rect.bottomRight().x() - handle_size / 2),
-            int(rect.bottomRight().y() - handle_size / 2),
-            handle_size,
-            handle_size,
-        ).contains(pos):
-            return "bottom-right"
-
-        # Kenar tutamaçları
-        if QRect(
-            int(rect.left() - handle_size / 2),
-            int(rect.top() + rect.height() / 2 - handle_size / 2),
-            handle_size,
-            handle_size,
-        ).contains(pos):
-            return "left"
-        if QRect(
-            int(rect.right() - handle_size / 2),
-            int(rect.top() + rect.height() / 2 - handle_size / 2),
-            handle_size,
-            handle_size,
-        ).contains(pos):
-            return "right"
-        if QRect(
-            int(rect.left() + rect.width() / 2 - handle_size / 2),
-            int(rect.top() - handle_size / 2),
-            handle_size,
-            handle_size,
-        ).contains(pos):
-            return "top"
-        if QRect(
-            int(rect.left() + rect.width() / 2 - handle_size / 2),
-            int(rect.bottom() - handle_size / 2),
-            handle_size,
-            handle_size,
-        ).contains(pos):
-            return "bottom"
-
-        return None
+        return resize_handle_at(rect, pos.x(), pos.y(), handle_size)
+
+    def set_rectangles(self, rectangles, rectangle_classes):
+        """Gösterilen dikdörtgenleri topluca değiştirir (seçim korunur)"""
+        self.rectangles = list(rectangles)
+        self.rectangle_classes = list(rectangle_classes)
+        self.rect_index.rebuild(self.rectangles, self.width(), self.height())
+        self.invalidate_layer()
+
+    def add_rectangle(self, rect, class_id):
+        """En üste yeni bir dikdörtgen ekler"""
+        self.rectangles.append(rect)
+        self.rectangle_classes.append(class_id)
+        self.rect_index.append(rect)
+        self.invalidate_layer()
+
+    def set_rectangle_geometry(self, index, rect):
+        """Bir dikdörtgenin konumunu/boyutunu değiştirir"""
+        self.rectangles[index] = rect
+        self.rect_index.update(index, rect)
+        # Seçili dikdörtgen katmanda değil, katman geçerliliğini korur
+        if index != self.selected_rect_index:
+            self._layer = None
+
+    def remove_rectangle(self, index):
+        """Bir dikdörtgeni siler; sonraki indeksler bir kayar"""
+        self.rectangles.pop(index)
+        self.rectangle_classes.pop(index)
+        self.rect_index.remove(index)
+        self.invalidate_layer()
+
+    def set_selected_index(self, index):
+        """Seçili dikdörtgeni değiştirir (seçili olan katmanın dışında çizilir)"""
+        if index != self.selected_rect_index:
+            self.selected_rect_index = index
+            self._layer = None
+
+    def invalidate_layer(self):
+        """Önbellekteki dikdörtgen katmanını geçersiz kılar ve tümünü yeniden çizer"""
+        self._layer = None
+        self.update()
+
+    def invalidate_class_names(self):
+        """Sınıf adları değiştiğinde önbellekteki etiket metinlerini atar"""
+        self._class_texts = {}
+        self.invalidate_layer()
+
+    def class_text(self, class_id):
+        """Sınıf etiketinin önceden yerleşimi hesaplanmış metni"""
+        text = self._class_texts.get(class_id)
+        if text is None:
+            text = QStaticText(self.parent.get_class_name(class_id))
+            text.prepare(font=self.font())
+            self._class_texts[class_id] = text
+        return text
+
+    def box_region(self, index):
+        """Bir dikdörtgenin kalem, tutamaç ve etiket dahil kapladığı alan"""
+        rect = self.rectangles[index].normalized()
+        class_id = (
+            self.rectangle_classes[index] if index < len(self.rectangle_classes) else 0
+        )
+        text_size = self.class_text(class_id).size()
+        margin = HANDLE_SIZE // 2 + 2
+        label = QRect(
+            rect.left() + 5,
+            rect.top() - 5 - self.fontMetrics().ascent(),
+            int(text_size.width()) + 2,
+            int(text_size.height()) + 2,
+        )
+        return rect.adjusted(-margin, -margin, margin, margin).united(label)
+
+    def update_box(self, index):
+        """Yalnızca bir dikdörtgenin bulunduğu bölgeyi yeniden çizer"""
+        if 0 <= index < len(self.rectangles):
+            self.update(self.box_region(index))
 
     def resize_rectangle(self, rect, pos, handle):
         """Dikdörtgeni tutamaç ve yeni pozisyona göre yeniden boyutlandırır"""
@@ -262,96 +363,130 @@ class ImageLabel(QLabel):
         )  # Normalize et (genişlik/yükseklik negatif olmasın)
 
     def paintEvent(self, event):
-        super().paintEvent(event)
         if not self.pixmap():
+            super().paintEvent(event)
             return
 
-        painter = QPainter(self)
-
-        # Tüm kaydedilmiş dikdörtgenleri çiz
-        for i, rect in enumerate(self.rectangles):
-            # Dikdörtgenin sınıfına göre renk belirleyelim
-            class_id = (
-                self.rectangle_classes[i] if i < len(self.rectangle_classes) else 0
-            )
-
-            # Sınıf renklerini tanımlayalım (sınıf sayısına göre artırılabilir)
-            class_colors = [
-                QColor(255, 0, 0),  # Kırmızı (default)
-                QColor(0, 255, 0),  # Yeşil
-                QColor(0, 0, 255),  # Mavi
-                QColor(255, 255, 0),  # Sarı
-                QColor(255, 0, 255),  # Magenta
-                QColor(0, 255, 255),  # Cyan
-                QColor(255, 165, 0),  # Turuncu
-                QColor(128, 0, 128),  # Mor
-                QColor(165, 42, 42),  # Kahverengi
-                QColor(0, 128, 0),  # Koyu yeşil
-            ]
-
-            # Sınıf rengi
-            class_color = class_colors[class_id % len(class_colors)]
-
-            if i == self.selected_rect_index:
-                # Seçili dikdörtgen daha kalın çizilir
-                painter.setPen(QPen(class_color, 3))
-            elif i == self.hover_rect_index:
-                # Fare üzerinde durulan dikdörtgen noktalı çizilir
-                pen = QPen(class_color, 2)
-                pen.setStyle(Qt.PenStyle.DashLine)
-                painter.setPen(pen)
-            else:
-                painter.setPen(QPen(class_color, 2))
-
+        if (
+            self.viewport is not None
+            and self.image_info is not None
+            and self.image_info.is_zoomed()
+        ):
+            # Yakınlaştırılmış görünüm: yalnızca görünen karolar çizilir
+            painter = QPainter(self)
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+            self.viewport.paint(painter, self.image_info, event.rect())
+        else:
+            super().paintEvent(event)
+            painter = QPainter(self)
+
+        # Seçili olmayan dikdörtgenler önbellekteki katmandan gelir
+        # (boyut değiştiyse katman yeniden oluşturulur)
+        if self._layer is None or self._layer_size != self.size():
+            self._layer = self.render_layer()
+            self._layer_size = self.size()
+        painter.drawPixmap(event.rect(), self._layer, self._layer_source(event.rect()))
+
+        # Fare üzerinde durulan dikdörtgen katmanın üstüne noktalı çizilir
+        if (
+            0 <= self.hover_rect_index < len(self.rectangles)
+            and self.hover_rect_index != self.selected_rect_index
+        ):
+            rect = self.rectangles[self.hover_rect_index]
+            painter.setPen(class_pens(self.class_id_at(self.hover_rect_index))[3])
             painter.drawRect(rect)
 
-            # Sınıf etiketini göster
-            class_name = self.parent.get_class_name(class_id)
-            painter.drawText(rect.topLeft() + QPoint(5, -5), class_name)
-
-            # Seçili dikdörtgenin tutamaçlarını çiz
-            if i == self.selected_rect_index:
-                handle_size = 8
-                # Tutamaçlar dikdörtgenin rengini kullanır
-                # 8 tutamaç (köşeler ve kenarlar)
-                painter.fillRect(
-                    int(rect.topLeft().x() - handle_size / 2),
-                    int(rect.topLeft().y() - handle_size / 2),
-                    handle_size,
-                    handle_size,
-                    class_color,
-                )
-                # Diğer tutamaçlar...
+        # Seçili dikdörtgen daha kalın çizilir
+        if 0 <= self.selected_rect_index < len(self.rectangles):
+            index = self.selected_rect_index
+            rect = self.rectangles[index]
+            class_id = self.class_id_at(index)
+            class_color, _, selected_pen, _ = class_pens(class_id)
+            painter.setPen(selected_pen)
+            painter.drawRect(rect)
+            self.draw_class_text(painter, rect, class_id)
+
+            # Tutamaçlar dikdörtgenin rengini kullanır
+            painter.fillRect(
+                int(rect.topLeft().x() - HANDLE_SIZE / 2),
+                int(rect.topLeft().y() - HANDLE_SIZE / 2),
+                HANDLE_SIZE,
+                HANDLE_SIZE,
+                class_color,
+            )
 
         # Çizim sırasındaki dikdörtgeni çiz
         if self.drawing and self.current_rect:
             # Çizim sırasında seçilen sınıfın rengini kullan
             class_id = self.parent.get_selected_class_id()
-            class_colors = [
-                QColor(255, 0, 0),
-                QColor(0, 255, 0),
-                QColor(0, 0, 255),
-                QColor(255, 255, 0),
-                QColor(255, 0, 255),
-                QColor(0, 255, 255),
-            ]
-            painter.setPen(QPen(class_colors[class_id % len(class_colors)], 2))
+            painter.setPen(class_pens(class_id)[1])
             painter.drawRect(self.current_rect)
 
+    def class_id_at(self, index):
+        return self.rectangle_classes[index] if index < len(self.rectangle_classes) else 0
+
+    def draw_class_text(self, painter, rect, class_id):
+        """Sınıf etiketini dikdörtgenin sol üst köşesinin üstüne yazar"""
+        painter.drawStaticText(
+            QPointF(rect.left() + 5, rect.top() - 5 - self.fontMetrics().ascent()),
+            self.class_text(class_id),
+        )
+
+    def _layer_source(self, rect):
+        ratio = self._layer.devicePixelRatio()
+        return QRect(
+            int(rect.x() * ratio),
+            int(rect.y() * ratio),
+            int(rect.width() * ratio),
+            int(rect.height() * ratio),
+        )
+
+    def render_layer(self):
+        """Seçili olan dışındaki tüm dikdörtgenleri saydam bir katmana çizer"""
+        ratio = self.devicePixelRatioF()
+        layer = QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+        layer.setDevicePixelRatio(ratio)
+        layer.fill(Qt.GlobalColor.transparent)
+
+        # Aynı kalemle çizilen dikdörtgenler tek çağrıda çizilir
+        by_class = {}
+        visible = self.rect()
+        for i, rect in enumerate(self.rectangles):
+            if i == self.selected_rect_index:
+                continue
+            # Görünüm dışındaki dikdörtgenler çizilmez (yakınlaştırma)
+            if not rect.adjusted(-2, -40, 200, 2).intersects(visible):
+                continue
+            by_class.setdefault(self.class_id_at(i), []).append(rect)
+
+        painter = QPainter(layer)
+        painter.setFont(self.font())
+        for class_id, rects in by_class.items():
+            painter.setPen(class_pens(class_id)[1])
+            painter.drawRects(rects)
+            for rect in rects:
+                self.draw_class_text(painter, rect, class_id)
+        painter.end()
+        return layer
+
     def clearRectangles(self):
         self.rectangles = []
         self.rectangle_classes = []
+        self.rect_index.rebuild([], self.width(), self.height())
         self.selected_rect_index = -1
         self.hover_rect_index = -1
-        self.update()
+        self.invalidate_layer()
 
     def keyPressEvent(self, event):
         # Delete tuşu ile seçili dikdörtgeni sil
         if event.key() == Qt.Key.Key_Delete and self.selected_rect_index >= 0:
-            self.parent.delete_rectangle(self.selected_rect_index)
-            self.rectangles.pop(self.selected_rect_index)
-            self.rectangle_classes.pop(self.selected_rect_index)
-            self.selected_rect_index = -1
-            self.update()
+            index = self.selected_rect_index
+            self.parent.delete_rectangle(index)
+            self.set_selected_index(-1)
+            self.hover_rect_index = -1
+            self.remove_rectangle(index)
+        elif event.key() == Qt.Key.Key_0:
+            # Sığdırılmış görünüme dön
+            self.parent.reset_zoom()
         else:
             super().keyPressEvent(event)
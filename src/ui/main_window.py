@@ -1,8 +1,7 @@
 import glob
 import os
 
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QPixmap
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtWidgets import (
     QComboBox,
     QFileDialog,
@@ -22,11 +21,15 @@ from PyQt6.QtWidgets import (
     QGridLayout,
 )
 
+from src.ui.batch_worker import BatchWorker, ModelTaskWorker
 from src.ui.img_label import ImageLabel
+from src.ui.pixmap_cache import ImagePrefetcher, PixmapCache
+from src.ui.tile_pyramid import TiledViewport
 from src.ui.rectangle_handler import ImageInfo, RectangleHandler
 from src.utils.model_handler import ModelHandler
 from src.utils.annotation_manager import AnnotationManager
 from src.utils.dataset_splitter import DatasetSplitter
+from src.utils.startup_timer import startup_timer
 
 
 class MainWindow(QMainWindow):
@@ -102,12 +105,74 @@ class MainWindow(QMainWindow):
         self.model_path_layout.addWidget(self.model_path_input)
         self.model_path_layout.addWidget(self.model_browse_button)
 
+        # Bellekte tutulan modeller arasında hızlı geçiş
+        self.loaded_models_layout = QHBoxLayout()
+        self.loaded_models_label = QLabel("Loaded models:")
+        self.loaded_models_combo = QComboBox()
+        self.loaded_models_combo.setToolTip("Switch between models kept in memory")
+        self.loaded_models_combo.activated.connect(self.switch_model)
+        self.loaded_models_layout.addWidget(self.loaded_models_label)
+        self.loaded_models_layout.addWidget(self.loaded_models_combo)
+
+        # Çıkarım arka ucu
+        self.backend_layout = QHBoxLayout()
+        self.backend_label = QLabel("Backend:")
+        self.backend_combo = QComboBox()
+        self.backend_combo.addItem("PyTorch", "pytorch")
+        self.backend_combo.addItem("ONNX Runtime (CPU)", "onnx")
+        self.backend_combo.addItem("ONNX Runtime INT8 (CPU)", "onnx_int8")
+        self.backend_combo.activated.connect(self.on_backend_changed)
+        self.benchmark_button = QPushButton("Benchmark")
+        self.benchmark_button.setToolTip(
+            "Compare PyTorch and ONNX Runtime speed on images from the open folder"
+        )
+        self.benchmark_button.clicked.connect(self.benchmark_backends)
+        self.backend_layout.addWidget(self.backend_label)
+        self.backend_layout.addWidget(self.backend_combo)
+        self.backend_layout.addWidget(self.benchmark_button)
+        self.quantize_button = QPushButton("Quantize INT8")
+        self.quantize_button.setToolTip(
+            "Build an INT8 model calibrated on images from the open folder"
+        )
+        self.quantize_button.clicked.connect(self.quantize_model)
+        self.backend_layout.addWidget(self.quantize_button)
+
         # Güven eşiği
         self.confidence_layout = QHBoxLayout()
         self.confidence_label = QLabel("Confidence threshold:")
         self.confidence_input = QLineEdit("0.5")
         self.confidence_layout.addWidget(self.confidence_label)
+        self.confidence_input.editingFinished.connect(self.on_confidence_changed)
+        self.refilter_all_button = QPushButton("Apply to all")
+        self.refilter_all_button.setToolTip(
+            "Re-filter cached detections of all images with this threshold"
+        )
+        self.refilter_all_button.clicked.connect(self.refilter_all_images)
         self.confidence_layout.addWidget(self.confidence_input)
+        self.confidence_layout.addWidget(self.refilter_all_button)
+
+        # Toplu işlem grup boyutu
+        self.batch_size_layout = QHBoxLayout()
+        self.batch_size_label = QLabel("Batch size:")
+        self.batch_size_input = QLineEdit("8")
+        self.batch_size_input.setToolTip("Number of images per forward pass")
+        self.batch_size_layout.addWidget(self.batch_size_label)
+        self.batch_size_layout.addWidget(self.batch_size_input)
+
+        # İşçi işlem × işlem başına iş parçacığı (CPU'da çok işlemli etiketleme)
+        self.workers_layout = QHBoxLayout()
+        self.workers_label = QLabel("Workers:")
+        self.workers_input = QLineEdit("1")
+        self.workers_input.setToolTip(
+            "Number of worker processes, each with its own model copy (1 = in-process)"
+        )
+        self.threads_label = QLabel("× threads:")
+        self.threads_input = QLineEdit("0")
+        self.threads_input.setToolTip("Inference threads per worker process (0 = auto)")
+        self.workers_layout.addWidget(self.workers_label)
+        self.workers_layout.addWidget(self.workers_input)
+        self.workers_layout.addWidget(self.threads_label)
+        self.workers_layout.addWidget(self.threads_input)
 
         # Model işlemleri butonları
         self.auto_label_button = QPushButton("Auto Label Current Image")
@@ -116,6 +181,26 @@ class MainWindow(QMainWindow):
         self.process_all_simple_button = QPushButton("Simple Auto Label All Images")
         self.process_all_simple_button.clicked.connect(self.process_all_images_simple)
 
+        # Yarım kalan toplu çalışmayı kaldığı yerden sürdürür
+        self.resume_run_button = QPushButton("Resume Last Run")
+        self.resume_run_button.setToolTip(
+            "Continue the last interrupted batch run, skipping images already labeled "
+            "with the same model and confidence threshold"
+        )
+        self.resume_run_button.clicked.connect(self.resume_last_run)
+        self.resume_run_button.setEnabled(False)
+
+        # Toplu işlem kontrol butonları
+        self.batch_control_layout = QHBoxLayout()
+        self.pause_button = QPushButton("Pause")
+        self.pause_button.clicked.connect(self.toggle_batch_pause)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.cancel_batch)
+        self.pause_button.setVisible(False)
+        self.cancel_button.setVisible(False)
+        self.batch_control_layout.addWidget(self.pause_button)
+        self.batch_control_layout.addWidget(self.cancel_button)
+
         # İlerleme çubuğu
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
@@ -124,9 +209,15 @@ class MainWindow(QMainWindow):
 
         # Düzene ekle
         self.model_layout.addLayout(self.model_path_layout)
+        self.model_layout.addLayout(self.loaded_models_layout)
+        self.model_layout.addLayout(self.backend_layout)
         self.model_layout.addLayout(self.confidence_layout)
+        self.model_layout.addLayout(self.batch_size_layout)
+        self.model_layout.addLayout(self.workers_layout)
         self.model_layout.addWidget(self.auto_label_button)
         self.model_layout.addWidget(self.process_all_simple_button)
+        self.model_layout.addWidget(self.resume_run_button)
+        self.model_layout.addLayout(self.batch_control_layout)
         self.model_layout.addWidget(self.progress_bar)
         self.model_layout.addWidget(self.progress_status)
 
@@ -191,10 +282,27 @@ class MainWindow(QMainWindow):
 
         # Batch işleme worker
         self.batch_worker = None
+        self.task_worker = None  # Arka uç karşılaştırması / nicemleme
 
         # Resim bilgisi nesnesi
         self.image_info = ImageInfo()
 
+        # Çözülmüş resim önbelleği ve komşu resimleri önceden çözen işçi
+        self.pixmap_cache = PixmapCache()
+        self.prefetcher = ImagePrefetcher(self.pixmap_cache)
+
+        # Büyük resimler için yakınlaştırılabilir, karolu görünüm
+        self.viewport = TiledViewport()
+        self.viewport.signals.tile_ready.connect(self.image_label.update)
+        self.image_label.viewport = self.viewport
+        self.image_label.image_info = self.image_info
+
+        # Pencere boyutu değişirken art arda gelen olayları birleştirir
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(80)
+        self.resize_timer.timeout.connect(self.relayout_image)
+
         self.update_class_combo()
         # Yeni metod ekleyin
 
@@ -253,6 +361,15 @@ class MainWindow(QMainWindow):
             self.output_format = "yolo"
         else:
             self.output_format = "standard"
+        # Otomatik kayıt da seçili formatı kullansın
+        self.annotation_manager.output_format = self.output_format
+
+    def on_startup_finished(self):
+        """Pencere ilk kez gösterildikten sonra çağrılır"""
+        startup_timer.record("İlk pencere gösterimi", startup_timer.elapsed())
+        startup_timer.report()
+        # Model kütüphanelerini kullanıcı beklemeden arka planda yükle
+        self.model_handler.start_background_import()
 
     def keyPressEvent(self, event):
         # Yön tuşları ile resimler arasında gezinme
@@ -268,6 +385,8 @@ class MainWindow(QMainWindow):
         self.class_combo.clear()
         for class_name in self.annotation_manager.class_names:
             self.class_combo.addItem(class_name)
+        # Çizimdeki sınıf etiketleri yeniden oluşturulsun
+        self.image_label.invalidate_class_names()
 
     def get_selected_class_id(self):
         """Şu anda seçili olan sınıfın ID'sini döndürür"""
@@ -294,7 +413,7 @@ class MainWindow(QMainWindow):
         """Yeni sınıf ekler"""
         class_name, ok = QInputDialog.getText(self, "Add Class", "Class name:")
         if ok and class_name:
-            self.annotation_manager.class_names.append(class_name)
+            self.annotation_manager.add_class(class_name)
             self.update_class_combo()
             # Yeni eklenen sınıfı seç
             self.class_combo.setCurrentIndex(
@@ -331,11 +450,20 @@ class MainWindow(QMainWindow):
         if self.image_paths:
             print(f"İlk resim: {self.image_paths[0]}")
 
-            # Annotation yöneticisini başlat
-            self.annotation_manager.initialize(self.image_paths, self.output_dir)
+            # Annotation yöneticisini başlat (yarım kalan oturum varsa kurtarılır).
+            # Etiketler ilk erişimde okunur, kalanlar arka planda yüklenir.
+            self.annotation_manager.output_format = self.output_format
+            self.annotation_manager.initialize(
+                self.image_paths, self.output_dir, lazy=True
+            )
+            self.annotation_manager.start_warmup()
+
+            # Düzenlemeler günlükten arka planda etiket dosyalarına yazılır
+            self.annotation_manager.start_autosave()
 
             # Sınıf listesini güncelle
             self.update_class_combo()
+            self.update_resume_button()
 
             self.current_index = 0
             self.display_image()
@@ -348,55 +476,19 @@ class MainWindow(QMainWindow):
             current_image = self.image_paths[self.current_index]
             print(f"Görüntülenen resim: {current_image}")
 
-            # Orijinal resim
-            original_pixmap = QPixmap(current_image)
-            if original_pixmap.isNull():
-                print(f"Resim yüklenemedi: {current_image}")
-                self.image_label.setText(
-                    f"Resim yüklenemedi: {os.path.basename(current_image)}"
-                )
-                return
-
-            # Orijinal resim boyutları
-            orig_width = original_pixmap.width()
-            orig_height = original_pixmap.height()
-
             # QLabel'ın boyutları
             label_width = self.image_label.width()
             label_height = self.image_label.height()
 
-            # Resmi QLabel boyutlarına uygun şekilde ölçeklendirelim
-            scaled_pixmap = original_pixmap.scaled(
-                label_width,
-                label_height,
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation,
-            )
-
-            # Ölçeklendirilmiş resim boyutları
-            scaled_width = scaled_pixmap.width()
-            scaled_height = scaled_pixmap.height()
-
-            # Önemli: Resmin QLabel içindeki gerçek konumunu hesapla
-            # QLabel içinde merkezi hizalamada resim kenarlarında boşluk olabilir
-            offset_x = (label_width - scaled_width) // 2
-            offset_y = (label_height - scaled_height) // 2
-
-            # Bu değerleri ImageInfo'ya kaydet
-            self.image_info.update(
-                orig_width, orig_height, scaled_width, scaled_height, offset_x, offset_y
-            )
-
-            # ImageLabel'a da bildir (geriye uyumluluk için)
-            self.image_label.offset_x = offset_x
-            self.image_label.offset_y = offset_y
-            self.image_label.orig_width = orig_width
-            self.image_label.orig_height = orig_height
-            self.image_label.scaled_width = scaled_width
-            self.image_label.scaled_height = scaled_height
+            if not self.fit_image(current_image, label_width, label_height):
+                return
 
-            # Pixmapı ayarla
-            self.image_label.setPixmap(scaled_pixmap)
+            orig_width = self.image_info.orig_width
+            orig_height = self.image_info.orig_height
+            scaled_width = self.image_info.scaled_width
+            scaled_height = self.image_info.scaled_height
+            offset_x = self.image_info.offset_x
+            offset_y = self.image_info.offset_y
 
             # Debug bilgisi
             print(f"Orijinal boyutlar: {orig_width}x{orig_height}")
@@ -414,14 +506,170 @@ class MainWindow(QMainWindow):
             )
 
             # Dikdörtgenleri ImageLabel'a ekle
-            for i, rect in enumerate(display_rects):
-                self.image_label.rectangles.append(rect)
-                self.image_label.rectangle_classes.append(class_ids[i])
-                print(f"Etiket eklendi: {rect}, class_id={class_ids[i]}")
+            self.image_label.set_rectangles(display_rects, class_ids)
+            print(f"{len(display_rects)} etiket gösteriliyor")
 
             # Başlığa dosya adını ekleyelim
             self.setWindowTitle(f"Auto Image Labeler - {os.path.basename(current_image)}")
 
+            # Gezinme sırasındaki komşu resimleri arka planda çöz
+            self.prefetcher.prefetch(
+                self.image_paths, self.current_index, label_width, label_height
+            )
+
+    def fit_image(self, current_image, label_width, label_height):
+        """
+        Resmi etiket alanına sığdırır ve görünüm dönüşümünü günceller
+
+        Returns:
+            bool: Resim gösterilebildiyse True
+        """
+        # Resmi QLabel boyutlarına uygun şekilde ölçeklendirelim
+        # (çözülmüş ve ölçeklenmiş sürümler önbellekten gelir)
+        scaled_pixmap, original_size = self.pixmap_cache.get_scaled(
+            current_image, label_width, label_height
+        )
+        if scaled_pixmap.isNull():
+            print(f"Resim yüklenemedi: {current_image}")
+            self.image_label.setText(
+                f"Resim yüklenemedi: {os.path.basename(current_image)}"
+            )
+            return False
+
+        # Orijinal resim boyutları (resim başlığından, tam çözmeden)
+        orig_width = original_size.width()
+        orig_height = original_size.height()
+
+        # Ölçeklendirilmiş resim boyutları
+        scaled_width = scaled_pixmap.width()
+        scaled_height = scaled_pixmap.height()
+
+        # Önemli: Resmin QLabel içindeki gerçek konumunu hesapla
+        # QLabel içinde merkezi hizalamada resim kenarlarında boşluk olabilir
+        offset_x = (label_width - scaled_width) // 2
+        offset_y = (label_height - scaled_height) // 2
+
+        # Bu değerleri ImageInfo'ya kaydet
+        self.image_info.update(
+            orig_width, orig_height, scaled_width, scaled_height, offset_x, offset_y
+        )
+
+        # ImageLabel'a da bildir (geriye uyumluluk için)
+        self.image_label.offset_x = offset_x
+        self.image_label.offset_y = offset_y
+        self.image_label.orig_width = orig_width
+        self.image_label.orig_height = orig_height
+        self.image_label.scaled_width = scaled_width
+        self.image_label.scaled_height = scaled_height
+
+        # Pixmapı ayarla
+        self.image_label.setPixmap(scaled_pixmap)
+        # Yakınlaştırmada ön izleme olarak kullanılır
+        self.viewport.set_image(current_image, orig_width, orig_height, scaled_pixmap)
+        return True
+
+    def relayout_image(self):
+        """
+        Pencere boyutu değişince mevcut resmi yeniden yerleştirir
+
+        Resim bellekteki çözülmüş sürümden ölçeklenir; dikdörtgenler yeniden
+        oluşturulmaz, yalnızca yeni görünüme göre konumlandırılır.
+        """
+        if not self.image_paths or self.current_index >= len(self.image_paths):
+            return
+        current_image = self.image_paths[self.current_index]
+        label_width = self.image_label.width()
+        label_height = self.image_label.height()
+
+        # Yakınlaştırılmışsa görünümün ortasındaki nokta korunur
+        info = self.image_info
+        zoom = info.zoom
+        center_x, center_y = info.to_original(
+            label_width / 2, label_height / 2
+        )
+
+        if not self.fit_image(current_image, label_width, label_height):
+            return
+
+        if zoom > 1.0:
+            info.set_view(
+                zoom,
+                label_width / 2 - center_x * info.fit_scale_x * zoom,
+                label_height / 2 - center_y * info.fit_scale_y * zoom,
+                label_width,
+                label_height,
+            )
+        self.on_view_changed()
+
+    def zoom_at(self, pos, factor):
+        """İmlecin altındaki nokta sabit kalacak şekilde yakınlaştırır"""
+        if not self.image_paths or not self.image_info.orig_width:
+            return
+
+        info = self.image_info
+        orig_x, orig_y = info.to_original(pos.x(), pos.y())
+
+        # En fazla orijinal çözünürlüğün 4 katına kadar yakınlaştır
+        max_zoom = max(1.0, 4.0 / info.fit_scale_x)
+        zoom = min(max_zoom, max(1.0, info.zoom * factor))
+        if zoom == info.zoom:
+            return
+
+        info.set_view(
+            zoom,
+            pos.x() - orig_x * info.fit_scale_x * zoom,
+            pos.y() - orig_y * info.fit_scale_y * zoom,
+            self.image_label.width(),
+            self.image_label.height(),
+        )
+        self.on_view_changed()
+
+    def pan_by(self, dx, dy):
+        """Yakınlaştırılmış görünümü kaydırır"""
+        info = self.image_info
+        if not info.is_zoomed():
+            return
+        info.set_view(
+            info.zoom,
+            info.offset_x + dx,
+            info.offset_y + dy,
+            self.image_label.width(),
+            self.image_label.height(),
+        )
+        self.on_view_changed()
+
+    def reset_zoom(self):
+        """Sığdırılmış görünüme döner"""
+        if not self.image_info.is_zoomed():
+            return
+        self.image_info.set_view(
+            1.0, 0, 0, self.image_label.width(), self.image_label.height()
+        )
+        self.on_view_changed()
+
+    def on_view_changed(self):
+        """Görünüm dönüşümü değişince karo isteklerini ve dikdörtgenleri yeniler"""
+        # Eski görünümün henüz başlamamış karoları artık gereksiz
+        self.viewport.cancel_pending()
+        self.reproject_rectangles()
+
+    def reproject_rectangles(self):
+        """Dikdörtgenleri güncel görünüm dönüşümüyle yeniden konumlandırır"""
+        if not self.image_paths or self.current_index >= len(self.image_paths):
+            return
+        current_image = self.image_paths[self.current_index]
+
+        self.image_label.offset_x = self.image_info.offset_x
+        self.image_label.offset_y = self.image_info.offset_y
+        self.image_label.scaled_width = self.image_info.scaled_width
+        self.image_label.scaled_height = self.image_info.scaled_height
+
+        display_rects, class_ids = self.rectangle_handler.get_rectangles_for_display(
+            current_image, self.image_info
+        )
+        # Seçim korunur; dikdörtgen indeksleri değişmez
+        self.image_label.set_rectangles(display_rects, class_ids)
+
     def show_next_image(self):
         if self.image_paths:
             self.current_index = (self.current_index + 1) % len(self.image_paths)
@@ -453,6 +701,12 @@ class MainWindow(QMainWindow):
                 current_image, index, rect, class_id, self.image_info
             )
 
+    def set_rectangle_class(self, index, class_id):
+        """Mevcut bir dikdörtgenin sınıfını değiştirir"""
+        if self.image_paths and self.current_index < len(self.image_paths):
+            current_image = self.image_paths[self.current_index]
+            self.rectangle_handler.set_rectangle_class(current_image, index, class_id)
+
     def delete_rectangle(self, index):
         """Seçili dikdörtgeni siler"""
         if self.image_paths and self.current_index < len(self.image_paths):
@@ -486,7 +740,27 @@ class MainWindow(QMainWindow):
     def resizeEvent(self, event):
         super().resizeEvent(event)
         if hasattr(self, "image_paths") and self.image_paths:
-            self.display_image()
+            # Sürükleme sırasında her olayda değil, durunca bir kez yerleştir
+            self.resize_timer.start()
+
+    def closeEvent(self, event):
+        # Devam eden toplu işlemi durdur
+        if self.batch_worker is not None and self.batch_worker.isRunning():
+            self.batch_worker.finished_run.disconnect()
+            self.batch_worker.cancel()
+            self.batch_worker.wait()
+        # Karşılaştırma/nicemleme yarıda kesilemez; bitmesi beklenir
+        if self.task_worker is not None and self.task_worker.isRunning():
+            self.task_worker.finished_task.disconnect()
+            self.task_worker.wait()
+
+        # Bekleyen düzenlemeleri yaz ve günlüğü temiz kapat
+        self.annotation_manager.close()
+        self.model_handler.checkpoint.close()
+        self.model_handler.detection_cache.close()
+        self.prefetcher.shutdown()
+        self.viewport.shutdown()
+        super().closeEvent(event)
 
     def browse_model(self):
         """YOLOv8 model dosyasını seçin"""
@@ -494,28 +768,162 @@ class MainWindow(QMainWindow):
             self,
             "YOLOv8 Modelini Seç",
             "",
-            "Model Dosyaları (*.pt *.pth);;Tüm Dosyalar (*)",
+            "Model Dosyaları (*.pt *.pth *.onnx);;Tüm Dosyalar (*)",
         )
         if model_path:
             self.model_path_input.setText(model_path)
             # Güven eşiğini ayarla
-            try:
-                confidence = float(self.confidence_input.text())
-                self.model_handler.confidence_threshold = min(
-                    max(0.05, confidence), 1.0
-                )
-            except ValueError:
-                self.model_handler.confidence_threshold = 0.5
-                self.confidence_input.setText("0.5")
+            self.read_confidence()
 
             # Modeli yükle
             success, message = self.model_handler.load_model(model_path)
+            self.update_loaded_models_combo()
             if success:
                 QMessageBox.information(self, "Bilgi", message)
                 self.update_class_combo()
             else:
                 QMessageBox.warning(self, "Uyarı", message)
 
+    def update_loaded_models_combo(self):
+        """Bellekteki modellerin listesini günceller (etkin model seçili)"""
+        self.loaded_models_combo.clear()
+        for model_path in reversed(self.model_handler.registry.loaded_paths()):
+            self.loaded_models_combo.addItem(os.path.basename(model_path), model_path)
+        index = self.loaded_models_combo.findData(self.model_handler.model_path)
+        if index >= 0:
+            self.loaded_models_combo.setCurrentIndex(index)
+
+    def on_backend_changed(self, index):
+        """Çıkarım arka ucunu değiştirir (ONNX için gerekirse model dışa aktarılır)"""
+        backend_name = self.backend_combo.itemData(index)
+        if backend_name == self.model_handler.backend_name:
+            return
+
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            success, message = self.model_handler.set_backend(backend_name)
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        self.update_loaded_models_combo()
+        if not success:
+            QMessageBox.warning(self, "Uyarı", message)
+            self.backend_combo.setCurrentIndex(
+                self.backend_combo.findData(self.model_handler.backend_name)
+            )
+
+    def benchmark_backends(self):
+        """Arka uçları açık klasördeki resimlerle yan yana ölçer (arka planda)"""
+        if not self.model_handler.model:
+            QMessageBox.warning(self, "Uyarı", "Lütfen önce bir model yükleyin.")
+            return
+        if not self.image_paths:
+            QMessageBox.warning(self, "Uyarı", "Lütfen önce bir klasör açın.")
+            return
+
+        image_paths = list(self.image_paths)
+        self.start_model_task(
+            lambda: self.model_handler.benchmark_backends(image_paths),
+            "Arka uçlar karşılaştırılıyor...",
+            self.on_benchmark_finished,
+        )
+
+    def on_benchmark_finished(self, success, message):
+        self.finish_model_task()
+        if success:
+            QMessageBox.information(self, "Arka uç karşılaştırması", message)
+        else:
+            QMessageBox.warning(self, "Uyarı", message)
+
+    def quantize_model(self):
+        """INT8 modeli arka planda oluşturur; bitince rapor gösterilir"""
+        if not self.model_handler.model:
+            QMessageBox.warning(self, "Uyarı", "Lütfen önce bir model yükleyin.")
+            return
+        if not self.image_paths:
+            QMessageBox.warning(self, "Uyarı", "Lütfen önce bir klasör açın.")
+            return
+
+        image_paths = list(self.image_paths)
+        self.start_model_task(
+            lambda: self.model_handler.quantize_model(image_paths),
+            "INT8 model oluşturuluyor...",
+            self.on_quantize_finished,
+        )
+
+    def on_quantize_finished(self, success, message):
+        """Nicemleme raporunu gösterir ve istenirse INT8 modele geçer"""
+        self.finish_model_task()
+        if not success:
+            QMessageBox.warning(self, "Uyarı", message)
+            return
+
+        reply = QMessageBox.question(
+            self,
+            "INT8 raporu",
+            f"{message}\n\nINT8 modele geçilsin mi?",
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            index = self.backend_combo.findData("onnx_int8")
+            self.backend_combo.setCurrentIndex(index)
+            self.on_backend_changed(index)
+
+    def start_model_task(self, task, status, on_finished):
+        """
+        Uzun süren bir model işini işçi iş parçacığında başlatır
+
+        İş sürerken modeli değiştiren ya da kullanan kontroller kapalı kalır.
+        """
+        if self.task_worker is not None and self.task_worker.isRunning():
+            QMessageBox.warning(self, "Uyarı", "Başka bir model işlemi devam ediyor.")
+            return
+        if self.batch_worker is not None and self.batch_worker.isRunning():
+            QMessageBox.warning(self, "Uyarı", "Toplu işlem devam ediyor.")
+            return
+
+        self.set_model_controls_enabled(False)
+        self.progress_status.setText(status)
+        self.progress_status.setVisible(True)
+
+        self.task_worker = ModelTaskWorker(task, parent=self)
+        self.task_worker.finished_task.connect(on_finished)
+        self.task_worker.start()
+
+    def finish_model_task(self):
+        """Model işi bitince kontrolleri eski haline getirir"""
+        self.progress_status.setVisible(False)
+        self.set_model_controls_enabled(True)
+        self.update_resume_button()
+
+    def set_model_controls_enabled(self, enabled):
+        """Modeli değiştiren ya da çalıştıran kontrolleri açar/kapatır"""
+        self.auto_label_button.setEnabled(enabled)
+        self.model_browse_button.setEnabled(enabled)
+        self.loaded_models_combo.setEnabled(enabled)
+        self.backend_combo.setEnabled(enabled)
+        self.benchmark_button.setEnabled(enabled)
+        self.quantize_button.setEnabled(enabled)
+        self.refilter_all_button.setEnabled(enabled)
+        self.workers_input.setEnabled(enabled)
+        self.threads_input.setEnabled(enabled)
+        self.process_all_simple_button.setEnabled(enabled)
+        if not enabled:
+            self.resume_run_button.setEnabled(False)
+
+    def switch_model(self, index):
+        """Bellekteki başka bir modeli etkin model yapar"""
+        model_path = self.loaded_models_combo.itemData(index)
+        if not model_path or model_path == self.model_handler.model_path:
+            return
+
+        success, message = self.model_handler.load_model(model_path)
+        self.update_loaded_models_combo()
+        if success:
+            self.model_path_input.setText(model_path)
+            self.update_class_combo()
+        else:
+            QMessageBox.warning(self, "Uyarı", message)
+
     def auto_label_current_image(self):
         """Mevcut resmi otomatik etiketle"""
         if not self.model_handler.model:
@@ -529,12 +937,7 @@ class MainWindow(QMainWindow):
         current_image = self.image_paths[self.current_index]
 
         # Güven eşiğini güncelle
-        try:
-            confidence = float(self.confidence_input.text())
-            self.model_handler.confidence_threshold = min(max(0.05, confidence), 1.0)
-        except ValueError:
-            self.model_handler.confidence_threshold = 0.5
-            self.confidence_input.setText("0.5")
+        self.read_confidence()
 
         # Mevcut dikdörtgenleri temizle
         self.clear_rectangles()
@@ -549,8 +952,90 @@ class MainWindow(QMainWindow):
         else:
             QMessageBox.warning(self, "Uyarı", message)
 
+    def read_confidence(self):
+        """Güven eşiğini giriş kutusundan okur ve model işleyiciye aktarır"""
+        try:
+            confidence = float(self.confidence_input.text())
+            self.model_handler.confidence_threshold = min(max(0.05, confidence), 1.0)
+        except ValueError:
+            self.model_handler.confidence_threshold = 0.5
+            self.confidence_input.setText("0.5")
+        return self.model_handler.confidence_threshold
+
+    def on_confidence_changed(self):
+        """
+        Eşik değişince mevcut resmin önbellekteki tespitlerini yeniden süzer
+
+        Resim otomatik etiketlemeden sonra elle düzenlendiyse önce onay istenir.
+        """
+        previous = self.model_handler.confidence_threshold
+        if self.read_confidence() == previous:
+            return
+        if not self.model_handler.model or not self.image_paths:
+            return
+        if self.batch_worker is not None and self.batch_worker.isRunning():
+            return
+
+        current_image = self.image_paths[self.current_index]
+        if self.model_handler.cached_raw(current_image) is None:
+            return
+
+        # Otomatik etiketlemeden sonra elle düzenlenmiş etiketlerin üzerine
+        # sormadan yazılmaz
+        if not self.model_handler.matches_auto_labels(current_image, previous):
+            reply = QMessageBox.question(
+                self,
+                "Eşiği uygula",
+                "Bu resmin etiketleri otomatik etiketlemeden sonra değiştirilmiş. "
+                f"Etiketler {self.model_handler.confidence_threshold:.2f} eşiğiyle "
+                "yeniden oluşturulsun mu (elle yapılan düzenlemeler kaybolur)?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.No,
+            )
+            if reply != QMessageBox.StandardButton.Yes:
+                return
+
+        # Model yeniden çalıştırılmaz; yalnızca önbellekteki sonuçlar süzülür
+        if self.model_handler.refilter([current_image]):
+            self.display_image()
+
+    def refilter_all_images(self):
+        """Tüm klasörün önbellekteki tespitlerini yeni eşikle yeniden süzer"""
+        if not self.model_handler.model or not self.image_paths:
+            QMessageBox.warning(self, "Uyarı", "Lütfen önce bir model ve klasör açın.")
+            return
+        if self.batch_worker is not None and self.batch_worker.isRunning():
+            QMessageBox.warning(self, "Uyarı", "Toplu işlem devam ediyor.")
+            return
+
+        conf = self.read_confidence()
+        reply = QMessageBox.question(
+            self,
+            "Eşiği uygula",
+            f"Daha önce otomatik etiketlenmiş resimlerin etiketleri {conf:.2f} eşiğiyle "
+            "yeniden oluşturulacak (elle yapılan düzenlemeler kaybolur). Devam edilsin mi?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No,
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            updated = self.model_handler.refilter(self.image_paths)
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        self.display_image()
+        QMessageBox.information(
+            self,
+            "Bilgi",
+            f"{updated} resmin etiketleri güncellendi; "
+            f"{len(self.image_paths) - updated} resmin önbellekte sonucu yok.",
+        )
+
     def process_all_images_simple(self):
-        """Tüm resimleri basit bir şekilde otomatik etiketle"""
+        """Tüm resimleri arka planda otomatik etiketle"""
         if not self.model_handler.model:
             QMessageBox.warning(self, "Uyarı", "Lütfen önce bir model yükleyin.")
             return
@@ -559,6 +1044,10 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Uyarı", "Açık bir klasör yok.")
             return
 
+        if self.batch_worker is not None and self.batch_worker.isRunning():
+            QMessageBox.warning(self, "Uyarı", "Toplu işlem zaten devam ediyor.")
+            return
+
         reply = QMessageBox.question(
             self,
             "Toplu İşlem",
@@ -570,6 +1059,77 @@ class MainWindow(QMainWindow):
         if reply != QMessageBox.StandardButton.Yes:
             return
 
+        self.start_batch()
+
+    def resume_last_run(self):
+        """Yarım kalan toplu çalışmayı kaldığı yerden sürdürür"""
+        if not self.model_handler.model:
+            QMessageBox.warning(self, "Uyarı", "Lütfen önce bir model yükleyin.")
+            return
+
+        if self.batch_worker is not None and self.batch_worker.isRunning():
+            QMessageBox.warning(self, "Uyarı", "Toplu işlem zaten devam ediyor.")
+            return
+
+        run = self.model_handler.resumable_run()
+        if run is None:
+            QMessageBox.information(self, "Bilgi", "Sürdürülecek yarım kalmış bir çalışma yok.")
+            self.update_resume_button()
+            return
+
+        # Sürdürme yalnızca aynı model, eşik ve biçimle yapılır
+        self.read_confidence()
+        if run["signature"] != self.model_handler.run_signature(self.output_format):
+            QMessageBox.warning(
+                self,
+                "Uyarı",
+                "Son çalışma farklı bir model, güven eşiği ya da çıktı formatıyla "
+                "yapılmış. Sürdürmek için aynı ayarları seçin.",
+            )
+            return
+
+        self.start_batch(resume=True)
+
+    def update_resume_button(self):
+        """Yarım kalan çalışma varsa sürdürme butonunu etkinleştirir"""
+        self.resume_run_button.setEnabled(self.model_handler.resumable_run() is not None)
+
+    def start_batch(self, resume=False):
+        """Toplu etiketlemeyi başlatır; resume True ise son çalışmayı sürdürür"""
+        # Güven eşiği çalışmanın imzasına girer; kutudaki değer kullanılmalı
+        self.read_confidence()
+
+        # Grup boyutunu güncelle
+        try:
+            self.model_handler.batch_size = max(1, int(self.batch_size_input.text()))
+        except ValueError:
+            self.model_handler.batch_size = 8
+            self.batch_size_input.setText("8")
+
+        # İşçi işlem ve iş parçacığı sayılarını güncelle
+        try:
+            self.model_handler.processes = max(1, int(self.workers_input.text()))
+        except ValueError:
+            self.model_handler.processes = 1
+            self.workers_input.setText("1")
+        try:
+            self.model_handler.threads_per_process = max(0, int(self.threads_input.text()))
+        except ValueError:
+            self.model_handler.threads_per_process = 0
+            self.threads_input.setText("0")
+
+        # Kontrol noktasını başlat; sürdürmede tamamlanmış resimler atlanır
+        image_paths, writer, skipped = self.model_handler.begin_run(
+            self.image_paths, self.output_format, resume
+        )
+        if skipped:
+            print(f"{skipped} resim önceki çalışmadan atlandı")
+        if not image_paths:
+            self.model_handler.finish_run(True)
+            self.update_resume_button()
+            QMessageBox.information(self, "Bilgi", "Tüm resimler zaten etiketlenmiş.")
+            return
+
         # İlerleme çubuğunu göster
         self.progress_bar.setValue(0)
         self.progress_bar.setVisible(True)
@@ -577,70 +1137,100 @@ class MainWindow(QMainWindow):
         self.progress_status.setVisible(True)
 
         # Butonları devre dışı bırak
-        self.auto_label_button.setEnabled(False)
-        self.model_browse_button.setEnabled(False)
-
-        # Başlangıç indeksini kaydet
-        original_index = self.current_index
-
-        # Her resim için işlem yap
-        total_objects = 0
-        try:
-            for i, image_path in enumerate(self.image_paths):
-                # İlerlemeyi güncelle
-                percent = int(((i + 1) / len(self.image_paths)) * 100)
-                self.progress_bar.setValue(percent)
-                self.progress_status.setText(
-                    f"İşleniyor: {i+1}/{len(self.image_paths)} - {os.path.basename(image_path)}"
-                )
+        self.set_model_controls_enabled(False)
+        self.pause_button.setText("Pause")
+        self.pause_button.setVisible(True)
+        self.cancel_button.setVisible(True)
+
+        # İşçiyi başlat
+        self.batch_worker = BatchWorker(
+            self.model_handler,
+            image_paths,
+            writer=writer,
+            parent=self,
+        )
+        self.batch_worker.image_done.connect(self.on_batch_image_done)
+        self.batch_worker.progress.connect(self.on_batch_progress)
+        self.batch_worker.error.connect(self.on_batch_error)
+        self.batch_worker.finished_run.connect(self.on_batch_finished)
+        self.batch_worker.start()
+
+    def on_batch_image_done(self, image_path, detections):
+        """İşçiden gelen tek resim sonucunu annotation manager'a yazar"""
+        if detections is None:
+            return
 
-                # Geçerli görüntüyü ayarla
-                self.current_index = i
+        # Etiket dosyasını işçinin yazma aşaması yazar
+        self.model_handler.apply_detections(
+            image_path, detections, persisted=self.batch_worker.writer is not None
+        )
 
-                # Mevcut dikdörtgenleri temizle
-                self.clear_rectangles()
+        # Görüntülenen resim etiketlendiyse ekranı güncelle
+        if (
+            self.image_paths
+            and self.current_index < len(self.image_paths)
+            and self.image_paths[self.current_index] == image_path
+        ):
+            self.display_image()
 
-                # Nesne tespiti yap
-                success, message = self.model_handler.detect_objects(image_path)
+    def on_batch_progress(self, done, total, image_path, total_objects):
+        """Toplu işlem ilerlemesini gösterir"""
+        if total:
+            self.progress_bar.setValue(int((done / total) * 100))
+        self.progress_status.setText(
+            f"İşleniyor: {done}/{total} - {os.path.basename(image_path)} - toplam {total_objects} nesne"
+        )
 
-                if success:
-                    # Bulunan nesnelerin sayısını al
-                    objects_count = len(
-                        self.annotation_manager.get_annotations(image_path)
-                    )
-                    total_objects += objects_count
+    def on_batch_error(self, message):
+        QMessageBox.warning(self, "Hata", f"İşlem sırasında hata oluştu: {message}")
 
-                    # İlerleme mesajını güncelle
-                    self.progress_status.setText(
-                        f"İşleniyor: {i+1}/{len(self.image_paths)} - {os.path.basename(image_path)} - {objects_count} nesne bulundu"
-                    )
+    def on_batch_finished(self, cancelled, done, failed, total_objects, completed):
+        """Toplu işlem bittiğinde arayüzü eski haline getirir"""
+        # İlerleme çubuğunu kapat
+        self.progress_bar.setVisible(False)
+        self.progress_status.setVisible(False)
+        self.pause_button.setVisible(False)
+        self.cancel_button.setVisible(False)
 
-                # QApplication'ın olayları işlemesine izin ver
-                QApplication.processEvents()
+        # Butonları etkinleştir
+        self.set_model_controls_enabled(True)
 
-            # İşlem tamamlandı
-            QMessageBox.information(
-                self,
-                "Bilgi",
-                f"İşlem tamamlandı: {len(self.image_paths)} resimde toplam {total_objects} nesne tespit edildi",
-            )
-        except Exception as e:
-            QMessageBox.warning(self, "Hata", f"İşlem sırasında hata oluştu: {e}")
-        finally:
-            # İlerleme çubuğunu kapat
-            self.progress_bar.setVisible(False)
-            self.progress_status.setVisible(False)
+        # İptal edilen, hatayla duran ya da hatalı resimleri olan çalışma
+        # sürdürülebilir kalır
+        self.model_handler.finish_run(completed)
+        self.update_resume_button()
 
-            # Butonları etkinleştir
-            self.auto_label_button.setEnabled(True)
-            self.model_browse_button.setEnabled(True)
+        self.display_image()
 
-            # Orijinal görüntüye dön
-            self.current_index = original_index
-            self.display_image()
+        # Sonuçları kaydet
+        self.save_annotations(self.output_format)
 
-            # Sonuçları kaydet
-            self.save_annotations(self.output_format)
+        if cancelled:
+            message = f"İşlem iptal edildi: {done}/{len(self.batch_worker.image_paths)} resim işlendi"
+        elif done < len(self.batch_worker.image_paths):
+            message = f"İşlem yarıda kaldı: {done}/{len(self.batch_worker.image_paths)} resim işlendi"
+        else:
+            message = f"İşlem tamamlandı: {done} resimde toplam {total_objects} nesne tespit edildi"
+        if failed:
+            message += f" ({failed} resim işlenemedi)"
+        QMessageBox.information(self, "Bilgi", message)
+
+    def toggle_batch_pause(self):
+        """Toplu işlemi duraklatır ya da sürdürür"""
+        if self.batch_worker is None or not self.batch_worker.isRunning():
+            return
+        if self.batch_worker.is_paused():
+            self.batch_worker.resume()
+            self.pause_button.setText("Pause")
+        else:
+            self.batch_worker.pause()
+            self.pause_button.setText("Resume")
+
+    def cancel_batch(self):
+        """Toplu işlemi iptal eder"""
+        if self.batch_worker is not None and self.batch_worker.isRunning():
+            self.batch_worker.cancel()
+            self.progress_status.setText("İptal ediliyor...")
 
     def check_split_ratios(self):
         """Train, validation ve test setlerinin oranlarını kontrol eder"""
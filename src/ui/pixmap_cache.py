@@ -0,0 +1,258 @@
+import threading
+from collections import OrderedDict
+
+from PyQt6.QtCore import QRunnable, QSize, QThreadPool, Qt
+from PyQt6.QtGui import QImage, QImageIOHandler, QImageReader, QPixmap
+
+from src.utils.image_pyramid import get_pyramid
+
+
+def _cost(image):
+    """Bir QImage'ın bellekte kapladığı bayt"""
+    return image.sizeInBytes()
+
+
+class PixmapCache:
+    """
+    Ölçeklenmiş pixmap'ler için bellek sınırlı LRU
+
+    Kayıtlar QImage olarak tutulur; böylece arka plan iş parçacıkları da
+    çözüp ölçekleyebilir. Anahtarlar ("scaled", yol, genişlik, yükseklik)
+    biçimindedir. Toplam boyut max_bytes'ı aşınca en uzun süredir
+    kullanılmayan kayıtlar atılır.
+    """
+
+    def __init__(self, max_bytes=768 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()  # key -> (item, cost)
+        self._total = 0
+        self._sizes = {}  # path -> başlıktan okunan orijinal boyut
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            self._items.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, item):
+        cost = _cost(item)
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._total -= old[1]
+            self._items[key] = (item, cost)
+            self._total += cost
+
+            # Sınırı aşınca en eski kayıtları at (en yeni kayıt her zaman kalır)
+            while self._total > self.max_bytes and len(self._items) > 1:
+                _, (_, evicted_cost) = self._items.popitem(last=False)
+                self._total -= evicted_cost
+
+    def contains(self, key):
+        with self._lock:
+            return key in self._items
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._total = 0
+
+    def total_bytes(self):
+        return self._total
+
+    # Resim yardımcıları
+
+    def image_size(self, path):
+        """Resmin orijinal boyutunu (QSize) piksel çözmeden başlıktan okur"""
+        with self._lock:
+            size = self._sizes.get(path)
+        if size is None:
+            size = QImageReader(path).size()
+            if size.isValid():
+                with self._lock:
+                    self._sizes[path] = size
+        return size
+
+    def get_scaled_image(self, path, width, height):
+        """
+        Etiket boyutuna sığacak şekilde ölçeklenmiş QImage'ı döndürür
+
+        Bellekte bu resmin hedeften büyük bir sürümü (başka bir boyutta
+        ölçeklenmiş) varsa ondan küçültülür; yoksa resim doğrudan
+        hedef boyutta çözülür (JPEG'de DCT ölçekleme), tam çözünürlük hiç
+        çözülmez.
+        """
+        key = ("scaled", path, width, height)
+        image = self.get(key)
+        if image is None:
+            source = self._largest_cached(path)
+            if source is not None and source.width() >= source.size().scaled(
+                width, height, Qt.AspectRatioMode.KeepAspectRatio
+            ).width():
+                image = scale_to_fit(source, width, height)
+            else:
+                image = decode_image(path, self.image_size(path), width, height)
+            if image.isNull():
+                return image
+            self.put(key, image)
+        return image
+
+    def _largest_cached(self, path):
+        """Bu resmin önbellekteki en büyük çözülmüş sürümü (yoksa None)"""
+        best = None
+        with self._lock:
+            for key, (image, _) in self._items.items():
+                if key[0] == "scaled" and key[1] == path:
+                    if best is None or image.width() > best.width():
+                        best = image
+        return best
+
+    def get_scaled(self, path, width, height):
+        """
+        Ölçeklenmiş pixmap'i ve orijinal resim boyutunu döndürür
+
+        Yalnızca GUI iş parçacığından çağrılmalıdır.
+
+        Returns:
+            tuple: (QPixmap, QSize)
+        """
+        image = self.get_scaled_image(path, width, height)
+        if image.isNull():
+            return QPixmap(), QSize()
+        return QPixmap.fromImage(image), self.image_size(path)
+
+
+def scale_to_fit(image, width, height):
+    """Resmi en-boy oranını koruyarak verilen alana sığdırır"""
+    return image.scaled(
+        width,
+        height,
+        Qt.AspectRatioMode.KeepAspectRatio,
+        Qt.TransformationMode.SmoothTransformation,
+    )
+
+
+def supports_region_reads(reader):
+    """Biçim bölge okumasını (ClipRect) destekliyor mu (ör. JPEG; PNG ve TIFF değil)"""
+    return reader.supportsOption(QImageIOHandler.ImageOption.ClipRect)
+
+
+def exceeds_allocation_limit(size):
+    """Tam çözme Qt'nin bellek sınırını (QImageReader.allocationLimit) aşar mı"""
+    limit = QImageReader.allocationLimit()
+    return limit > 0 and size.width() * size.height() * 4 > limit * 1024 * 1024
+
+
+def pil_to_qimage(image):
+    """RGB/RGBA bir PIL resmini kopyalayarak QImage'a çevirir"""
+    if image.mode == "RGBA":
+        image_format = QImage.Format.Format_RGBA8888
+    else:
+        image = image.convert("RGB")
+        image_format = QImage.Format.Format_RGB888
+    data = image.tobytes()
+    channels = len(image.getbands())
+    return QImage(
+        data, image.width, image.height, image.width * channels, image_format
+    ).copy()
+
+
+def decode_image(path, size=None, width=None, height=None):
+    """
+    Resmi QImage olarak çözer (herhangi bir iş parçacığından çağrılabilir)
+
+    width ve height verilirse resim yalnızca bu alana sığacak çözünürlükte
+    çözülür; size resmin başlıktan okunmuş orijinal boyutudur. Küçültülerek
+    çözülemeyen ve Qt'nin bellek sınırını aşan büyük resimler (ör. büyük
+    PNG/TIFF) karo piramidinin uygun seviyesinden okunur.
+    """
+    reader = QImageReader(path)
+    if width and height:
+        if size is None or not size.isValid():
+            size = reader.size()
+        if (
+            size.isValid()
+            and not supports_region_reads(reader)
+            and exceeds_allocation_limit(size)
+        ):
+            try:
+                pyramid = get_pyramid(path)
+                image = pil_to_qimage(
+                    pyramid.level_image(pyramid.level_for_size(width, height))
+                )
+                return scale_to_fit(image, width, height)
+            except Exception as e:
+                print(f"Resim çözülemedi: {path}, {e}")
+                return QImage()
+        if size.isValid():
+            target = size.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatio)
+            if target.width() < size.width() and not target.isEmpty():
+                reader.setScaledSize(target)
+    image = reader.read()
+    if image.isNull():
+        print(f"Resim çözülemedi: {path}, {reader.errorString()}")
+    return image
+
+
+class _DecodeTask(QRunnable):
+    def __init__(self, prefetcher, path, size):
+        super().__init__()
+        self.prefetcher = prefetcher
+        self.path = path
+        self.size = size
+
+    def run(self):
+        try:
+            # Yalnızca ekran boyutundaki sürüm çözülür
+            self.prefetcher.cache.get_scaled_image(self.path, *self.size)
+        finally:
+            self.prefetcher._done(self.path)
+
+
+class ImagePrefetcher:
+    """Gezinme sırasındaki sonraki ve önceki K resmi arka planda çözer"""
+
+    def __init__(self, cache, depth=2, max_threads=2):
+        self.cache = cache
+        self.depth = depth  # Her yönde önceden çözülecek resim sayısı
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max_threads)
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def prefetch(self, image_paths, index, width, height):
+        """
+        index etrafındaki komşuları (önce ileri yön) kuyruğa ekler
+
+        width, height: Komşuların ölçekleneceği görüntüleme alanı
+        """
+        if not image_paths:
+            return
+
+        # Eski istekler artık gereksiz; henüz başlamayanları iptal et
+        self.pool.clear()
+        with self._lock:
+            self._pending.clear()
+
+        count = len(image_paths)
+        for step in range(1, self.depth + 1):
+            for neighbor in (index + step, index - step):
+                path = image_paths[neighbor % count]
+                if self.cache.contains(("scaled", path, width, height)):
+                    continue
+                with self._lock:
+                    if path in self._pending:
+                        continue
+                    self._pending.add(path)
+                self.pool.start(_DecodeTask(self, path, (width, height)))
+
+    def _done(self, path):
+        with self._lock:
+            self._pending.discard(path)
+
+    def shutdown(self):
+        self.pool.clear()
+        self.pool.waitForDone()
@@ -0,0 +1,165 @@
+from bisect import bisect_left
+
+
+def _bounds(rect):
+    """QRect'in (sol, üst, sağ, alt) sınırları; QRect.contains ile aynı kapsama"""
+    left, right = rect.left(), rect.right()
+    top, bottom = rect.top(), rect.bottom()
+    if left > right:
+        left, right = right, left
+    if top > bottom:
+        top, bottom = bottom, top
+    return left, top, right, bottom
+
+
+def _near(value, center, handle_size):
+    """value, center'a ortalanmış handle_size genişliğindeki aralıkta mı"""
+    low = int(center - handle_size / 2)
+    return low <= value <= low + handle_size - 1
+
+
+def resize_handle_at(rect, x, y, handle_size=10):
+    """
+    (x, y) noktasının dikdörtgenin hangi yeniden boyutlandırma tutamacında
+    olduğunu döndürür, hiçbirinde değilse None
+
+    Tutamaçlar köşe ve kenar ortalarına yerleştirilmiş handle_size
+    boyutundaki karelerdir; kontrol sırası köşeler, sonra kenarlardır.
+    """
+    left, top = rect.left(), rect.top()
+    right, bottom = rect.right(), rect.bottom()
+
+    on_left = _near(x, left, handle_size)
+    on_right = _near(x, right, handle_size)
+    on_top = _near(y, top, handle_size)
+    on_bottom = _near(y, bottom, handle_size)
+
+    # Köşe tutamaçları
+    if on_top and on_left:
+        return "top-left"
+    if on_top and on_right:
+        return "top-right"
+    if on_bottom and on_left:
+        return "bottom-left"
+    if on_bottom and on_right:
+        return "bottom-right"
+
+    # Kenar tutamaçları
+    if (on_left or on_right) and _near(y, top + rect.height() / 2, handle_size):
+        return "left" if on_left else "right"
+    if (on_top or on_bottom) and _near(x, left + rect.width() / 2, handle_size):
+        return "top" if on_top else "bottom"
+
+    return None
+
+
+class RectIndex:
+    """
+    Gösterilen dikdörtgenler için düzgün ızgara tabanlı uzamsal indeks
+
+    Her dikdörtgen, kapladığı ızgara hücrelerine kalıcı bir kimlikle
+    kaydedilir. Kimlikler liste sırasıyla artar; bu yüzden bir kimliğin
+    listedeki indeksi ikili aramayla bulunur ve en büyük kimlik en üstteki
+    dikdörtgendir. Hücreler görünüm alanıyla sınırlıdır; alan dışındaki
+    noktalar için doğrusal aramaya dönülür.
+    """
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.width = 0
+        self.height = 0
+        self._ids = []  # liste sırası -> kimlik (artan)
+        self._bounds = {}  # kimlik -> (sol, üst, sağ, alt)
+        self._cells = {}  # (hx, hy) -> kimlik kümesi
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self._ids)
+
+    def clear(self):
+        self._ids = []
+        self._bounds = {}
+        self._cells = {}
+        self._next_id = 0
+
+    def rebuild(self, rects, width, height):
+        """İndeksi dikdörtgen listesinden ve görünüm boyutundan yeniden kurar"""
+        self.clear()
+        self.width = width
+        self.height = height
+        for rect in rects:
+            self.append(rect)
+
+    def append(self, rect):
+        """Listenin sonuna (en üste) bir dikdörtgen ekler"""
+        rect_id = self._next_id
+        self._next_id += 1
+        self._ids.append(rect_id)
+        self._insert(rect_id, _bounds(rect))
+
+    def update(self, index, rect):
+        """index'teki dikdörtgenin konumunu/boyutunu günceller (taşıma, boyutlandırma)"""
+        rect_id = self._ids[index]
+        bounds = _bounds(rect)
+        old = self._bounds[rect_id]
+        if bounds == old:
+            return
+        if self._cell_range(bounds) != self._cell_range(old):
+            self._discard(rect_id)
+            self._insert(rect_id, bounds)
+        else:
+            self._bounds[rect_id] = bounds
+
+    def remove(self, index):
+        """index'teki dikdörtgeni siler; sonraki indeksler bir kayar"""
+        rect_id = self._ids.pop(index)
+        self._discard(rect_id)
+        del self._bounds[rect_id]
+
+    def at(self, x, y):
+        """(x, y) noktasını içeren en üstteki dikdörtgenin indeksi, yoksa -1"""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            key = (x // self.cell_size, y // self.cell_size)
+            candidates = self._cells.get(key, ())
+        else:
+            candidates = self._bounds.keys()
+
+        best = -1
+        for rect_id in candidates:
+            if rect_id > best:
+                left, top, right, bottom = self._bounds[rect_id]
+                if left <= x <= right and top <= y <= bottom:
+                    best = rect_id
+        if best < 0:
+            return -1
+        return bisect_left(self._ids, best)
+
+    def _cell_range(self, bounds):
+        """Dikdörtgenin kapladığı hücre aralığı (görünüm alanına kırpılmış)"""
+        left, top, right, bottom = bounds
+        size = self.cell_size
+        max_x = max(0, self.width - 1) // size
+        max_y = max(0, self.height - 1) // size
+        return (
+            min(max(left, 0) // size, max_x),
+            min(max(top, 0) // size, max_y),
+            min(max(right, 0) // size, max_x),
+            min(max(bottom, 0) // size, max_y),
+        )
+
+    def _insert(self, rect_id, bounds):
+        self._bounds[rect_id] = bounds
+        x1, y1, x2, y2 = self._cell_range(bounds)
+        for hx in range(x1, x2 + 1):
+            for hy in range(y1, y2 + 1):
+                self._cells.setdefault((hx, hy), set()).add(rect_id)
+
+    def _discard(self, rect_id):
+        x1, y1, x2, y2 = self._cell_range(self._bounds[rect_id])
+        for hx in range(x1, x2 + 1):
+            for hy in range(y1, y2 + 1):
+                cell = self._cells.get((hx, hy))
+                if cell is not None:
+                    cell.discard(rect_id)
+                    if not cell:
+                        del self._cells[(hx, hy)]
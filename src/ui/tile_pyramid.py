@@ -0,0 +1,198 @@
+import math
+import threading
+
+from PyQt6.QtCore import QObject, QRect, QRectF, QRunnable, QSize, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QGuiApplication, QImage, QImageReader
+
+from src.ui.pixmap_cache import PixmapCache, pil_to_qimage, supports_region_reads
+from src.utils.image_pyramid import TILE_SIZE, get_pyramid, max_level, tile_box
+
+
+class _TileSignals(QObject):
+    tile_ready = pyqtSignal()
+
+
+class _TileTask(QRunnable):
+    def __init__(self, viewport, key):
+        super().__init__()
+        self.viewport = viewport
+        self.key = key
+
+    def run(self):
+        try:
+            image = decode_tile(*self.key)
+            if not image.isNull():
+                self.viewport.tiles.put(self.key, image)
+                self.viewport.signals.tile_ready.emit()
+        finally:
+            self.viewport._done(self.key)
+
+
+def tile_region(level, tx, ty, orig_width, orig_height):
+    """Bir karonun orijinal resimde kapladığı bölge"""
+    x1, y1, x2, y2 = tile_box(level, tx, ty, orig_width, orig_height)
+    return QRect(x1, y1, x2 - x1, y2 - y1)
+
+
+def decode_tile(path, level, tx, ty, orig_width, orig_height):
+    """
+    Tek bir karoyu çözer
+
+    Bölge okuyabilen biçimlerde (JPEG) yalnızca karonun bölgesi (ClipRect)
+    ve seviyenin çözünürlüğünde (ScaledSize, 1 / 2^level) okunur. Diğer
+    biçimlerde karo, diskte saklanan karo piramidinden gelir.
+    """
+    reader = QImageReader(path)
+    if not supports_region_reads(reader):
+        try:
+            return pil_to_qimage(get_pyramid(path).tile(level, tx, ty))
+        except Exception as e:
+            print(f"Karo çözülemedi: {path} {level}/{tx}/{ty}, {e}")
+            return QImage()
+
+    region = tile_region(level, tx, ty, orig_width, orig_height)
+    reader.setClipRect(region)
+    if level:
+        reader.setScaledSize(
+            QSize(
+                max(1, math.ceil(region.width() / (1 << level))),
+                max(1, math.ceil(region.height() / (1 << level))),
+            )
+        )
+    image = reader.read()
+    if image.isNull():
+        print(f"Karo çözülemedi: {path} {level}/{tx}/{ty}, {reader.errorString()}")
+    return image
+
+
+class TiledViewport:
+    """
+    Yakınlaştırılmış resmi yalnızca görünen karoları çözerek çizer
+
+    Resim, her seviyesi bir öncekinin yarı çözünürlüğünde olan bir piramit
+    olarak düşünülür; seviyeler ve karolar ihtiyaç duyuldukça arka planda
+    çözülür (bölge okuyamayan biçimlerde piramit diskte üretilip saklanır). Çizimde ekran ölçeğinden daha düşük çözünürlüklü olmayan en
+    kaba seviye seçilir, henüz hazır olmayan karoların yerine ön izleme
+    büyütülerek çizilir. Karo önbelleği ekran boyutuyla sınırlıdır, resim
+    boyutuyla değil.
+    """
+
+    def __init__(self, max_threads=2):
+        self.signals = _TileSignals()
+        self.tiles = PixmapCache(max_bytes=self._tile_budget())
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max_threads)
+        self.path = ""
+        self.orig_width = 0
+        self.orig_height = 0
+        self.preview = None  # Sığdırılmış görünümün QPixmap'i
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _tile_budget():
+        """Karo önbelleği sınırı: birkaç ekran dolusu karo"""
+        screen = QGuiApplication.primaryScreen()
+        if screen is None:
+            return 256 * 1024 * 1024
+        size = screen.size() * screen.devicePixelRatio()
+        # Görünen seviye + kenar payı + bir komşu seviye için
+        return max(64 * 1024 * 1024, size.width() * size.height() * 4 * 8)
+
+    def set_image(self, path, orig_width, orig_height, preview):
+        """Gösterilen resmi değiştirir"""
+        if path != self.path:
+            self.pool.clear()
+            with self._lock:
+                self._pending.clear()
+            self.tiles.clear()
+        self.path = path
+        self.orig_width = orig_width
+        self.orig_height = orig_height
+        self.preview = preview
+
+    def level_for_scale(self, scale):
+        """Ekran ölçeği için kullanılacak piramit seviyesi"""
+        if scale >= 1 or scale <= 0:
+            return 0
+        level = int(math.floor(math.log2(1 / scale)))
+        return min(level, max_level(self.orig_width, self.orig_height))
+
+    def paint(self, painter, image_info, view_rect):
+        """Görünen bölgeyi önizleme ve karolarla çizer"""
+        if not self.path or not self.orig_width or not self.orig_height:
+            return
+
+        # Görünen bölge (orijinal koordinatlarda)
+        left, top = image_info.to_original(view_rect.left(), view_rect.top())
+        right, bottom = image_info.to_original(
+            view_rect.right() + 1, view_rect.bottom() + 1
+        )
+        left = max(0.0, left)
+        top = max(0.0, top)
+        right = min(float(self.orig_width), right)
+        bottom = min(float(self.orig_height), bottom)
+        if right <= left or bottom <= top:
+            return
+
+        # Önce önizlemeyi büyüterek arka plan olarak çiz
+        if self.preview is not None and not self.preview.isNull():
+            px = self.preview.width() / self.orig_width
+            py = self.preview.height() / self.orig_height
+            source = QRectF(left * px, top * py, (right - left) * px, (bottom - top) * py)
+            painter.drawPixmap(self._to_display(image_info, left, top, right, bottom), self.preview, source)
+
+        # Görünen karoları çiz, eksik olanları iste
+        level = self.level_for_scale(image_info.scale_x)
+        span = TILE_SIZE << level
+        first_tx, last_tx = int(left // span), int((right - 1) // span)
+        first_ty, last_ty = int(top // span), int((bottom - 1) // span)
+
+        missing = []
+        for ty in range(first_ty, last_ty + 1):
+            for tx in range(first_tx, last_tx + 1):
+                key = (self.path, level, tx, ty, self.orig_width, self.orig_height)
+                tile = self.tiles.get(key)
+                region = tile_region(level, tx, ty, self.orig_width, self.orig_height)
+                if tile is None:
+                    missing.append(key)
+                    continue
+                target = self._to_display(
+                    image_info,
+                    region.left(),
+                    region.top(),
+                    region.left() + region.width(),
+                    region.top() + region.height(),
+                )
+                painter.drawImage(target, tile)
+
+        self._request(missing)
+
+    @staticmethod
+    def _to_display(image_info, left, top, right, bottom):
+        x1, y1 = image_info.to_display(left, top)
+        x2, y2 = image_info.to_display(right, bottom)
+        return QRectF(x1, y1, x2 - x1, y2 - y1)
+
+    def _request(self, keys):
+        """Eksik karoları arka planda çözülmek üzere kuyruğa ekler"""
+        for key in keys:
+            with self._lock:
+                if key in self._pending:
+                    continue
+                self._pending.add(key)
+            self.pool.start(_TileTask(self, key))
+
+    def _done(self, key):
+        with self._lock:
+            self._pending.discard(key)
+
+    def cancel_pending(self):
+        """Henüz başlamamış karo isteklerini iptal eder (görünüm değişti)"""
+        self.pool.clear()
+        with self._lock:
+            self._pending.clear()
+
+    def shutdown(self):
+        self.pool.clear()
+        self.pool.waitForDone()
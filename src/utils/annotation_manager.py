@@ -1,30 +1,237 @@
 import os
 import json
-from PyQt6.QtGui import QPixmap
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.utils.annotation_store import (
+    AnnotationStore,
+    as_columns,
+    denormalize_yolo,
+    normalize_yolo,
+)
+from src.utils.edit_journal import EditJournal
+from src.utils.image_size import ImageSizeCache
+
+
+def _fsync_dir(path):
+    """Flush directory entries (renames, removals) to disk where supported"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        # Not supported for directories on every platform (e.g. Windows)
+        pass
+    finally:
+        os.close(fd)
 
 
 class AnnotationManager:
     def __init__(self):
-        self.annotations = {}  # Dictionary to store annotations for each image
+        self.annotations = AnnotationStore()  # Columnar store of all boxes
         self.output_dir = ""  # Directory to save annotations
         self.class_names = ["default"]  # Default class
         self.classes_file = ""  # File to store class information
+        self.image_sizes = ImageSizeCache()  # Header-based image size lookup
+        self.dirty = set()  # Images modified since their label file was written
+        self.classes_dirty = False  # Class names changed since last save
+        self.label_formats = {}  # Format of each label file on disk
+        self.save_workers = 8  # Thread count for writing label files
+        self.load_workers = 8  # Thread count for parsing label files
+        self.output_format = "yolo"  # Format used by autosave compaction
+        self.journal = EditJournal()  # Append-only log of unsaved edits
+        self.autosave_interval = 5.0  # Seconds between journal compactions
+        self._lock = threading.RLock()
+        self._replaying = False
+        self._autosave_thread = None
+        self._autosave_stop = threading.Event()
+        self.lazy = False  # Parse label files on first access only
+        self._loaded = set()  # Images whose label file has been parsed (lazy mode)
+        self._all_loaded = True
+        self._warmup_thread = None
+        self._warmup_stop = threading.Event()
+        self._convert_pending = False  # Convert label files to output_format as they load
+        self._journaled = set()  # Images with ops in the current journal
+        self._compacting = set()  # Images with ops in the journal being compacted
+
+    def initialize(self, image_paths, output_dir, lazy=False):
+        """
+        Initialize annotations for a set of images
+
+        In lazy mode label files are parsed on first access of each image
+        instead of up front; start_warmup() fills the rest in the background.
+        """
+        # Close the journal of a previously opened folder cleanly
+        self.close()
 
-    def initialize(self, image_paths, output_dir):
-        """Initialize annotations for a set of images"""
         self.output_dir = output_dir
         self.classes_file = os.path.join(self.output_dir, "classes.json")
+        self.image_sizes.load(
+            os.path.join(self.output_dir, ImageSizeCache.CACHE_FILENAME)
+        )
 
         # Initialize empty annotations for each image
-        self.annotations = {}
-        for img_path in image_paths:
-            self.annotations[img_path] = []
+        self.annotations = AnnotationStore(image_paths)
+        self.dirty = set()
+        self.label_formats = {}
+        self._journaled = set()
+        self._compacting = set()
+        self.lazy = lazy
+        self._loaded = set()
+        self._all_loaded = not lazy
+        self._convert_pending = False
 
         # Load existing class information
         self.load_classes()
+        self.classes_dirty = False
 
         # Load existing annotations
-        self.load_existing_annotations(image_paths)
+        if not lazy:
+            self.load_existing_annotations(image_paths)
+            self.image_sizes.save()
+
+        # Recover edits of a session that did not shut down cleanly
+        journal_path = os.path.join(self.output_dir, EditJournal.FILENAME)
+        self.recover_journal(journal_path)
+        self.journal.open(journal_path)
+
+    def recover_journal(self, journal_path):
+        """Replay a leftover edit journal and write the result to label files"""
+        ops = EditJournal.pending_ops(journal_path)
+        if not ops:
+            return 0
+
+        self._replaying = True
+        try:
+            for op in ops:
+                self.apply_op(op)
+        finally:
+            self._replaying = False
+        print(f"Önceki oturumdan {len(ops)} düzenleme kurtarıldı.")
+
+        # Recovered edits are compacted into label files right away
+        self.save_annotations(self.output_format, convert_all=False)
+        if self.has_unsaved_changes():
+            # Some files could not be written; keep the journal for the next save
+            return len(ops)
+        for path in (journal_path + EditJournal.COMPACTING_SUFFIX, journal_path):
+            if os.path.exists(path):
+                os.remove(path)
+        return len(ops)
+
+    def apply_op(self, op):
+        """
+        Apply a single journal operation
+
+        Interactive edits are journaled as add/update/delete/class/clear ops
+        and bulk replacements as "set" ops.
+        """
+        kind = op.get("op")
+        img_path = op.get("img")
+        if kind == "add":
+            return self.add_rectangle(img_path, *op["box"])
+        if kind == "update":
+            return self.update_rectangle(img_path, op["index"], *op["box"])
+        if kind == "delete":
+            return self.delete_rectangle(img_path, op["index"])
+        if kind == "clear":
+            return self.clear_rectangles(img_path)
+        if kind == "set":
+            return self.set_rectangles(img_path, [tuple(box) for box in op["boxes"]])
+        if kind == "class":
+            return self.set_rectangle_class(img_path, op["index"], op["class_id"])
+        if kind == "classes":
+            self.set_class_names(op["names"])
+            return True
+        print(f"Unknown journal operation: {op}")
+        return False
+
+    def _log(self, op):
+        """Append an edit to the journal unless it is being replayed"""
+        if not self._replaying:
+            self.journal.append(op)
+
+    def _journal_base(self, img_path):
+        """
+        Return a "set" op with the current boxes of an image about to be edited
+
+        Needed before the first edit of an image in a journal: label files
+        may already contain the journaled edits when a crash happens between
+        writing them and discarding the journal, so replay starts from the
+        boxes the edits were made on instead of the label file. Returns None
+        when the journal already has a starting point for the image.
+        """
+        if self._replaying or img_path in self._journaled:
+            return None
+        return self._set_op(img_path)
+
+    def _set_op(self, img_path):
+        boxes, classes = self.annotations.get_arrays(img_path)
+        return {
+            "op": "set",
+            "img": img_path,
+            "boxes": np.column_stack([boxes, classes]).tolist(),
+        }
+
+    def _log_edit(self, base, op):
+        """Journal an edit, preceded by the starting point of its image if needed"""
+        if self._replaying:
+            return
+        if base is not None:
+            self.journal.append(base)
+        self.journal.append(op)
+        self._journaled.add(op["img"])
+
+    def start_autosave(self, interval=None):
+        """Start compacting the journal into label files in the background"""
+        if interval is not None:
+            self.autosave_interval = interval
+        if self._autosave_thread is not None and self._autosave_thread.is_alive():
+            return
+        self._autosave_stop.clear()
+        self._autosave_thread = threading.Thread(target=self._autosave_loop, daemon=True)
+        self._autosave_thread.start()
+
+    def stop_autosave(self):
+        """Stop the background compaction thread"""
+        self._autosave_stop.set()
+        if self._autosave_thread is not None:
+            self._autosave_thread.join()
+            self._autosave_thread = None
+
+    def _autosave_loop(self):
+        while not self._autosave_stop.wait(self.autosave_interval):
+            try:
+                self.journal.sync()
+                if self.has_unsaved_changes():
+                    self.compact()
+            except Exception as e:
+                print(f"Otomatik kayıt sırasında hata: {e}")
+
+    def compact(self):
+        """Write journaled edits to label files and drop the journal"""
+        return self.save_annotations(
+            self.output_format, verbose=False, convert_all=False
+        )
+
+    def close(self):
+        """Compact pending edits and shut the journal down cleanly"""
+        self.stop_autosave()
+        self.stop_warmup()
+        if not self.journal.is_open():
+            return
+        if self.has_unsaved_changes():
+            self.save_annotations(self.output_format, verbose=False, convert_all=False)
+        self.journal.close(remove=not self.has_unsaved_changes())
+
+    def has_unsaved_changes(self):
+        """Return True if there are edits not yet written to label files"""
+        return bool(self.dirty) or self.classes_dirty
 
     def load_classes(self):
         """Load class information from file"""
@@ -47,206 +254,502 @@ class AnnotationManager:
         try:
             with open(self.classes_file, "w") as f:
                 json.dump(self.class_names, f)
+                self.classes_dirty = False
                 print(f"Classes saved: {self.class_names}")
         except Exception as e:
             print(f"Error saving classes: {e}")
 
     def load_existing_annotations(self, image_paths):
         """Load existing annotations from files"""
-        for img_path in image_paths:
-            # Create txt filename from image filename
-            img_name = os.path.basename(img_path)
-            img_name_without_ext = os.path.splitext(img_name)[0]
-            txt_path = os.path.join(self.output_dir, f"{img_name_without_ext}.txt")
-
-            if os.path.exists(txt_path):
-                # Get image dimensions (needed for YOLO format conversion)
-                pixmap = QPixmap(img_path)
-                img_width = pixmap.width()
-                img_height = pixmap.height()
-
-                with open(txt_path, "r") as f:
-                    lines = f.readlines()
-                    for line in lines:
-                        try:
-                            parts = line.strip().split()
-
-                            if len(parts) == 5:
-                                # Could be YOLO or standard format
-                                if (
-                                    0 < float(parts[1]) < 1
-                                    and 0 < float(parts[2]) < 1
-                                    and 0 < float(parts[3]) < 1
-                                    and 0 < float(parts[4]) < 1
-                                ):
-                                    # YOLO format: class_id, x_center_norm, y_center_norm, w_norm, h_norm
-                                    class_id = int(parts[0])
-                                    x_center_norm = float(parts[1])
-                                    y_center_norm = float(parts[2])
-                                    w_norm = float(parts[3])
-                                    h_norm = float(parts[4])
-
-                                    # Convert normalized coordinates to pixel values
-                                    x_center = x_center_norm * img_width
-                                    y_center = y_center_norm * img_height
-                                    w = w_norm * img_width
-                                    h = h_norm * img_height
-
-                                    # Calculate top-left corner coordinates
-                                    x = int(x_center - w / 2)
-                                    y = int(y_center - h / 2)
-                                    w, h = int(w), int(h)
-
-                                    self.annotations[img_path].append(
-                                        (x, y, w, h, class_id)
-                                    )
-                                else:
-                                    # Standard format: x, y, w, h, class_id
-                                    x, y, w, h, class_id = map(int, parts)
-                                    self.annotations[img_path].append(
-                                        (x, y, w, h, class_id)
-                                    )
-                            elif len(parts) == 4:  # x y w h (old format, no class)
-                                x, y, w, h = map(int, parts)
-                                class_id = 0  # Default class
-                                self.annotations[img_path].append(
-                                    (x, y, w, h, class_id)
-                                )
-                            else:
-                                print(f"Invalid line format: {line}")
-                                continue
-                        except Exception as e:
-                            print(f"Error parsing line: {line}, {e}")
+        workers = max(1, min(self.load_workers, len(image_paths)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            parsed = list(executor.map(self._parse_label_file, image_paths))
+
+        loaded = {}
+        for img_path, result in zip(image_paths, parsed):
+            if result is None:
+                continue
+            boxes, classes, file_format = result
+            loaded[img_path] = (boxes, classes)
+            self.label_formats[img_path] = file_format
+
+        # Insert all boxes into the store with a single concatenation
+        self.annotations.bulk_load(loaded)
+
+    def _parse_label_file(self, img_path):
+        """
+        Parse the label file of an image
+
+        The whole file is converted to a number array in one step and the
+        YOLO / pixel format is decided per file with vectorized checks. Files
+        that mix formats or column counts fall back to line-by-line parsing.
+
+        Returns:
+            tuple: (boxes, classes, format) or None if there is no label file
+        """
+        # Create txt filename from image filename
+        txt_path = self.label_path(img_path)
+        try:
+            with open(txt_path, "r") as f:
+                text = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            print(f"Error reading label file: {txt_path}, {e}")
+            return None
+
+        lines = [line for line in text.splitlines() if line.strip()]
+        if not lines:
+            return None
+
+        columns = len(lines[0].split())
+        try:
+            values = np.array(text.split(), dtype=np.float64)
+        except ValueError:
+            values = None
+
+        if (
+            values is not None
+            and columns in (4, 5)
+            and len(values) == columns * len(lines)
+        ):
+            values = values.reshape(len(lines), columns)
+            coords = values[:, 1:] if columns == 5 else None
+            if columns == 5 and np.all((coords > 0) & (coords < 1)):
+                # YOLO format: class_id, x_center_norm, y_center_norm, w_norm, h_norm
+                img_width, img_height = self.get_image_size(img_path)
+                boxes = denormalize_yolo(coords, img_width, img_height)
+                classes = values[:, 0].astype(np.int32)
+                return boxes, classes, "yolo"
+            if np.all(values == np.trunc(values)):
+                # Standard format: x, y, w, h[, class_id]
+                return (*as_columns(values.astype(np.int32)), "standard")
+
+        return self._parse_label_lines(img_path, lines)
+
+    def _parse_label_lines(self, img_path, lines):
+        """Parse label lines one by one, deciding the format per line"""
+        rectangles = []
+        file_format = "standard"
+        image_size = None
+        for line in lines:
+            try:
+                parts = line.strip().split()
+
+                if len(parts) == 5:
+                    # Could be YOLO or standard format
+                    if (
+                        0 < float(parts[1]) < 1
+                        and 0 < float(parts[2]) < 1
+                        and 0 < float(parts[3]) < 1
+                        and 0 < float(parts[4]) < 1
+                    ):
+                        # Get image dimensions (needed for YOLO format conversion)
+                        if image_size is None:
+                            image_size = self.get_image_size(img_path)
+                        box = denormalize_yolo(
+                            [float(value) for value in parts[1:]], *image_size
+                        )[0]
+                        rectangles.append((*box.tolist(), int(parts[0])))
+                        file_format = "yolo"
+                    else:
+                        # Standard format: x, y, w, h, class_id
+                        rectangles.append(tuple(map(int, parts)))
+                elif len(parts) == 4:  # x y w h (old format, no class)
+                    x, y, w, h = map(int, parts)
+                    class_id = 0  # Default class
+                    rectangles.append((x, y, w, h, class_id))
+                else:
+                    print(f"Invalid line format: {line}")
+                    continue
+            except Exception as e:
+                print(f"Error parsing line: {line}, {e}")
+
+        boxes, classes = as_columns(rectangles)
+        return boxes, classes, file_format
+
+    def is_loaded(self, img_path):
+        """Return True if the label file of an image has been parsed"""
+        return self._all_loaded or img_path in self._loaded
+
+    def ensure_loaded(self, img_path):
+        """Parse the label file of an image on first access (lazy mode)"""
+        if self.is_loaded(img_path) or img_path not in self.annotations:
+            return
+        with self._lock:
+            if self.is_loaded(img_path):
+                return
+            result = self._parse_label_file(img_path)
+            if result is not None:
+                boxes, classes, file_format = result
+                self.annotations.set(img_path, (boxes, classes))
+                self._set_loaded_format(img_path, file_format, len(boxes))
+            self._loaded.add(img_path)
+
+    def _set_loaded_format(self, img_path, file_format, count):
+        """Record the format of a parsed label file; queue it for conversion if requested"""
+        self.label_formats[img_path] = file_format
+        if self._convert_pending and count and file_format != self.output_format:
+            # Written in the output format by the next compaction
+            self.dirty.add(img_path)
+
+    def start_warmup(self, chunk_size=256):
+        """Parse the not yet loaded label files in the background"""
+        if self._all_loaded:
+            return
+        if self._warmup_thread is not None and self._warmup_thread.is_alive():
+            return
+        self._warmup_stop.clear()
+        self._warmup_thread = threading.Thread(
+            target=self._warmup_loop, args=(chunk_size,), daemon=True
+        )
+        self._warmup_thread.start()
+
+    def stop_warmup(self):
+        """Stop the background warm-up"""
+        self._warmup_stop.set()
+        if self._warmup_thread is not None:
+            self._warmup_thread.join()
+            self._warmup_thread = None
+
+    def load_all(self, chunk_size=256):
+        """Parse every label file that is not loaded yet (blocking)"""
+        if self._all_loaded:
+            return
+        self.stop_warmup()
+        self._load_pending(chunk_size, threading.Event())
+
+    def _warmup_loop(self, chunk_size):
+        self._load_pending(chunk_size, self._warmup_stop)
+
+    def _load_pending(self, chunk_size, stop_event):
+        pending = [p for p in self.annotations.keys() if p not in self._loaded]
+        workers = max(1, self.load_workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for start in range(0, len(pending), chunk_size):
+                if stop_event.is_set():
+                    return
+                chunk = pending[start : start + chunk_size]
+                parsed = list(executor.map(self._parse_label_file, chunk))
+
+                # Images loaded (and maybe edited) meanwhile are not overwritten
+                with self._lock:
+                    loaded = {}
+                    for img_path, result in zip(chunk, parsed):
+                        if img_path in self._loaded:
+                            continue
+                        self._loaded.add(img_path)
+                        if result is None:
+                            continue
+                        boxes, classes, file_format = result
+                        loaded[img_path] = (boxes, classes)
+                        self._set_loaded_format(img_path, file_format, len(boxes))
+                    self.annotations.bulk_load(loaded)
+
+        with self._lock:
+            self._all_loaded = True
+            self._loaded = set()
+        self.image_sizes.save()
+        print("Tüm etiket dosyaları yüklendi.")
 
     def add_rectangle(self, img_path, x, y, w, h, class_id=0):
         """Add a new rectangle annotation"""
-        if img_path in self.annotations:
-            self.annotations[img_path].append((x, y, w, h, class_id))
-            return True
-        return False
+        with self._lock:
+            self.ensure_loaded(img_path)
+            base = self._journal_base(img_path)
+            if self.annotations.append(img_path, (x, y, w, h, class_id)):
+                self.dirty.add(img_path)
+                box = [int(v) for v in (x, y, w, h, class_id)]
+                self._log_edit(base, {"op": "add", "img": img_path, "box": box})
+                return True
+            return False
 
     def update_rectangle(self, img_path, index, x, y, w, h, class_id):
         """Update an existing rectangle annotation"""
-        if img_path in self.annotations and 0 <= index < len(
-            self.annotations[img_path]
-        ):
-            self.annotations[img_path][index] = (x, y, w, h, class_id)
-            return True
-        return False
+        with self._lock:
+            self.ensure_loaded(img_path)
+            base = self._journal_base(img_path)
+            if self.annotations.update(img_path, index, (x, y, w, h, class_id)):
+                self.dirty.add(img_path)
+                box = [int(v) for v in (x, y, w, h, class_id)]
+                self._log_edit(
+                    base, {"op": "update", "img": img_path, "index": index, "box": box}
+                )
+                return True
+            return False
+
+    def set_rectangle_class(self, img_path, index, class_id):
+        """Change the class of an existing rectangle annotation"""
+        with self._lock:
+            self.ensure_loaded(img_path)
+            base = self._journal_base(img_path)
+            if self.annotations.set_class(img_path, index, class_id):
+                self.dirty.add(img_path)
+                self._log_edit(
+                    base,
+                    {"op": "class", "img": img_path, "index": index, "class_id": int(class_id)},
+                )
+                return True
+            return False
 
     def delete_rectangle(self, img_path, index):
         """Delete a rectangle annotation"""
-        if img_path in self.annotations and 0 <= index < len(
-            self.annotations[img_path]
-        ):
-            self.annotations[img_path].pop(index)
-            return True
-        return False
+        with self._lock:
+            self.ensure_loaded(img_path)
+            base = self._journal_base(img_path)
+            if self.annotations.delete(img_path, index):
+                self.dirty.add(img_path)
+                self._log_edit(base, {"op": "delete", "img": img_path, "index": index})
+                return True
+            return False
 
     def clear_rectangles(self, img_path):
         """Clear all rectangle annotations for an image"""
-        if img_path in self.annotations:
-            self.annotations[img_path] = []
-            return True
-        return False
+        with self._lock:
+            if self.annotations.clear(img_path):
+                self._mark_loaded(img_path)
+                self.dirty.add(img_path)
+                # Clearing does not depend on earlier boxes; no starting point needed
+                self._log_edit(None, {"op": "clear", "img": img_path})
+                return True
+            return False
+
+    def set_rectangles(self, img_path, rectangles, persisted=False):
+        """
+        Replace all rectangle annotations of an image in one edit
+
+        rectangles is a list of (x, y, w, h, class_id) or an (N, 5) array.
+        persisted means the caller writes the label file itself; the image
+        is then not marked dirty, and a failed write marks it instead. A
+        persisted replacement is journaled only if a journal still holds
+        earlier edits of the image, which replay would otherwise reapply.
+        """
+        with self._lock:
+            boxes, classes = as_columns(rectangles)
+            if self.annotations.set(img_path, (boxes, classes)):
+                self._mark_loaded(img_path)
+                if not persisted:
+                    self.dirty.add(img_path)
+                if not persisted or img_path in self._journaled or img_path in self._compacting:
+                    self._log_edit(None, self._set_op(img_path))
+                return True
+            return False
+
+    def mark_dirty(self, img_path):
+        """Mark an image for rewriting on the next save (e.g. after a failed write)"""
+        with self._lock:
+            self.dirty.add(img_path)
+
+    def _mark_loaded(self, img_path):
+        """Mark an image as loaded after its boxes were replaced entirely"""
+        if not self._all_loaded:
+            self._loaded.add(img_path)
+
+    def add_class(self, class_name):
+        """Add a new class name"""
+        self.set_class_names(self.class_names + [class_name])
+
+    def set_class_names(self, class_names):
+        """Replace the class name list"""
+        with self._lock:
+            self.class_names = list(class_names)
+            self.classes_dirty = True
+            self._log({"op": "classes", "names": self.class_names})
 
     def get_annotations(self, img_path):
         """Get all annotations for an image"""
-        if img_path in self.annotations:
-            return self.annotations[img_path]
-        return []
-
-    def save_annotations(self, format="yolo"):
-        """Tüm annotationları txt dosyalarına kaydeder"""
+        # The warm-up thread may swap the store's arrays at any time
+        with self._lock:
+            self.ensure_loaded(img_path)
+            if img_path in self.annotations:
+                return self.annotations[img_path]
+            return []
+
+    def get_annotation_arrays(self, img_path):
+        """Get copies of the boxes (N, 4) and classes (N,) of an image"""
+        with self._lock:
+            self.ensure_loaded(img_path)
+            boxes, classes = self.annotations.get_arrays(img_path)
+            return boxes.copy(), classes.copy()
+
+    def save_annotations(self, format="yolo", verbose=True, convert_all=True):
+        """
+        Değişen annotationları txt dosyalarına kaydeder
+
+        Okunmuş etiket dosyaları farklı formattaysa seçilen formata çevrilir.
+        convert_all True ise (kullanıcı kaydı) henüz okunmamış dosyalar da
+        ön ısıtmada okundukça değişmiş olarak işaretlenir ve sonraki
+        sıkıştırmada çevrilir; böylece klasörde karışık formatlar kalmaz ve
+        kayıt tüm klasörün okunmasını beklemez.
+        """
         # Eğer herhangi bir annotation yoksa işlem yapma
         if not self.annotations:
             print("Kaydedilecek annotation yok!")
             return
 
+        if convert_all and not self._all_loaded:
+            with self._lock:
+                self.output_format = format
+                self._convert_pending = True
+            self.start_warmup()
+
         # Önce sınıfları kaydet
         self.save_classes()
 
+        # Yalnızca değişen resimleri ve farklı formatta kayıtlı dosyaları yaz.
+        # Anlık görüntü alınırken günlük döndürülür; sonraki düzenlemeler yeni
+        # günlüğe yazılır ve resmi yeniden değişmiş olarak işaretler.
+        to_write = []
+        to_remove = []
+        with self._lock:
+            self.output_format = format
+            rotated_journal = self.journal.rotate()
+            if rotated_journal:
+                self._compacting |= self._journaled
+                self._journaled = set()
+            for img_path, count in zip(self.annotations, self.annotations.counts()):
+                # Label files that were never parsed are never overwritten
+                if not self.is_loaded(img_path):
+                    continue
+                if img_path in self.dirty:
+                    if not count:
+                        to_remove.append(img_path)
+                        continue
+                elif not count or self.label_formats.get(img_path) == format:
+                    continue
+                boxes, classes = self.annotations.get_arrays(img_path)
+                to_write.append((img_path, (boxes.copy(), classes.copy())))
+            self.dirty.clear()
+
+        # Boyutları önceden oku; yazıcılar önbelleğe dokunmasın
+        sizes = {}
+        if format == "yolo":
+            for img_path, _ in to_write:
+                sizes[img_path] = self.get_image_size(img_path)
+
+        failed = []
+
+        def write(item):
+            img_path, annotations = item
+            try:
+                if self.write_label_file(img_path, annotations, format, sizes.get(img_path)):
+                    return True
+                failed.append(img_path)
+                return False
+            except Exception as e:
+                print(f"Etiket dosyası yazılırken hata: {e} - {img_path}")
+                failed.append(img_path)
+                return False
+
         # Annotations sayacı
         saved_count = 0
 
         # Sonra annotationları kaydet
-        for img_path, annotations in self.annotations.items():
-            if not annotations:
-                continue
+        if to_write:
+            workers = max(1, min(self.save_workers, len(to_write)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                saved_count = sum(executor.map(write, to_write))
 
-            img_name = os.path.basename(img_path)
-            img_name_without_ext = os.path.splitext(img_name)[0]
-            txt_path = os.path.join(self.output_dir, f"{img_name_without_ext}.txt")
+        # Temizlenen resimlerin eski etiket dosyalarını kaldır
+        for img_path in to_remove:
+            try:
+                self.remove_label_file(img_path)
+            except OSError as e:
+                print(f"Etiket dosyası silinirken hata: {e} - {img_path}")
+                failed.append(img_path)
+
+        self.image_sizes.save()
+
+        # Yazılamayanlar bir sonraki kayıtta yeniden denenir; o zamana kadar
+        # eski günlük de saklanır
+        if failed:
+            with self._lock:
+                self.dirty.update(failed)
+        else:
+            # Renames and removals must be on disk before the journal goes
+            _fsync_dir(self.output_dir)
+            self.journal.discard(rotated_journal)
+            if rotated_journal:
+                with self._lock:
+                    self._compacting = set()
+
+        if verbose:
+            format_name = "YOLO" if format == "yolo" else "standart"
+            print(
+                f"{saved_count} resim için annotationlar {self.output_dir} klasörüne {format_name} formatında kaydedildi."
+            )
+        return True
 
+    def get_image_size(self, img_path):
+        """Return (width, height) of an image without decoding its pixels"""
+        return self.image_sizes.get_size(img_path)
+
+    def remove_label_file(self, img_path):
+        """Remove the label file of an image that has no annotations left"""
+        txt_path = self.label_path(img_path)
+        if os.path.exists(txt_path):
+            os.remove(txt_path)
+        self.label_formats.pop(img_path, None)
+
+    def label_path(self, img_path):
+        """Return the label file path of an image"""
+        img_name = os.path.basename(img_path)
+        img_name_without_ext = os.path.splitext(img_name)[0]
+        return os.path.join(self.output_dir, f"{img_name_without_ext}.txt")
+
+    def write_label_file(self, img_path, annotations, format="yolo", image_size=None):
+        """
+        Write the annotations of a single image to its label file
+
+        annotations is a list of (x, y, w, h[, class_id]) tuples, an (N, 5)
+        array or a (boxes, classes) pair. Does not touch self.annotations, so
+        it can be called from writer threads. image_size is (width, height);
+        when omitted it is read from the image.
+
+        Returns False without writing if the image size needed for the YOLO
+        format is unknown; the image is then marked dirty.
+        """
+        txt_path = self.label_path(img_path)
+
+        if format == "yolo":
             # Resim boyutlarını al (YOLO formatı için gerekli)
-            pixmap = QPixmap(img_path)
-            img_width = pixmap.width()
-            img_height = pixmap.height()
-
-            # Hata ayıklama
-            print(f"Resim boyutları: {img_width}x{img_height} - {img_path}")
-
-            with open(txt_path, "w") as f:
-                for annotation in annotations:
-                    if len(annotation) == 5:  # x, y, w, h, class_id
-                        x, y, w, h, class_id = annotation
-
-                        if format == "yolo":
-                            # YOLO format: <class_id> <x_center> <y_center> <width> <height> (normalize edilmiş)
-                            # Piksel koordinatları hesapla
-                            x_center = x + w / 2
-                            y_center = y + h / 2
-
-                            # Normalize - koordinatların resim sınırlarını aşmadığını kontrol et
-                            x_center = min(max(0, x_center), img_width)
-                            y_center = min(max(0, y_center), img_height)
-
-                            x_center_norm = x_center / img_width
-                            y_center_norm = y_center / img_height
-                            w_norm = w / img_width
-                            h_norm = h / img_height
-
-                            # Debug yazdırma
-                            print(f"Orijinal: x={x}, y={y}, w={w}, h={h}")
-                            print(f"Merkez: x_center={x_center}, y_center={y_center}")
-                            print(
-                                f"Normalize: x_norm={x_center_norm}, y_norm={y_center_norm}, w_norm={w_norm}, h_norm={h_norm}"
-                            )
-
-                            f.write(
-                                f"{class_id} {x_center_norm:.6f} {y_center_norm:.6f} {w_norm:.6f} {h_norm:.6f}\n"
-                            )
-                        else:
-                            # Standart format: x y w h class_id
-                            f.write(f"{x} {y} {w} {h} {class_id}\n")
-                    elif len(annotation) == 4:  # Eski format, sınıfsız
-                        x, y, w, h = annotation
-                        class_id = 0  # Varsayılan sınıf
-
-                        if format == "yolo":
-                            # YOLO format
-                            x_center = x + w / 2
-                            y_center = y + h / 2
-
-                            # Normalize
-                            x_center = min(max(0, x_center), img_width)
-                            y_center = min(max(0, y_center), img_height)
-
-                            x_center_norm = x_center / img_width
-                            y_center_norm = y_center / img_height
-                            w_norm = w / img_width
-                            h_norm = h / img_height
-
-                            f.write(
-                                f"{class_id} {x_center_norm:.6f} {y_center_norm:.6f} {w_norm:.6f} {h_norm:.6f}\n"
-                            )
-                        else:
-                            f.write(f"{x} {y} {w} {h} {class_id}\n")
-
-                saved_count += 1
-
-        format_name = "YOLO" if format == "yolo" else "standart"
-        print(
-            f"{saved_count} resim için annotationlar {self.output_dir} klasörüne {format_name} formatında kaydedildi."
-        )
+            if image_size is None:
+                image_size = self.get_image_size(img_path)
+            img_width, img_height = image_size
+            if not img_width or not img_height:
+                # Boyut okunamadıysa normalize değerler bozuk olurdu
+                print(f"Resim boyutu bilinmediği için etiket yazılmadı: {img_path}")
+                self.mark_dirty(img_path)
+                return False
+
+        boxes, classes = as_columns(annotations)
+        if format == "yolo":
+            # YOLO format: <class_id> <x_center> <y_center> <width> <height> (normalize edilmiş)
+            normalized = normalize_yolo(boxes, img_width, img_height)
+            lines = [
+                f"{class_id} {xc:.6f} {yc:.6f} {w:.6f} {h:.6f}\n"
+                for class_id, (xc, yc, w, h) in zip(
+                    classes.tolist(), normalized.tolist()
+                )
+            ]
+        else:
+            # Standart format: x y w h class_id
+            lines = [
+                f"{x} {y} {w} {h} {class_id}\n"
+                for (x, y, w, h), class_id in zip(boxes.tolist(), classes.tolist())
+            ]
+
+        # Atomik yazma: önce geçici dosyaya yaz, sonra yerine taşı
+        tmp_path = f"{txt_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                f.writelines(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, txt_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.label_formats[img_path] = format
         return True
@@ -0,0 +1,384 @@
+import numpy as np
+
+# Kutu koordinatları (x, y, w, h) ve sınıf indeksi int32 tutulur: kutu başına 20 bayt
+BOX_DTYPE = np.int32
+
+
+def as_columns(rectangles):
+    """
+    (x, y, w, h[, class_id]) listesini, (N, 4|5) diziyi ya da zaten ayrılmış
+    (boxes, classes) çiftini sütunlara ayırır
+
+    Returns:
+        tuple: (boxes (N, 4) int32, classes (N,) int32)
+    """
+    if (
+        isinstance(rectangles, tuple)
+        and len(rectangles) == 2
+        and isinstance(rectangles[0], np.ndarray)
+    ):
+        boxes, classes = rectangles
+        return (
+            boxes.reshape(-1, 4).astype(BOX_DTYPE, copy=False),
+            np.asarray(classes).reshape(-1).astype(BOX_DTYPE, copy=False),
+        )
+    if isinstance(rectangles, np.ndarray):
+        array = rectangles
+    else:
+        array = np.asarray(list(rectangles))
+    if array.size == 0:
+        return np.empty((0, 4), BOX_DTYPE), np.empty(0, BOX_DTYPE)
+
+    array = array.reshape(len(array), -1)
+    boxes = array[:, :4].astype(BOX_DTYPE)
+    if array.shape[1] >= 5:
+        classes = array[:, 4].astype(BOX_DTYPE)
+    else:
+        # Eski format, sınıfsız
+        classes = np.zeros(len(array), BOX_DTYPE)
+    return boxes, classes
+
+
+def xyxy_to_rectangles(xyxy, classes):
+    """Dedektör çıktısını (x1, y1, x2, y2) (N, 5) [x, y, w, h, class_id] dizisine çevirir"""
+    xyxy = np.asarray(xyxy, dtype=np.float64).reshape(-1, 4)
+    rectangles = np.empty((len(xyxy), 5), BOX_DTYPE)
+    # int() ile aynı şekilde sıfıra doğru kes
+    rectangles[:, 0] = np.trunc(xyxy[:, 0])
+    rectangles[:, 1] = np.trunc(xyxy[:, 1])
+    rectangles[:, 2] = np.trunc(xyxy[:, 2] - xyxy[:, 0])
+    rectangles[:, 3] = np.trunc(xyxy[:, 3] - xyxy[:, 1])
+    rectangles[:, 4] = np.asarray(classes).reshape(-1)
+    return rectangles
+
+
+def normalize_yolo(boxes, img_width, img_height):
+    """
+    Piksel kutularını YOLO formatına normalize eder
+
+    Returns:
+        np.ndarray: (N, 4) float64 [x_center, y_center, w, h], 0..1 aralığında
+    """
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    x_center = np.clip(boxes[:, 0] + boxes[:, 2] / 2, 0, img_width)
+    y_center = np.clip(boxes[:, 1] + boxes[:, 3] / 2, 0, img_height)
+    return np.stack(
+        [
+            x_center / img_width,
+            y_center / img_height,
+            boxes[:, 2] / img_width,
+            boxes[:, 3] / img_height,
+        ],
+        axis=1,
+    )
+
+
+def denormalize_yolo(normalized, img_width, img_height):
+    """
+    YOLO kutularını (x_center, y_center, w, h) piksel (x, y, w, h) kutularına çevirir
+
+    Returns:
+        np.ndarray: (N, 4) int32
+    """
+    normalized = np.asarray(normalized, dtype=np.float64).reshape(-1, 4)
+    x_center = normalized[:, 0] * img_width
+    y_center = normalized[:, 1] * img_height
+    w = normalized[:, 2] * img_width
+    h = normalized[:, 3] * img_height
+    boxes = np.stack([x_center - w / 2, y_center - h / 2, w, h], axis=1)
+    return np.trunc(boxes).astype(BOX_DTYPE)
+
+
+class AnnotationStore:
+    """
+    Tüm resimlerin kutularını bitişik, tipli dizilerde tutan sütunlu depo
+
+    Her resmin kutuları dizilerde tek bir parça (segment) halindedir ve
+    resim başına (başlangıç, adet, kapasite) indeksiyle bulunur; bu sayede
+    bir resmin kutularına kopyalamadan O(1) erişilir. Kapasitesi dolan
+    parça dizilerin sonuna taşınır, boşa çıkan alan belirli bir oranı
+    geçince diziler sıkıştırılır.
+
+    Eski sözlük arayüzü (in, len, iter, items, [] ) korunur; [] resmin
+    kutularını (x, y, w, h, class_id) demetleri listesi olarak döndürür.
+    """
+
+    def __init__(self, image_paths=(), capacity=1024):
+        self.boxes = np.empty((capacity, 4), BOX_DTYPE)
+        self.classes = np.empty(capacity, BOX_DTYPE)
+        self._end = 0  # Dizilerde kullanılan son konum
+        self._garbage = 0  # Taşınan parçalardan boşa çıkan alan
+
+        # Resim başına parça indeksi
+        self._rows = {}  # img_path -> satır
+        self._paths = []  # satır -> img_path
+        self._starts = np.zeros(0, np.int64)
+        self._counts = np.zeros(0, np.int64)
+        self._capacities = np.zeros(0, np.int64)
+
+        self.add_images(image_paths)
+
+    # Sözlük benzeri arayüz
+
+    def __contains__(self, img_path):
+        return img_path in self._rows
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __iter__(self):
+        return iter(self._paths)
+
+    def __getitem__(self, img_path):
+        boxes, classes = self.get_arrays(img_path)
+        return [
+            (x, y, w, h, class_id)
+            for (x, y, w, h), class_id in zip(boxes.tolist(), classes.tolist())
+        ]
+
+    def keys(self):
+        return list(self._paths)
+
+    def items(self):
+        for img_path in self._paths:
+            yield img_path, self[img_path]
+
+    def get(self, img_path, default=None):
+        if img_path in self._rows:
+            return self[img_path]
+        return default
+
+    # Resim indeksi
+
+    def add_images(self, image_paths):
+        """Boş parçalarla yeni resimler ekler"""
+        new_paths = [p for p in dict.fromkeys(image_paths) if p not in self._rows]
+        if not new_paths:
+            return
+        first_row = len(self._paths)
+        for offset, img_path in enumerate(new_paths):
+            self._rows[img_path] = first_row + offset
+        self._paths.extend(new_paths)
+
+        extra = len(new_paths)
+        self._starts = np.concatenate([self._starts, np.zeros(extra, np.int64)])
+        self._counts = np.concatenate([self._counts, np.zeros(extra, np.int64)])
+        self._capacities = np.concatenate(
+            [self._capacities, np.zeros(extra, np.int64)]
+        )
+
+    def count(self, img_path):
+        """Bir resmin kutu sayısı"""
+        row = self._rows.get(img_path)
+        return 0 if row is None else int(self._counts[row])
+
+    def counts(self):
+        """Tüm resimlerin kutu sayıları (satır sırasıyla)"""
+        return self._counts.copy()
+
+    def total_boxes(self):
+        return int(self._counts.sum())
+
+    def nbytes(self):
+        """Kutu dizilerinin bellekte kapladığı alan"""
+        return self.boxes.nbytes + self.classes.nbytes
+
+    # Okuma
+
+    def get_arrays(self, img_path):
+        """
+        Bir resmin kutularını kopyasız görünüm olarak döndürür
+
+        Görünümler bir sonraki değişikliğe kadar geçerlidir.
+
+        Returns:
+            tuple: (boxes (N, 4) int32, classes (N,) int32)
+        """
+        row = self._rows.get(img_path)
+        if row is None:
+            return self.boxes[:0], self.classes[:0]
+        start = int(self._starts[row])
+        end = start + int(self._counts[row])
+        return self.boxes[start:end], self.classes[start:end]
+
+    # Yazma
+
+    def append(self, img_path, rectangle):
+        """Bir resme tek kutu ekler"""
+        row = self._rows.get(img_path)
+        if row is None:
+            return False
+        self._reserve(row, int(self._counts[row]) + 1)
+        position = int(self._starts[row] + self._counts[row])
+        self.boxes[position] = rectangle[:4]
+        self.classes[position] = rectangle[4] if len(rectangle) >= 5 else 0
+        self._counts[row] += 1
+        return True
+
+    def extend(self, img_path, rectangles):
+        """Bir resme toplu kutu ekler (ör. dedektör çıktısı)"""
+        row = self._rows.get(img_path)
+        if row is None:
+            return False
+        boxes, classes = as_columns(rectangles)
+        count = int(self._counts[row])
+        self._reserve(row, count + len(boxes))
+        position = int(self._starts[row]) + count
+        self.boxes[position : position + len(boxes)] = boxes
+        self.classes[position : position + len(boxes)] = classes
+        self._counts[row] += len(boxes)
+        return True
+
+    def set(self, img_path, rectangles):
+        """Bir resmin tüm kutularını değiştirir"""
+        row = self._rows.get(img_path)
+        if row is None:
+            return False
+        self._counts[row] = 0
+        return self.extend(img_path, rectangles)
+
+    def update(self, img_path, index, rectangle):
+        """Bir resmin index'inci kutusunu günceller"""
+        row = self._rows.get(img_path)
+        if row is None or not 0 <= index < self._counts[row]:
+            return False
+        position = int(self._starts[row]) + index
+        self.boxes[position] = rectangle[:4]
+        self.classes[position] = rectangle[4] if len(rectangle) >= 5 else 0
+        return True
+
+    def set_class(self, img_path, index, class_id):
+        """Bir resmin index'inci kutusunun sınıfını değiştirir"""
+        row = self._rows.get(img_path)
+        if row is None or not 0 <= index < self._counts[row]:
+            return False
+        self.classes[int(self._starts[row]) + index] = class_id
+        return True
+
+    def delete(self, img_path, index):
+        """Bir resmin index'inci kutusunu siler (sıra korunur)"""
+        row = self._rows.get(img_path)
+        if row is None or not 0 <= index < self._counts[row]:
+            return False
+        start = int(self._starts[row])
+        end = start + int(self._counts[row])
+        position = start + index
+        self.boxes[position : end - 1] = self.boxes[position + 1 : end]
+        self.classes[position : end - 1] = self.classes[position + 1 : end]
+        self._counts[row] -= 1
+        return True
+
+    def clear(self, img_path):
+        """Bir resmin tüm kutularını siler"""
+        row = self._rows.get(img_path)
+        if row is None:
+            return False
+        self._counts[row] = 0
+        return True
+
+    def bulk_load(self, image_rectangles):
+        """
+        Çok sayıda resmin kutularını tek birleştirmeyle ekler
+
+        Args:
+            image_rectangles (dict): img_path -> (boxes (N, 4), classes (N,))
+        """
+        items = [
+            (self._rows[path], boxes, classes)
+            for path, (boxes, classes) in image_rectangles.items()
+            if path in self._rows and len(boxes)
+        ]
+        if not items:
+            return
+
+        # Yüklenen resimlerin eski parçaları çöpe gider
+        rows = np.array([row for row, _, _ in items], np.int64)
+        self._garbage += int(self._capacities[rows].sum())
+
+        sizes = np.array([len(boxes) for _, boxes, _ in items], np.int64)
+        offsets = self._end + np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        total = int(sizes.sum())
+        self._ensure_capacity(self._end + total)
+
+        end = self._end + total
+        self.boxes[self._end : end] = np.concatenate([b for _, b, _ in items])
+        self.classes[self._end : end] = np.concatenate([c for _, _, c in items])
+        self._starts[rows] = offsets
+        self._counts[rows] = sizes
+        self._capacities[rows] = sizes
+        self._end = end
+
+        self._maybe_compact()
+
+    # Parça yönetimi
+
+    def _reserve(self, row, needed):
+        """Resmin parçasında en az needed kutuluk yer açar"""
+        if needed <= self._capacities[row]:
+            return
+
+        count = int(self._counts[row])
+        old_start = int(self._starts[row])
+        if old_start + int(self._capacities[row]) == self._end:
+            # Parça zaten en sonda; yerinde büyüt
+            self._ensure_capacity(old_start + needed)
+            self._end = old_start + needed
+            self._capacities[row] = needed
+            return
+
+        # Parçayı payıyla birlikte dizilerin sonuna taşı
+        new_capacity = max(4, needed, 2 * count)
+        self._ensure_capacity(self._end + new_capacity)
+        new_start = self._end
+        self.boxes[new_start : new_start + count] = self.boxes[old_start : old_start + count]
+        self.classes[new_start : new_start + count] = self.classes[
+            old_start : old_start + count
+        ]
+        self._garbage += int(self._capacities[row])
+        self._starts[row] = new_start
+        self._capacities[row] = new_capacity
+        self._end += new_capacity
+
+        self._maybe_compact()
+
+    def _ensure_capacity(self, size):
+        if size <= len(self.boxes):
+            return
+        new_size = max(size, 2 * len(self.boxes))
+        boxes = np.empty((new_size, 4), BOX_DTYPE)
+        classes = np.empty(new_size, BOX_DTYPE)
+        boxes[: self._end] = self.boxes[: self._end]
+        classes[: self._end] = self.classes[: self._end]
+        self.boxes = boxes
+        self.classes = classes
+
+    def _maybe_compact(self):
+        """Boşa çıkan alan kullanılanı geçtiyse dizileri sıkıştırır"""
+        if self._garbage < 4096 or self._garbage * 2 < self._end:
+            return
+        self.compact()
+
+    def compact(self):
+        """Parçaları boşluksuz şekilde yeniden yerleştirir"""
+        counts = self._counts
+        total = int(counts.sum())
+        new_starts = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int64)
+
+        # Tüm parçaları tek seferde topla
+        if total:
+            source = np.repeat(self._starts - new_starts, counts) + np.arange(total)
+            boxes = self.boxes[source]
+            classes = self.classes[source]
+        else:
+            boxes = np.empty((0, 4), BOX_DTYPE)
+            classes = np.empty(0, BOX_DTYPE)
+
+        capacity = max(1024, total + total // 4)
+        self.boxes = np.empty((capacity, 4), BOX_DTYPE)
+        self.classes = np.empty(capacity, BOX_DTYPE)
+        self.boxes[:total] = boxes
+        self.classes[:total] = classes
+        self._starts = new_starts
+        self._capacities = counts.copy()
+        self._end = total
+        self._garbage = 0
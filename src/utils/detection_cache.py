@@ -0,0 +1,176 @@
+import hashlib
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+# Ham tespitlerin saklandığı en düşük güven eşiği (arayüzdeki en küçük değer)
+FLOOR_CONFIDENCE = 0.05
+
+
+def file_hash(path, chunk_size=1024 * 1024):
+    """Dosya içeriğinin özeti (hex)"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def filter_raw(raw, conf):
+    """
+    Ham tespitleri güven eşiğine göre süzer
+
+    NMS'te bir kutuyu bastıran kutunun skoru her zaman daha yüksek
+    olduğundan, düşük eşikte NMS'ten geçmiş sonuçları süzmek modeli yüksek
+    eşikle çalıştırmakla aynı sonucu verir.
+
+    Returns:
+        tuple: (boxes (N, 4) xyxy, scores, classes)
+    """
+    keep = raw[:, 4] > conf
+    return raw[keep, :4], raw[keep, 4], raw[keep, 5].astype(np.int32)
+
+
+def pack_raw(output):
+    """Arka uç çıktısını (boxes, scores, classes) (N, 6) float32 diziye çevirir"""
+    boxes, scores, classes = output
+    raw = np.empty((len(scores), 6), dtype=np.float32)
+    raw[:, :4] = boxes
+    raw[:, 4] = scores
+    raw[:, 5] = classes
+    return raw
+
+
+class DetectionCache:
+    """
+    Modelin ham tespitlerini (düşük eşikte) diskte saklar
+
+    Kayıtlar resim içeriğinin özeti ve model anahtarıyla (model dosyasının
+    özeti + çıkarım ayarları) eşleştirilir; böylece taşınan ya da yeniden
+    adlandırılan resimler de önbellekten gelir, model değişince eski sonuçlar
+    kullanılmaz. Dosya özetleri de yol, değiştirilme zamanı ve boyutla
+    saklanır; değişmemiş dosyalar yeniden okunmaz. Güven eşiği
+    değiştiğinde model yeniden çalıştırılmaz, kayıtlar yeniden süzülür.
+    """
+
+    FILENAME = ".detection_cache.sqlite"
+
+    def __init__(self, commit_every=64):
+        self.path = ""
+        self.commit_every = commit_every
+        self._db = None
+        self._pending = 0
+        self._hashes = {}  # path -> (mtime_ns, size, hash), bellek içi
+        self._lock = threading.RLock()
+
+    def open(self, path):
+        """Önbellek veritabanını açar (yoksa oluşturur)"""
+        with self._lock:
+            if self._db is not None and path == self.path:
+                return
+            self.close()
+            self.path = path
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, hash TEXT)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS detections ("
+                "image_hash TEXT, model_key TEXT, data BLOB, "
+                "PRIMARY KEY (image_hash, model_key))"
+            )
+            self._db.commit()
+            self._hashes = {}
+
+    def is_open(self):
+        return self._db is not None
+
+    def close(self):
+        with self._lock:
+            if self._db is None:
+                return
+            self._db.commit()
+            self._db.close()
+            self._db = None
+            self._pending = 0
+
+    def flush(self):
+        """Bekleyen yazmaları kalıcı hale getirir"""
+        with self._lock:
+            if self._db is not None and self._pending:
+                self._db.commit()
+                self._pending = 0
+
+    def image_hash(self, path):
+        """Dosyanın içerik özeti; dosya değişmediyse yeniden okunmaz"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        with self._lock:
+            entry = self._hashes.get(path)
+            if entry is None and self._db is not None:
+                row = self._db.execute(
+                    "SELECT mtime_ns, size, hash FROM files WHERE path = ?", (path,)
+                ).fetchone()
+                entry = tuple(row) if row else None
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return entry[2]
+
+        digest = file_hash(path)
+        entry = (stat.st_mtime_ns, stat.st_size, digest)
+        with self._lock:
+            self._hashes[path] = entry
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)", (path, *entry)
+                )
+                self._count_write()
+        return digest
+
+    def get(self, image_path, model_key):
+        """Resmin ham tespitleri ((N, 6) float32), yoksa None"""
+        if self._db is None:
+            return None
+        image_hash = self.image_hash(image_path)
+        if image_hash is None:
+            return None
+        with self._lock:
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT data FROM detections WHERE image_hash = ? AND model_key = ?",
+                (image_hash, model_key),
+            ).fetchone()
+        if row is None:
+            return None
+        return np.frombuffer(row[0], dtype=np.float32).reshape(-1, 6)
+
+    def put(self, image_path, model_key, raw):
+        """Resmin ham tespitlerini saklar"""
+        if self._db is None:
+            return
+        image_hash = self.image_hash(image_path)
+        if image_hash is None:
+            return
+        data = np.ascontiguousarray(raw, dtype=np.float32).tobytes()
+        with self._lock:
+            if self._db is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO detections VALUES (?, ?, ?)",
+                (image_hash, model_key, data),
+            )
+            self._count_write()
+
+    def _count_write(self):
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self._db.commit()
+            self._pending = 0
@@ -0,0 +1,369 @@
+import queue
+import threading
+
+from src.utils.frame_ring import FrameRing
+
+# Kuyruklarda aşamanın bittiğini bildiren işaret
+_END = object()
+
+
+def _put(target_queue, item, stop_event):
+    """Kuyruk doluysa yer açılana ya da durdurulana kadar bekler"""
+    while not stop_event.is_set():
+        try:
+            target_queue.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def merge_cached(image_paths, lookup, produce, on_hit, threads=2, depth=16, stop_event=None):
+    """
+    Önbellek aramasını iş parçacıklarında tembel yapar ve sonuçları birleştirir
+
+    Arama iş parçacıkları her resmin özetini çıkarıp önbelleğe bakar;
+    bulunanlar on_hit(image_path, raw) ile hemen sonuç olur, bulunmayanlar
+    bulundukça produce(misses) yineleyicisine akar. produce ayrı bir iş
+    parçacığında çalışır; çıktıları ve önbellek sonuçları tek bir sınırlı
+    kuyrukta birleşir, böylece tüketici durunca üretim de durur.
+
+    Args:
+        lookup (callable): lookup(image_path) - ham tespitler ya da None
+        produce (callable): produce(misses) - önbellekte olmayan resimler
+            için sonuç üreten yineleyici döndürür
+        on_hit (callable): on_hit(image_path, raw) - önbellek sonucunu
+            produce'un ürettiği biçime çevirir
+    """
+    if stop_event is None:
+        stop_event = threading.Event()
+    path_queue = queue.Queue()
+    for image_path in image_paths:
+        path_queue.put(image_path)
+    miss_queue = queue.Queue()
+    out_queue = queue.Queue(maxsize=max(1, depth))
+    errors = []
+
+    def look():
+        try:
+            while not stop_event.is_set():
+                try:
+                    image_path = path_queue.get_nowait()
+                except queue.Empty:
+                    break
+                raw = lookup(image_path)
+                if raw is None:
+                    miss_queue.put(image_path)
+                else:
+                    _put(out_queue, on_hit(image_path, raw), stop_event)
+        finally:
+            miss_queue.put(_END)
+
+    lookers = [
+        threading.Thread(target=look, daemon=True) for _ in range(max(1, threads))
+    ]
+
+    def misses():
+        finished = 0
+        while finished < len(lookers) and not stop_event.is_set():
+            try:
+                image_path = miss_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if image_path is _END:
+                finished += 1
+                continue
+            yield image_path
+
+    def run_producer():
+        results = produce(misses())
+        try:
+            for item in results:
+                if not _put(out_queue, item, stop_event):
+                    break
+        except Exception as e:
+            errors.append(e)
+        finally:
+            results.close()
+            _put(out_queue, _END, stop_event)
+
+    producer = threading.Thread(target=run_producer, daemon=True)
+    for thread in lookers:
+        thread.start()
+    producer.start()
+
+    try:
+        # Üretici, tüm aramalar bitip son sonucu verince bitişi bildirir
+        while True:
+            try:
+                item = out_queue.get(timeout=0.1)
+            except queue.Empty:
+                if producer.is_alive() or not out_queue.empty():
+                    continue
+                break
+            if item is _END:
+                break
+            yield item
+        if errors:
+            raise errors[0]
+    finally:
+        stop_event.set()
+        producer.join()
+        for thread in lookers:
+            thread.join()
+
+
+class DetectionPipeline:
+    """
+    Klasör işleme için okuma → çıkarım → yazma aşamalarını birbirine bağlar
+
+    Okuyucu iş parçacıkları resimleri sınırlı bir ön yükleme kuyruğuna çözer,
+    çıkarım aşaması bu kuyruktan gruplar alıp modeli çalıştırır, yazıcı
+    iş parçacığı da sonuçları bittikçe etiket dosyalarına yazar. Böylece
+    model, JPEG çözme ve disk okuma sırasında boşta beklemez.
+    """
+
+    def __init__(
+        self,
+        model_handler,
+        reader_threads=2,
+        prefetch_depth=16,
+        write_depth=64,
+        writer=None,
+        decode_processes=0,
+        ring_slots=16,
+        letterbox_size=None,
+        lookup=None,
+    ):
+        """
+        Args:
+            model_handler (ModelHandler): Çıkarımı yapacak model işleyici
+            reader_threads (int): Resim çözen iş parçacığı sayısı
+            prefetch_depth (int): Çözülmüş resim kuyruğunun derinliği
+            write_depth (int): Yazılmayı bekleyen sonuç kuyruğunun derinliği
+            writer (callable): writer(image_path, detections, image_size) -
+                sonuçları kalıcı hale getirir; None ise yazma aşaması yoktur
+            decode_processes (int): 0'dan büyükse resimler bu kadar çözücü
+                işlemde çözülüp paylaşılan bellek halkasından okunur
+            ring_slots (int): Paylaşılan bellek halkasındaki yuva sayısı
+            letterbox_size (tuple): (H, W) verilirse çözücüler resimleri
+                letterbox'lar (yalnızca ONNX arka ucunda)
+            lookup (callable): lookup(image_path) - önbellekteki ham
+                tespitler ya da None; verilirse arama okuyucu iş
+                parçacıklarında yapılır ve sonucu olan resimler modelden
+                geçirilmez
+        """
+        self.model_handler = model_handler
+        self.reader_threads = max(1, int(reader_threads))
+        self.prefetch_depth = max(1, int(prefetch_depth))
+        self.write_depth = max(1, int(write_depth))
+        self.writer = writer
+        self.decode_processes = max(0, int(decode_processes))
+        self.ring_slots = max(2, int(ring_slots))
+        self.letterbox_size = letterbox_size
+        self.lookup = lookup
+
+    def run(self, image_paths, batch_size=None):
+        """
+        Resimleri işler ve her resim için (image_path, detections) üretir
+
+        Sonuçların sırası resimlerin çözülme sırasıdır. Okunamayan ya da
+        işlenemeyen resimler için detections None olur.
+        """
+        if batch_size is None:
+            batch_size = self.model_handler.batch_size
+        batch_size = max(1, int(batch_size))
+
+        stop_event = threading.Event()
+        decode_queue = queue.Queue(maxsize=self.prefetch_depth)
+        readers = []
+        if self.decode_processes and self.lookup is not None:
+            # Çözücü işlemlere yalnızca önbellekte olmayan resimler gider
+            results = merge_cached(
+                image_paths,
+                self.lookup,
+                lambda misses: self._ring_infer_stage(misses, batch_size, stop_event),
+                self._cached_result,
+                threads=self.reader_threads,
+                depth=self.prefetch_depth,
+                stop_event=stop_event,
+            )
+        elif self.decode_processes:
+            results = self._ring_infer_stage(image_paths, batch_size, stop_event)
+        else:
+            path_queue = queue.Queue()
+            for image_path in image_paths:
+                path_queue.put(image_path)
+
+            for _ in range(self.reader_threads):
+                thread = threading.Thread(
+                    target=self._read_stage,
+                    args=(path_queue, decode_queue, stop_event),
+                    daemon=True,
+                )
+                thread.start()
+                readers.append(thread)
+            results = self._infer_stage(decode_queue, batch_size, len(readers))
+
+        write_queue = None
+        writer_thread = None
+        if self.writer is not None:
+            write_queue = queue.Queue(maxsize=self.write_depth)
+            writer_thread = threading.Thread(
+                target=self._write_stage, args=(write_queue,), daemon=True
+            )
+            writer_thread.start()
+
+        try:
+            for image_path, detections, image_size in results:
+                if write_queue is not None and detections is not None:
+                    write_queue.put((image_path, detections, image_size))
+                yield image_path, detections
+        finally:
+            # Erken çıkışta okuyucuları durdur ve kuyruğu boşalt
+            stop_event.set()
+            results.close()
+            while any(thread.is_alive() for thread in readers):
+                try:
+                    decode_queue.get(timeout=0.05)
+                except queue.Empty:
+                    pass
+
+            # Bekleyen yazmaların bitmesini sağla
+            if writer_thread is not None:
+                write_queue.put(_END)
+                writer_thread.join()
+
+    def _read_stage(self, path_queue, decode_queue, stop_event):
+        """Resimleri diskten okuyup çözülmüş halde kuyruğa koyar"""
+        # cv2 yalnızca hat çalıştığında yüklenir (açılışı yavaşlatmasın)
+        import cv2
+
+        try:
+            while not stop_event.is_set():
+                try:
+                    image_path = path_queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                # Önbellekte sonucu olan resim çözülmez
+                raw = self.lookup(image_path) if self.lookup is not None else None
+                if raw is not None:
+                    _put(decode_queue, (image_path, None, raw), stop_event)
+                    continue
+
+                image = cv2.imread(image_path)
+                if image is None:
+                    print(f"Hata: Resim okunamadı - {image_path}")
+                _put(decode_queue, (image_path, image, None), stop_event)
+        finally:
+            _put(decode_queue, _END, stop_event)
+
+    def _cached_result(self, image_path, raw):
+        """Önbellekteki ham tespitleri geçerli eşikle süzülmüş sonuca çevirir"""
+        return image_path, self.model_handler.filter_detections(raw), None
+
+    def _infer_stage(self, decode_queue, batch_size, reader_count):
+        """Çözülmüş resimlerden gruplar oluşturup modeli çalıştırır"""
+        finished_readers = 0
+        while finished_readers < reader_count:
+            paths = []
+            images = []
+
+            # Grup dolana ya da tüm okuyucular bitene kadar bekle
+            while len(images) < batch_size and finished_readers < reader_count:
+                item = decode_queue.get()
+                if item is _END:
+                    finished_readers += 1
+                    continue
+
+                image_path, image, raw = item
+                if raw is not None:
+                    yield self._cached_result(image_path, raw)
+                    continue
+                if image is None:
+                    yield image_path, None, None
+                    continue
+                paths.append(image_path)
+                images.append(image)
+
+            if not images:
+                continue
+
+            batch_results = self.model_handler.predict_images(images, paths)
+            if batch_results is None:
+                for image_path in paths:
+                    yield image_path, None, None
+                continue
+
+            for image_path, image, detections in zip(paths, images, batch_results):
+                img_height, img_width = image.shape[:2]
+                yield image_path, detections, (img_width, img_height)
+
+    def _ring_infer_stage(self, image_paths, batch_size, stop_event):
+        """
+        Çözücü işlemlerin paylaşılan belleğe yazdığı resimlerden gruplar
+        oluşturup modeli çalıştırır
+
+        Yuvalar grup çıkarımdan geçince geri verilir; halka en az bir grup
+        ve her çözücü için bir yuva daha içerir, aksi halde çözücüler
+        boş yuva beklerken çıkarım da grubun dolmasını bekler.
+        """
+        ring = FrameRing(
+            processes=self.decode_processes,
+            slots=max(self.ring_slots, batch_size + self.decode_processes),
+            letterbox_size=self.letterbox_size,
+        )
+        frames = ring.run(image_paths, stop_event)
+        batch = []
+        try:
+            for image_path, frame, slot, meta in frames:
+                if frame is None:
+                    yield image_path, None, None
+                    continue
+                batch.append((image_path, frame, slot, meta))
+                if len(batch) >= batch_size:
+                    yield from self._infer_ring_batch(ring, batch)
+                    batch = []
+            if batch:
+                yield from self._infer_ring_batch(ring, batch)
+        finally:
+            batch = []
+            frames.close()
+
+    def _infer_ring_batch(self, ring, batch):
+        """Halkadaki bir grup için tek ileri geçiş yapar ve yuvaları bırakır"""
+        paths = [item[0] for item in batch]
+        sizes = []
+        for _, frame, _, meta in batch:
+            height, width = (meta[2] if meta else frame.shape)[:2]
+            sizes.append((width, height))
+
+        try:
+            batch_results = self.model_handler.predict_images(
+                [item[1] for item in batch],
+                paths,
+                [item[3] for item in batch] if self.letterbox_size else None,
+            )
+        finally:
+            for item in batch:
+                ring.release(item[2])
+
+        if batch_results is None:
+            for image_path in paths:
+                yield image_path, None, None
+            return
+        yield from zip(paths, batch_results, sizes)
+
+    def _write_stage(self, write_queue):
+        """Sonuçları bittikçe kalıcı hale getirir"""
+        while True:
+            item = write_queue.get()
+            if item is _END:
+                break
+
+            image_path, detections, image_size = item
+            try:
+                self.writer(image_path, detections, image_size)
+            except Exception as e:
+                print(f"Etiket dosyası yazılırken hata: {e} - {image_path}")
@@ -0,0 +1,140 @@
+import json
+import os
+import threading
+import time
+
+
+class EditJournal:
+    """
+    Annotation düzenlemelerinin yalnızca eklenen (append-only) günlüğü
+
+    Her işlem bir JSON satırı olarak yazılır ve küçük gruplar halinde fsync
+    edilir. Günlük, etiket dosyalarına sıkıştırıldıktan sonra döndürülür;
+    oturum temiz kapanırsa dosya silinir. Açılışta günlük dosyası hâlâ
+    duruyorsa önceki oturum beklenmedik şekilde kapanmış demektir.
+    """
+
+    FILENAME = ".edit_journal.jsonl"
+    COMPACTING_SUFFIX = ".compacting"
+
+    def __init__(self, group_size=16, group_interval=1.0):
+        """
+        Args:
+            group_size (int): fsync öncesi biriktirilecek en fazla işlem sayısı
+            group_interval (float): İki fsync arasındaki en uzun süre (sn)
+        """
+        self.group_size = group_size
+        self.group_interval = group_interval
+        self.path = ""
+        self._file = None
+        self._pending = 0
+        self._last_sync = 0.0
+        self._lock = threading.Lock()
+
+    def open(self, path):
+        """Günlüğü ekleme kipinde açar"""
+        self.close()
+        with self._lock:
+            self.path = path
+            self._file = open(path, "a", encoding="utf-8")
+            self._pending = 0
+            self._last_sync = time.monotonic()
+
+    def is_open(self):
+        return self._file is not None
+
+    def append(self, op):
+        """Bir düzenleme işlemini günlüğe ekler"""
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(json.dumps(op, separators=(",", ":")) + "\n")
+            self._pending += 1
+            if (
+                self._pending >= self.group_size
+                or time.monotonic() - self._last_sync >= self.group_interval
+            ):
+                self._sync_locked()
+
+    def sync(self):
+        """Bekleyen işlemleri diske yazar (fsync)"""
+        with self._lock:
+            self._sync_locked()
+
+    def _sync_locked(self):
+        if self._file is None or not self._pending:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def rotate(self):
+        """
+        Mevcut günlüğü sıkıştırma için kenara alır ve boş bir günlük açar
+
+        Returns:
+            str: Kenara alınan günlüğün yolu, günlük boşsa None
+        """
+        with self._lock:
+            if self._file is None:
+                return None
+            self._sync_locked()
+            if self._file.tell() == 0:
+                return None
+            self._file.close()
+
+            rotated_path = self.path + self.COMPACTING_SUFFIX
+            if os.path.exists(rotated_path):
+                # Önceki sıkıştırma tamamlanmamış; işlemleri sırayla birleştir
+                with open(rotated_path, "a", encoding="utf-8") as dst, open(
+                    self.path, "r", encoding="utf-8"
+                ) as src:
+                    dst.write(src.read())
+                    dst.flush()
+                    os.fsync(dst.fileno())
+                os.remove(self.path)
+            else:
+                os.replace(self.path, rotated_path)
+
+            self._file = open(self.path, "a", encoding="utf-8")
+            self._pending = 0
+            self._last_sync = time.monotonic()
+            return rotated_path
+
+    def discard(self, rotated_path):
+        """Etiket dosyalarına yazılmış eski günlüğü siler"""
+        if rotated_path and os.path.exists(rotated_path):
+            os.remove(rotated_path)
+
+    def close(self, remove=False):
+        """Günlüğü kapatır; remove True ise (temiz kapanış) dosyayı siler"""
+        with self._lock:
+            if self._file is None:
+                return
+            self._sync_locked()
+            self._file.close()
+            self._file = None
+            if remove and os.path.exists(self.path):
+                os.remove(self.path)
+
+    @classmethod
+    def pending_ops(cls, path):
+        """
+        Önceki oturumdan kalan işlemleri sırasıyla döndürür
+
+        Sıkıştırılmakta olan günlük önce, güncel günlük sonra okunur. Yarım
+        yazılmış son satır yok sayılır.
+        """
+        ops = []
+        for journal_path in (path + cls.COMPACTING_SUFFIX, path):
+            if not os.path.exists(journal_path):
+                continue
+            with open(journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        ops.append(json.loads(line))
+                    except ValueError:
+                        # Çökme sırasında yarım kalmış satır
+                        break
+        return ops
@@ -0,0 +1,247 @@
+import itertools
+import multiprocessing
+import queue
+import threading
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Görev kuyruğunda işçiye bitişi bildiren işaret
+_STOP = None
+# Varsayılan yuva boyutu: 1920x1080 BGR; daha büyük resimler kendi paylaşılan
+# bellek bloklarına yazılır
+DEFAULT_SLOT_BYTES = 1920 * 1080 * 3
+
+
+def frame_view(buffer, slot, slot_bytes, shape):
+    """Yuvadaki resmin kopyasız numpy görünümü (C sıralı)"""
+    return np.ndarray(shape, dtype=np.uint8, buffer=buffer, offset=slot * slot_bytes)
+
+
+def _decode_worker(
+    shm_name, slot_bytes, letterbox_size, task_queue, free_queue, ready_queue
+):
+    """
+    Çözücü işlem: resimleri çözüp boş bir yuvaya yazar
+
+    Boş yuva yoksa free_queue.get() bekler; böylece çıkarım geride
+    kaldığında çözücüler de yavaşlar (geri basınç). Yuvaya sığmayan resim
+    kendi paylaşılan bellek bloğuna yazılır, ama o da bir yuva tutar; yani
+    bekleyen resim sayısı her durumda yuva sayısıyla sınırlıdır.
+    """
+    import cv2
+
+    from src.utils.inference_backends import letterbox_image
+
+    cv2.setNumThreads(1)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        while True:
+            image_path = task_queue.get()
+            if image_path is _STOP:
+                break
+
+            image = cv2.imread(image_path)
+            if image is None:
+                ready_queue.put((image_path, None, None, None, None))
+                continue
+
+            meta = None
+            if letterbox_size:
+                original_shape = image.shape
+                image, ratio, pad = letterbox_image(image, letterbox_size)
+                meta = (ratio, pad, original_shape)
+
+            slot = free_queue.get()
+            if image.nbytes > slot_bytes:
+                block = shared_memory.SharedMemory(create=True, size=image.nbytes)
+                try:
+                    np.copyto(frame_view(block.buf, 0, 0, image.shape), image)
+                    ready_queue.put((image_path, slot, image.shape, meta, block.name))
+                finally:
+                    block.close()
+                continue
+
+            np.copyto(frame_view(shm.buf, slot, slot_bytes, image.shape), image)
+            ready_queue.put((image_path, slot, image.shape, meta, None))
+    finally:
+        shm.close()
+
+
+class FrameRing:
+    """
+    Çözücü işlemlerle çıkarım arasında paylaşılan bellekte resim halkası
+
+    Resimler ayrı işlemlerde çözülür (GIL'e takılmadan tüm çekirdeklerde) ve
+    sabit boyutlu yuvalara yazılır; kuyruklardan yalnızca yuva numarası ve
+    resim bilgileri geçer. Yuvadan büyük resimler (ör. 1080p üstü) ayrı bir
+    paylaşılan bellek bloğuna yazılır ve yuva bırakılınca silinir. Çıkarım tarafı yuvayı kopyalamadan numpy
+    görünümü olarak okur, işi bitince release() ile yuvayı geri verir.
+    İsteğe bağlı olarak resimler çözücüde letterbox'lanır.
+    """
+
+    def __init__(
+        self, processes=2, slots=16, slot_bytes=DEFAULT_SLOT_BYTES, letterbox_size=None
+    ):
+        """
+        Args:
+            processes (int): Çözücü işlem sayısı
+            slots (int): Halkadaki yuva sayısı (en fazla bu kadar resim bekler)
+            slot_bytes (int): Bir yuvanın bayt boyutu
+            letterbox_size (tuple): (H, W) verilirse resimler bu boyuta
+                letterbox'lanır ve yuva boyutu buna göre ayarlanır
+        """
+        self.processes = max(1, int(processes))
+        self.slots = max(2, int(slots))
+        self.letterbox_size = tuple(letterbox_size) if letterbox_size else None
+        if self.letterbox_size:
+            slot_bytes = self.letterbox_size[0] * self.letterbox_size[1] * 3
+        self.slot_bytes = int(slot_bytes)
+        self._shm = None
+        self._free_queue = None
+        self._blocks = {}  # slot -> yuvaya sığmayan resmin bellek bloğu
+
+    def run(self, image_paths, stop_event=None):
+        """
+        Resimleri çözer ve her resim için (image_path, frame, slot, meta) üretir
+
+        frame paylaşılan bellekteki resmin görünümüdür; release(slot)
+        çağrılana kadar geçerlidir ve yuva o zamana kadar yeniden
+        kullanılmaz. Okunamayan resimlerde frame None olur. meta,
+        letterbox kullanılıyorsa (ölçek, dolgu, orijinal şekil), yoksa None.
+        Sonuçların sırası çözülme sırasıdır.
+
+        image_paths bir liste ya da yolları sırayla üreten bir yineleyici
+        olabilir (ör. önbellekte bulunmayan resimler); yineleyiciden yollar
+        bir besleme iş parçacığıyla, geldikçe alınır.
+        """
+        paths = iter(image_paths)
+        first = next(paths, None)
+        if first is None:
+            return
+        if hasattr(image_paths, "__len__"):
+            process_count = min(self.processes, len(image_paths))
+        else:
+            process_count = self.processes
+
+        context = multiprocessing.get_context("spawn")
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=self.slots * self.slot_bytes
+        )
+        task_queue = context.Queue()
+        self._free_queue = context.Queue()
+        ready_queue = context.Queue()
+        for slot in range(self.slots):
+            self._free_queue.put(slot)
+
+        workers = []
+        for _ in range(process_count):
+            process = context.Process(
+                target=_decode_worker,
+                args=(
+                    self._shm.name,
+                    self.slot_bytes,
+                    self.letterbox_size,
+                    task_queue,
+                    self._free_queue,
+                    ready_queue,
+                ),
+                daemon=True,
+            )
+            process.start()
+            workers.append(process)
+
+        fed = [0]
+        fed_all = threading.Event()
+
+        def feed():
+            try:
+                for image_path in itertools.chain([first], paths):
+                    if stop_event is not None and stop_event.is_set():
+                        break
+                    task_queue.put(image_path)
+                    fed[0] += 1
+            finally:
+                for _ in workers:
+                    task_queue.put(_STOP)
+                fed_all.set()
+
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+
+        received = 0
+        try:
+            while not (fed_all.is_set() and received >= fed[0]):
+                if stop_event is not None and stop_event.is_set():
+                    break
+                try:
+                    image_path, slot, shape, meta, block_name = ready_queue.get(
+                        timeout=0.5
+                    )
+                except queue.Empty:
+                    if not any(process.is_alive() for process in workers):
+                        print("Çözücü işlemler beklenmedik şekilde sonlandı")
+                        break
+                    continue
+
+                received += 1
+                if slot is None:
+                    print(f"Hata: Resim okunamadı - {image_path}")
+                    yield image_path, None, None, None
+                elif block_name is not None:
+                    block = shared_memory.SharedMemory(name=block_name)
+                    self._blocks[slot] = block
+                    yield image_path, frame_view(block.buf, 0, 0, shape), slot, meta
+                else:
+                    frame = frame_view(self._shm.buf, slot, self.slot_bytes, shape)
+                    yield image_path, frame, slot, meta
+        finally:
+            for process in workers:
+                if process.is_alive():
+                    process.terminate()
+            for process in workers:
+                process.join(timeout=5)
+            feeder.join(timeout=5)
+            # Okunmamış sonuçların bellek blokları da silinir
+            while True:
+                try:
+                    block_name = ready_queue.get_nowait()[4]
+                except (queue.Empty, OSError, ValueError):
+                    break
+                if block_name is not None:
+                    _unlink_block(shared_memory.SharedMemory(name=block_name))
+            for worker_queue in (task_queue, self._free_queue, ready_queue):
+                worker_queue.cancel_join_thread()
+            self._release_memory()
+
+    def release(self, slot):
+        """Yuvayı (ve varsa resmin ayrı bellek bloğunu) çözücülere geri verir"""
+        if slot is None or slot < 0:
+            return
+        block = self._blocks.pop(slot, None)
+        if block is not None:
+            _unlink_block(block)
+        if self._free_queue is not None:
+            self._free_queue.put(slot)
+
+    def _release_memory(self):
+        for block in self._blocks.values():
+            _unlink_block(block)
+        self._blocks = {}
+        shm = self._shm
+        self._shm = None
+        self._free_queue = None
+        if shm is not None:
+            _unlink_block(shm)
+
+
+def _unlink_block(shm):
+    try:
+        shm.close()
+    except BufferError:
+        # Görünümler hâlâ tutuluyor; eşleme çöp toplamada kapanır
+        pass
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,175 @@
+"""
+Görünüm geometrisi: orijinal resim ile ekran koordinatları arasındaki
+dönüşümler
+
+Qt'ye bağlı değildir; arayüz bu hesapları QRect ile sarar.
+"""
+
+
+def display_to_original(x, y, width, height, image_info):
+    """
+    Ekrandaki bir dikdörtgeni orijinal resim koordinatlarına dönüştürür
+
+    Sonuç resim sınırlarına kırpılır.
+
+    Returns:
+        tuple: (x, y, w, h) orijinal piksel cinsinden tamsayılar
+    """
+    # Görünüm dönüşümünü (ölçek + kaydırma) tersine uygula
+    orig_x, orig_y = image_info.to_original(x, y)
+    orig_x = int(orig_x)
+    orig_y = int(orig_y)
+    orig_w = int(width * image_info.inverse_scale_x)
+    orig_h = int(height * image_info.inverse_scale_y)
+
+    # Sınırları kontrol et
+    orig_x = max(0, min(orig_x, image_info.orig_width - 1))
+    orig_y = max(0, min(orig_y, image_info.orig_height - 1))
+    orig_w = min(orig_w, image_info.orig_width - orig_x)
+    orig_h = min(orig_h, image_info.orig_height - orig_y)
+
+    return orig_x, orig_y, orig_w, orig_h
+
+
+def original_to_display(orig_x, orig_y, orig_w, orig_h, image_info):
+    """
+    Orijinal resim koordinatlarındaki dikdörtgeni ekran koordinatlarına
+    dönüştürür
+
+    Returns:
+        tuple: (x, y, w, h) ekran piksel cinsinden tamsayılar
+    """
+    # Görünüm dönüşümünü (ölçek + kaydırma) uygula
+    display_x = int(orig_x * image_info.scale_x) + round(image_info.offset_x)
+    display_y = int(orig_y * image_info.scale_y) + round(image_info.offset_y)
+    display_w = int(orig_w * image_info.scale_x)
+    display_h = int(orig_h * image_info.scale_y)
+
+    return display_x, display_y, display_w, display_h
+
+
+def annotations_to_display(annotations, image_info):
+    """
+    Annotationları gösterim koordinatlarına dönüştürür
+
+    Returns:
+        tuple: ((x, y, w, h) ekran dikdörtgenleri listesi, sınıf id listesi)
+    """
+    display_rects = []
+    class_ids = []
+
+    for annotation in annotations:
+        if len(annotation) == 5:  # x, y, w, h, class_id
+            orig_x, orig_y, orig_w, orig_h, class_id = annotation
+        else:  # Eski format, sınıfsız
+            orig_x, orig_y, orig_w, orig_h = annotation
+            class_id = 0  # Varsayılan sınıf
+
+        # Orijinal koordinatları görüntü koordinatlarına dönüştür
+        display_rects.append(
+            original_to_display(orig_x, orig_y, orig_w, orig_h, image_info)
+        )
+        class_ids.append(class_id)
+
+    return display_rects, class_ids
+
+
+class ImageInfo:
+    """
+    Görüntülenen resmin boyut ve pozisyon bilgilerini içerir
+
+    Görünüm dönüşümü: gösterim = orijinal * ölçek + offset. Sığdırılmış
+    görünümde (zoom = 1) ölçek scaled/orig oranıdır; yakınlaştırıldığında
+    scaled_width/scaled_height tüm resmin ekrandaki boyutunu, offset ise
+    resmin sol üst köşesinin (negatif olabilen) ekran konumunu gösterir.
+    """
+    
+    def __init__(self):
+        self.orig_width = 0    # Orijinal genişlik
+        self.orig_height = 0   # Orijinal yükseklik
+        self.scaled_width = 0  # Ölçeklenmiş genişlik
+        self.scaled_height = 0 # Ölçeklenmiş yükseklik
+        self.offset_x = 0      # X eksenindeki offset
+        self.offset_y = 0      # Y eksenindeki offset
+        self.zoom = 1.0        # Sığdırılmış görünüme göre yakınlaştırma
+        self.fit_scale_x = 1.0 # Sığdırılmış görünümün ölçeği
+        self.fit_scale_y = 1.0
+        self.fit_offset_x = 0  # Sığdırılmış görünümün offseti
+        self.fit_offset_y = 0
+    
+    def update(self, orig_width, orig_height, scaled_width, scaled_height, offset_x, offset_y):
+        """Tüm değerleri bir defada günceller (sığdırılmış görünüm)"""
+        self.orig_width = orig_width
+        self.orig_height = orig_height
+        self.scaled_width = scaled_width
+        self.scaled_height = scaled_height
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+        self.zoom = 1.0
+        self.fit_scale_x = scaled_width / orig_width if orig_width else 1.0
+        self.fit_scale_y = scaled_height / orig_height if orig_height else 1.0
+        self.fit_offset_x = offset_x
+        self.fit_offset_y = offset_y
+
+    @property
+    def scale_x(self):
+        """Orijinal pikselden ekran pikseline ölçek (x)"""
+        return self.scaled_width / self.orig_width if self.orig_width else 1.0
+
+    @property
+    def scale_y(self):
+        """Orijinal pikselden ekran pikseline ölçek (y)"""
+        return self.scaled_height / self.orig_height if self.orig_height else 1.0
+
+    @property
+    def inverse_scale_x(self):
+        """Ekran pikselinden orijinal piksele ölçek (x)"""
+        return self.orig_width / self.scaled_width if self.scaled_width else 1.0
+
+    @property
+    def inverse_scale_y(self):
+        """Ekran pikselinden orijinal piksele ölçek (y)"""
+        return self.orig_height / self.scaled_height if self.scaled_height else 1.0
+
+    def to_original(self, display_x, display_y):
+        """Ekran noktasını orijinal resim koordinatına çevirir"""
+        return (
+            (display_x - self.offset_x) * self.inverse_scale_x,
+            (display_y - self.offset_y) * self.inverse_scale_y,
+        )
+
+    def to_display(self, orig_x, orig_y):
+        """Orijinal resim koordinatını ekran noktasına çevirir"""
+        return (
+            orig_x * self.scale_x + self.offset_x,
+            orig_y * self.scale_y + self.offset_y,
+        )
+
+    def is_zoomed(self):
+        return self.zoom > 1.0
+
+    def set_view(self, zoom, offset_x, offset_y, view_width, view_height):
+        """
+        Yakınlaştırma ve kaydırmayı ayarlar
+
+        Resim görünümden büyükse kenarları görünüm dışına taşmayacak şekilde,
+        küçükse ortalanarak yerleştirilir.
+        """
+        self.zoom = max(1.0, zoom)
+        if self.zoom == 1.0:
+            self.scaled_width = round(self.orig_width * self.fit_scale_x)
+            self.scaled_height = round(self.orig_height * self.fit_scale_y)
+            self.offset_x = self.fit_offset_x
+            self.offset_y = self.fit_offset_y
+            return
+
+        self.scaled_width = self.orig_width * self.fit_scale_x * self.zoom
+        self.scaled_height = self.orig_height * self.fit_scale_y * self.zoom
+        self.offset_x = self._clamp_offset(offset_x, self.scaled_width, view_width)
+        self.offset_y = self._clamp_offset(offset_y, self.scaled_height, view_height)
+
+    @staticmethod
+    def _clamp_offset(offset, scaled, view):
+        if scaled <= view:
+            return (view - scaled) / 2
+        return min(0, max(view - scaled, offset))
@@ -0,0 +1,606 @@
+import hashlib
+import io
+import math
+import os
+import struct
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+
+from PIL import Image
+
+from src.utils.image_size import open_unbounded
+
+# Bir karonun kendi seviyesindeki kenar uzunluğu (piksel)
+TILE_SIZE = 512
+# Karoların saklandığı klasör (resim başına bir alt klasör; geçici dizinde
+# olduğundan işletim sistemi temizler)
+CACHE_ROOT = os.path.join(tempfile.gettempdir(), "auto_img_labeler_tiles")
+
+
+def tile_box(level, tx, ty, orig_width, orig_height):
+    """Bir karonun orijinal resimde kapladığı bölge (x1, y1, x2, y2)"""
+    span = TILE_SIZE << level
+    x = tx * span
+    y = ty * span
+    return x, y, min(x + span, orig_width), min(y + span, orig_height)
+
+
+def max_level(orig_width, orig_height):
+    """Tek karonun tüm resmi kapladığı en kaba seviye"""
+    return max(0, int(math.ceil(math.log2(max(orig_width, orig_height, 1) / TILE_SIZE))))
+
+
+def level_size(level, orig_width, orig_height):
+    """Seviyenin piksel boyutu (her seviye bir öncekinin yarısı, yukarı yuvarlanır)"""
+    scale = 1 << level
+    return -(-orig_width // scale), -(-orig_height // scale)
+
+
+# Şerit/karo çözmeyi etkileyen, tek parçalık TIFF'e kopyalanan etiketler
+_TIFF_DECODE_TAGS = (258, 259, 262, 266, 277, 284, 317, 320, 338, 339, 347, 529, 530, 532)
+_TIFF_STRIP_OFFSETS, _TIFF_STRIP_COUNTS, _TIFF_ROWS_PER_STRIP = 273, 279, 278
+_TIFF_TILE_WIDTH, _TIFF_TILE_LENGTH = 322, 323
+_TIFF_TILE_OFFSETS, _TIFF_TILE_COUNTS = 324, 325
+_TIFF_SHORT, _TIFF_LONG, _TIFF_RATIONAL = 3, 4, 5
+
+
+def _as_tuple(value):
+    return value if isinstance(value, tuple) else (value,)
+
+
+def _pack_tiff_value(byteorder, tagtype, value):
+    """Etiket değerini TIFF baytlarına çevirir; (adet, bayt) döndürür"""
+    if isinstance(value, bytes):
+        return len(value), value
+    values = _as_tuple(value)
+    if tagtype == _TIFF_RATIONAL:
+        data = b"".join(
+            struct.pack(byteorder + "LL", int(v.numerator), int(v.denominator))
+            for v in values
+        )
+    elif tagtype == _TIFF_SHORT:
+        data = struct.pack(byteorder + "H" * len(values), *values)
+    elif tagtype == _TIFF_LONG:
+        data = struct.pack(byteorder + "L" * len(values), *values)
+    else:
+        data = bytes(values)
+    return len(values), data
+
+
+def _mini_tiff(prefix, tags, chunks, offsets_tag):
+    """
+    Verilen şerit/karo verilerinden tek sayfalık küçük bir TIFF dosyası yazar
+
+    tags: {etiket: (tip, değer)}; offsets_tag verilerin konumlarını tutan
+    etikettir ve burada doldurulur. Düzen: başlık, veriler, ek değerler, IFD.
+    """
+    byteorder = "<" if prefix == b"II" else ">"
+    parts = [b""]  # Başlık en sonda, IFD'nin konumu belli olunca yazılır
+    position = 8
+    offsets = []
+    for chunk in chunks:
+        offsets.append(position)
+        parts.append(chunk)
+        position += len(chunk)
+    tags = dict(tags)
+    tags[offsets_tag] = (_TIFF_LONG, tuple(offsets))
+
+    entries = []
+    for tag, (tagtype, value) in sorted(tags.items()):
+        count, data = _pack_tiff_value(byteorder, tagtype, value)
+        if len(data) <= 4:
+            entries.append(struct.pack(byteorder + "HHL", tag, tagtype, count) + data.ljust(4, b"\0"))
+            continue
+        if position % 2:
+            parts.append(b"\0")
+            position += 1
+        entries.append(struct.pack(byteorder + "HHLL", tag, tagtype, count, position))
+        parts.append(data)
+        position += len(data)
+    if position % 2:
+        parts.append(b"\0")
+        position += 1
+
+    parts[0] = prefix + struct.pack(byteorder + "HL", 42, position)
+    parts.append(struct.pack(byteorder + "H", len(entries)))
+    parts.extend(entries)
+    parts.append(struct.pack(byteorder + "L", 0))
+    return b"".join(parts)
+
+
+class _TiffReader:
+    """
+    TIFF'in bölgelerini yalnızca kesişen şeritleri/karoları çözerek okur
+
+    Kesişen parçalar, orijinal çözme etiketleriyle küçük bir TIFF dosyasına
+    kopyalanıp PIL ile açılır; böylece her sıkıştırma türü desteklenir ve
+    bellek kullanımı okunan bölgeyle sınırlı kalır. Sıkıştırmasız şeritlerde
+    yalnızca gereken satırlar okunur. Tek parçalık TIFF normal Image.open ile
+    açıldığından PIL'in piksel sınırı parça boyutuna uygulanır (tüm resmi
+    tek şerit olarak saklayan sıkıştırılmış dosyalar sınırı aşabilir).
+    """
+
+    random_access = True
+
+    def __init__(self, path, image):
+        tags = image.tag_v2
+        if tags.get(284, 1) != 1:  # PlanarConfiguration
+            raise ValueError("ayrı düzlemli TIFF")
+        self.path = path
+        self.width, self.height = image.size
+        self.prefix = tags.prefix
+        self.tags = {
+            tag: (tags.tagtype[tag], tags[tag]) for tag in _TIFF_DECODE_TAGS if tag in tags
+        }
+        self.tiled = _TIFF_TILE_OFFSETS in tags
+        if self.tiled:
+            self.segment_width = tags[_TIFF_TILE_WIDTH]
+            self.segment_height = tags[_TIFF_TILE_LENGTH]
+            offsets = _as_tuple(tags[_TIFF_TILE_OFFSETS])
+            counts = _as_tuple(tags[_TIFF_TILE_COUNTS])
+        else:
+            self.segment_width = self.width
+            self.segment_height = min(tags.get(_TIFF_ROWS_PER_STRIP, self.height), self.height)
+            offsets = _as_tuple(tags[_TIFF_STRIP_OFFSETS])
+            counts = _as_tuple(tags[_TIFF_STRIP_COUNTS])
+
+        columns = -(-self.width // self.segment_width)
+        rows = -(-self.height // self.segment_height)
+        if len(offsets) < columns * rows or len(counts) < len(offsets):
+            raise ValueError("TIFF parça tablosu eksik")
+        self.segments = [
+            (offsets[index], counts[index]) for index in range(columns * rows)
+        ]
+        self.columns = columns
+
+        # Sıkıştırmasız şeritlerde satırlar doğrudan adreslenebilir
+        self.row_bytes = None
+        if not self.tiled and tags.get(259, 1) == 1:
+            bits = sum(_as_tuple(tags.get(258, 1)))
+            self.row_bytes = -(-self.width * bits // 8)
+
+    def band_bounds(self, top, bottom):
+        """Okunacak satır aralığını parça sınırlarına genişletir"""
+        if self.row_bytes is not None:
+            return top, bottom
+        step = self.segment_height
+        return top // step * step, min(-(-bottom // step) * step, self.height)
+
+    def read(self, box):
+        """Bölgeyi (x1, y1, x2, y2) PIL resmi olarak okur"""
+        x1, y1, x2, y2 = box
+        first_row = y1 // self.segment_height
+        last_row = (y2 - 1) // self.segment_height
+        first_col = x1 // self.segment_width
+        last_col = (x2 - 1) // self.segment_width
+        top = first_row * self.segment_height
+
+        chunks = []
+        with open(self.path, "rb") as f:
+            for row in range(first_row, last_row + 1):
+                for col in range(first_col, last_col + 1):
+                    offset, count = self.segments[row * self.columns + col]
+                    if self.row_bytes is not None:
+                        # Şeridin yalnızca bölgeye düşen satırları
+                        strip_top = row * self.segment_height
+                        start = max(strip_top, y1)
+                        end = min(strip_top + self.segment_height, y2)
+                        offset += (start - strip_top) * self.row_bytes
+                        count = (end - start) * self.row_bytes
+                    f.seek(offset)
+                    chunks.append(f.read(count))
+
+        tags = dict(self.tags)
+        width = (last_col - first_col + 1) * self.segment_width
+        if self.row_bytes is not None:
+            # Okunan satırlar tek bir şerit olarak birleştirilir
+            top, height = y1, y2 - y1
+            chunks = [b"".join(chunks)]
+            tags[_TIFF_ROWS_PER_STRIP] = (_TIFF_LONG, height)
+            counts_tag, offsets_tag = _TIFF_STRIP_COUNTS, _TIFF_STRIP_OFFSETS
+        elif self.tiled:
+            height = (last_row - first_row + 1) * self.segment_height
+            tags[_TIFF_TILE_WIDTH] = (_TIFF_LONG, self.segment_width)
+            tags[_TIFF_TILE_LENGTH] = (_TIFF_LONG, self.segment_height)
+            counts_tag, offsets_tag = _TIFF_TILE_COUNTS, _TIFF_TILE_OFFSETS
+        else:
+            height = min((last_row + 1) * self.segment_height, self.height) - top
+            tags[_TIFF_ROWS_PER_STRIP] = (_TIFF_LONG, self.segment_height)
+            counts_tag, offsets_tag = _TIFF_STRIP_COUNTS, _TIFF_STRIP_OFFSETS
+        tags[256] = (_TIFF_LONG, width)
+        tags[257] = (_TIFF_LONG, height)
+        tags[counts_tag] = (_TIFF_LONG, tuple(len(chunk) for chunk in chunks))
+
+        data = _mini_tiff(self.prefix, tags, chunks, offsets_tag)
+        left = first_col * self.segment_width
+        with Image.open(io.BytesIO(data)) as part:
+            part.load()
+            return _normalize_mode(
+                part.crop((x1 - left, y1 - top, x2 - left, y2 - top))
+            )
+
+
+class _BmpReader:
+    """Sıkıştırmasız BMP'nin bölgelerini yalnızca gereken satırları okuyarak çözer"""
+
+    random_access = True
+    RAW_MODES = {1: "P;1", 4: "P;4", 8: "P", 24: "BGR", 32: "BGRX"}
+
+    def __init__(self, path, image):
+        self.path = path
+        self.width, self.height = image.size
+        with open(path, "rb") as f:
+            header = f.read(54)
+            (self.data_offset,) = struct.unpack_from("<L", header, 10)
+            header_size, _, height, _, bits, compression = struct.unpack_from(
+                "<LllHHL", header, 14
+            )
+            if header_size < 40 or compression != 0 or bits not in self.RAW_MODES:
+                raise ValueError("desteklenmeyen BMP")
+            (colors,) = struct.unpack_from("<L", header, 46)
+            self.palette = None
+            if bits <= 8:
+                f.seek(14 + header_size)
+                entries = f.read(4 * (colors or 1 << bits))
+                self.palette = [
+                    entries[i + channel]
+                    for i in range(0, len(entries) - 3, 4)
+                    for channel in (2, 1, 0)
+                ]
+        self.rawmode = self.RAW_MODES[bits]
+        self.mode = "P" if bits <= 8 else "RGB"
+        self.stride = (self.width * bits + 31) // 32 * 4
+        self.top_down = height < 0
+
+    def band_bounds(self, top, bottom):
+        return top, bottom
+
+    def read(self, box):
+        x1, y1, x2, y2 = box
+        # Alttan yukarı saklanan resimlerde satırlar dosyada ters sıradadır
+        first = y1 if self.top_down else self.height - y2
+        with open(self.path, "rb") as f:
+            f.seek(self.data_offset + first * self.stride)
+            data = f.read((y2 - y1) * self.stride)
+        band = Image.frombytes(
+            self.mode,
+            (self.width, y2 - y1),
+            data,
+            "raw",
+            self.rawmode,
+            self.stride,
+            1 if self.top_down else -1,
+        )
+        if self.palette is not None:
+            band.putpalette(self.palette)
+        return _normalize_mode(band.crop((x1, 0, x2, y2 - y1)))
+
+
+# (renk tipi, bit derinliği) -> (mod, ham mod)
+_PNG_MODES = {
+    (0, 1): ("1", "1"),
+    (0, 2): ("L", "L;2"),
+    (0, 4): ("L", "L;4"),
+    (0, 8): ("L", "L"),
+    (0, 16): ("I;16", "I;16B"),
+    (2, 8): ("RGB", "RGB"),
+    (3, 1): ("P", "P;1"),
+    (3, 2): ("P", "P;2"),
+    (3, 4): ("P", "P;4"),
+    (3, 8): ("P", "P"),
+    (4, 8): ("LA", "LA"),
+    (4, 16): ("LA", "LA;16B"),
+    (6, 8): ("RGBA", "RGBA"),
+}
+_PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+# Filtreleri çözerken satır baytlarını aynen koruyan modlar (piksel başına bayt)
+_PNG_IDENTITY_MODES = {1: "L", 2: "LA", 3: "RGB", 4: "RGBA"}
+
+
+class _PngReader:
+    """
+    Taramalı (interlaced) olmayan PNG'yi satır bantları halinde sırayla çözer
+
+    IDAT verisi zlib ile parça parça açılır; her bandın filtreleri PIL'in
+    PNG (zip) çözücüsüyle, bir önceki bandın son satırı başa eklenerek
+    çözülür. Bellekte aynı anda yalnızca bir bant bulunur.
+    """
+
+    random_access = False
+
+    def __init__(self, path, image):
+        self.path = path
+        self.width, self.height = image.size
+        with open(path, "rb") as f:
+            f.seek(16)
+            _, _, depth, color, _, _, interlace = struct.unpack(">LLBBBBB", f.read(13))
+        bits = depth * _PNG_CHANNELS.get(color, 0)
+        self.row_bytes = -(-self.width * bits // 8)
+        self.bytes_per_pixel = max(1, bits // 8)
+        if (
+            interlace
+            or (color, depth) not in _PNG_MODES
+            or self.bytes_per_pixel not in _PNG_IDENTITY_MODES
+        ):
+            raise ValueError("desteklenmeyen PNG")
+        self.mode, self.rawmode = _PNG_MODES[(color, depth)]
+        self.identity = _PNG_IDENTITY_MODES[self.bytes_per_pixel]
+        self.palette = image.getpalette() if self.mode == "P" else None
+        self.transparency = image.info.get("transparency")
+
+    def _idat(self):
+        """IDAT parçalarının sıkıştırılmış verisini sırayla üretir"""
+        with open(self.path, "rb") as f:
+            f.seek(8)
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    return
+                length, kind = struct.unpack(">L4s", header)
+                if kind == b"IEND":
+                    return
+                if kind != b"IDAT":
+                    f.seek(length + 4, os.SEEK_CUR)
+                    continue
+                while length:
+                    piece = f.read(min(length, 1 << 20))
+                    if not piece:
+                        return
+                    length -= len(piece)
+                    yield piece
+                f.seek(4, os.SEEK_CUR)  # CRC
+
+    def bands(self, rows):
+        """(üst satır, bant) çiftlerini yukarıdan aşağıya üretir"""
+        stride = self.row_bytes + 1  # Her satırın başında filtre baytı
+        previous = bytes(stride)  # İlk satırın öncesi sıfır kabul edilir
+        inflater = zlib.decompressobj()
+        compressed = self._idat()
+        for top in range(0, self.height, rows):
+            count = min(rows, self.height - top)
+            filtered = bytearray()
+            while len(filtered) < count * stride:
+                data = inflater.unconsumed_tail or next(compressed, None)
+                if data is None:
+                    raise ValueError("PNG verisi eksik")
+                filtered += inflater.decompress(data, count * stride - len(filtered))
+
+            # Önceki satır filtresiz (0) olarak eklenip bantla birlikte çözülür
+            decoded = Image.frombytes(
+                self.identity,
+                (self.row_bytes // self.bytes_per_pixel, count + 1),
+                zlib.compress(previous + bytes(filtered), 0),
+                "zip",
+                self.identity,
+            ).tobytes()
+            previous = b"\0" + decoded[-self.row_bytes :]
+            band = Image.frombytes(
+                self.mode,
+                (self.width, count),
+                decoded[self.row_bytes :],
+                "raw",
+                self.rawmode,
+            )
+            if self.palette is not None:
+                band.putpalette(self.palette)
+            if self.transparency is not None:
+                band.info["transparency"] = self.transparency
+            yield top, _normalize_mode(band)
+
+
+def _band_reader(path, image):
+    """Resmi bant bant okuyabilen okuyucu; biçim desteklenmiyorsa None"""
+    readers = {"TIFF": _TiffReader, "PNG": _PngReader, "BMP": _BmpReader}
+    reader = readers.get(image.format)
+    if reader is None:
+        return None
+    try:
+        return reader(path, image)
+    except (ValueError, KeyError, struct.error) as e:
+        print(f"Resim bant bant okunamıyor, tamamı çözülecek: {path}, {e}")
+        return None
+
+
+class ImagePyramid:
+    """
+    Bölge okuması desteklenmeyen resimler için çok çözünürlüklü karo piramidi
+
+    Karolar istendikçe üretilir ve diskte saklanır; aynı resim yeniden
+    açıldığında çözülmez. Seviye 0 karoları resim bant bant okunarak üretilir:
+    TIFF ve BMP'de yalnızca istenen karo satırı, PNG'de resim bir kez
+    yukarıdan aşağıya akıtılarak. Daha kaba seviyelerin karoları bir alt
+    seviyenin dört karosundan küçültülür; böylece bellek kullanımı resim
+    boyutuna değil bant ve karo boyutuna bağlıdır.
+
+    Bant bant okunabilen resimlerde PIL'in piksel sınırı kaldırılır. Bant
+    okuyucusu olmayan biçimler (taramalı ya da 16 bit renkli PNG, sıkıştırılmış
+    BMP) bir kez tamamen çözülür; bunlarda sınır korunur.
+    """
+
+    def __init__(self, path, cache_root=CACHE_ROOT):
+        self.path = path
+        with open_unbounded(path) as image:
+            self.width, self.height = image.size
+            self.reader = _band_reader(path, image)
+        self.max_level = max_level(self.width, self.height)
+
+        stat = os.stat(path)
+        key = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}"
+        self.cache_dir = os.path.join(
+            cache_root, hashlib.sha1(key.encode("utf-8")).hexdigest()
+        )
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._lock = threading.RLock()
+
+    def tile(self, level, tx, ty):
+        """Karoyu (PIL resmi) döndürür; yoksa üretip diske yazar"""
+        level = min(level, self.max_level)
+        cached = self._read_cached(level, tx, ty)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            # Başka bir iş parçacığı bu arada üretmiş olabilir
+            cached = self._read_cached(level, tx, ty)
+            if cached is not None:
+                return cached
+            if self.reader is None:
+                self._build_from_full()
+                return self._read_cached(level, tx, ty)
+            if level == 0:
+                if self.reader.random_access:
+                    self._build_row(ty)
+                else:
+                    self._build_rows()
+                return self._read_cached(level, tx, ty)
+            tile = self._reduce_children(level, tx, ty)
+            self._write_cached(level, tx, ty, tile)
+            return tile
+
+    def level_image(self, level):
+        """Bir seviyenin tamamını karolarından birleştirir (ön izleme için)"""
+        level = min(max(0, level), self.max_level)
+        width, height = level_size(level, self.width, self.height)
+        span = TILE_SIZE << level
+        canvas = None
+        for ty in range(-(-self.height // span)):
+            for tx in range(-(-self.width // span)):
+                tile = self.tile(level, tx, ty)
+                if canvas is None:
+                    canvas = Image.new(tile.mode, (width, height))
+                canvas.paste(tile, (tx * TILE_SIZE, ty * TILE_SIZE))
+        return canvas
+
+    def level_for_size(self, width, height):
+        """Verilen alandan küçük olmayan en kaba seviye"""
+        scale = min(self.width / max(1, width), self.height / max(1, height))
+        if scale <= 1:
+            return 0
+        return min(int(math.floor(math.log2(scale))), self.max_level)
+
+    def _tile_path(self, level, tx, ty):
+        return os.path.join(self.cache_dir, f"{level}_{tx}_{ty}.png")
+
+    def _read_cached(self, level, tx, ty):
+        path = self._tile_path(level, tx, ty)
+        if not os.path.exists(path):
+            return None
+        try:
+            with Image.open(path) as image:
+                image.load()
+                return image
+        except OSError:
+            return None
+
+    def _write_cached(self, level, tx, ty, tile):
+        # Yarım yazılmış karo kalmaması için önce geçici dosyaya yazılır
+        path = self._tile_path(level, tx, ty)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        tile.save(temp_path, format="PNG", compress_level=1)
+        os.replace(temp_path, path)
+
+    def _write_band(self, top, band):
+        """Bandın tamamen kapsadığı seviye 0 karo satırlarını diske yazar"""
+        bottom = top + band.height
+        for ty in range(-(-top // TILE_SIZE), -(-bottom // TILE_SIZE)):
+            row_top = ty * TILE_SIZE
+            row_bottom = min(row_top + TILE_SIZE, self.height)
+            if row_bottom > bottom:
+                break
+            for tx in range(-(-self.width // TILE_SIZE)):
+                left = tx * TILE_SIZE
+                tile = band.crop(
+                    (
+                        left,
+                        row_top - top,
+                        min(left + TILE_SIZE, self.width),
+                        row_bottom - top,
+                    )
+                )
+                self._write_cached(0, tx, ty, tile)
+
+    def _build_row(self, ty):
+        """Seviye 0'ın bir karo satırını okur ve diske yazar"""
+        top = ty * TILE_SIZE
+        # Okuma birimi (şerit) karo satırından büyükse kapsanan tüm satırlar yazılır
+        top, bottom = self.reader.band_bounds(top, min(top + TILE_SIZE, self.height))
+        self._write_band(top, self.reader.read((0, top, self.width, bottom)))
+
+    def _build_rows(self):
+        """Sırayla okunabilen resmi bir kez akıtıp seviye 0'ı diske yazar"""
+        print(f"Karo piramidi oluşturuluyor: {self.path}")
+        for top, band in self.reader.bands(TILE_SIZE):
+            self._write_band(top, band)
+
+    def _reduce_children(self, level, tx, ty):
+        """Bir alt seviyenin dört karosunu birleştirip yarıya küçültür"""
+        x1, y1, x2, y2 = tile_box(level, tx, ty, self.width, self.height)
+        child_span = TILE_SIZE << (level - 1)
+        canvas = None
+        for dy in range(2):
+            for dx in range(2):
+                cx, cy = 2 * tx + dx, 2 * ty + dy
+                if cx * child_span >= self.width or cy * child_span >= self.height:
+                    continue
+                child = self.tile(level - 1, cx, cy)
+                if canvas is None:
+                    canvas = Image.new(
+                        child.mode,
+                        (-(-(x2 - x1) // (1 << (level - 1))), -(-(y2 - y1) // (1 << (level - 1)))),
+                    )
+                canvas.paste(child, (dx * TILE_SIZE, dy * TILE_SIZE))
+        return canvas.reduce(2)
+
+    def _build_from_full(self):
+        """Resmi bir kez çözer ve tüm seviyelerin karolarını diske yazar"""
+        print(f"Karo piramidi oluşturuluyor: {self.path}")
+        # Tüm resim belleğe alındığı için PIL'in piksel sınırı burada korunur
+        with Image.open(self.path) as source:
+            image = _normalize_mode(source)
+            image.load()
+        for level in range(self.max_level + 1):
+            if level:
+                image = image.reduce(2)
+            for ty in range(-(-image.height // TILE_SIZE)):
+                for tx in range(-(-image.width // TILE_SIZE)):
+                    left, top = tx * TILE_SIZE, ty * TILE_SIZE
+                    tile = image.crop(
+                        (
+                            left,
+                            top,
+                            min(left + TILE_SIZE, image.width),
+                            min(top + TILE_SIZE, image.height),
+                        )
+                    )
+                    self._write_cached(level, tx, ty, tile)
+
+
+def _normalize_mode(image):
+    """Karoları RGB ya da RGBA'ya çevirir (ekranda gösterilebilir biçim)"""
+    if image.mode in ("RGB", "RGBA"):
+        return image
+    has_alpha = "A" in image.getbands() or "transparency" in image.info
+    return image.convert("RGBA" if has_alpha else "RGB")
+
+
+_pyramids = OrderedDict()
+_pyramids_lock = threading.Lock()
+
+
+def get_pyramid(path, keep=4):
+    """Resmin piramidi (son açılan birkaç resminki bellekte tutulur)"""
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    with _pyramids_lock:
+        pyramid = _pyramids.get(key)
+        if pyramid is not None:
+            _pyramids.move_to_end(key)
+            return pyramid
+    pyramid = ImagePyramid(path)
+    with _pyramids_lock:
+        _pyramids[key] = pyramid
+        while len(_pyramids) > keep:
+            _pyramids.popitem(last=False)
+    return pyramid
@@ -0,0 +1,122 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+from PIL import Image
+
+_pixel_limit_lock = threading.Lock()
+
+
+@contextmanager
+def open_unbounded(img_path):
+    """
+    Resmi PIL'in piksel sınırı (DecompressionBombError) uygulanmadan açar
+
+    Sınır, Image.open sırasında yalnızca boyut kontrolü olarak uygulanır;
+    burada açılan resimlerin ya yalnızca başlığı okunur ya da bölge bölge
+    çözülür, bu yüzden çok büyük resimler de açılabilmelidir. Sınır yalnızca
+    açılış süresince kaldırılır.
+    """
+    with _pixel_limit_lock:
+        limit = Image.MAX_IMAGE_PIXELS
+        Image.MAX_IMAGE_PIXELS = None
+        try:
+            image = Image.open(img_path)
+        finally:
+            Image.MAX_IMAGE_PIXELS = limit
+    with image:
+        yield image
+
+
+class ImageSizeCache:
+    """
+    Resim boyutlarını piksel çözmeden, dosya başlığından okur
+
+    Sonuçlar bellekte tutulur ve klasör başına bir JSON dosyasında saklanır.
+    Kayıtlar yol, değiştirilme zamanı ve dosya boyutuyla eşleştirilir; dosya
+    değiştiyse boyut yeniden okunur.
+    """
+
+    CACHE_FILENAME = ".image_sizes.json"
+
+    def __init__(self, cache_file=""):
+        self.cache_file = cache_file
+        self._entries = {}  # path -> (mtime_ns, file_size, width, height)
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        if cache_file:
+            self.load(cache_file)
+
+    def load(self, cache_file):
+        """Önbellek dosyasını yükler (dosya yoksa boş önbellekle başlar)"""
+        with self._lock:
+            self.cache_file = cache_file
+            self._entries = {}
+            self._dirty = False
+            if not os.path.exists(cache_file):
+                return
+            try:
+                with open(cache_file, "r") as f:
+                    data = json.load(f)
+                self._entries = {path: tuple(entry) for path, entry in data.items()}
+            except Exception as e:
+                print(f"Boyut önbelleği yüklenirken hata: {e}")
+
+    def save(self):
+        """Değişiklik varsa önbelleği diske yazar"""
+        with self._lock:
+            if not self._dirty or not self.cache_file:
+                return
+            data = {path: list(entry) for path, entry in self._entries.items()}
+            self._dirty = False
+
+        tmp_path = f"{self.cache_file}.tmp"
+        with self._save_lock:
+            try:
+                with open(tmp_path, "w") as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.cache_file)
+            except Exception as e:
+                print(f"Boyut önbelleği kaydedilirken hata: {e}")
+
+    def get_size(self, img_path):
+        """
+        Resmin (genişlik, yükseklik) değerini döndürür
+
+        Resim okunamazsa (0, 0) döner ve sonuç önbelleğe alınmaz.
+        """
+        try:
+            stat = os.stat(img_path)
+        except OSError:
+            return 0, 0
+
+        with self._lock:
+            entry = self._entries.get(img_path)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return entry[2], entry[3]
+
+        width, height = self.read_header_size(img_path)
+        if width and height:
+            with self._lock:
+                self._entries[img_path] = (
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                    width,
+                    height,
+                )
+                self._dirty = True
+        return width, height
+
+    @staticmethod
+    def read_header_size(img_path):
+        """Boyutu dosya başlığından okur; pikseller çözülmez"""
+        try:
+            # Image.open yalnızca başlığı okur, pikseller load() ile çözülür;
+            # piksel sınırı da bu yüzden kaldırılır
+            with open_unbounded(img_path) as image:
+                return image.size
+        except Exception as e:
+            print(f"Resim boyutu okunamadı: {img_path}, {e}")
+            return 0, 0
@@ -0,0 +1,393 @@
+import ast
+import os
+import time
+
+import numpy as np
+
+# Ultralytics ile aynı varsayılanlar
+DEFAULT_IMGSZ = 640
+DEFAULT_IOU = 0.7
+MAX_DETECTIONS = 300
+MAX_NMS_CANDIDATES = 30000
+# Sınıfa göre NMS için kutuların sınıf başına kaydırıldığı mesafe
+_CLASS_OFFSET = 7680
+
+
+class InferenceBackend:
+    """
+    Çıkarım arka uçlarının ortak arayüzü
+
+    predict() her resim için (boxes, scores, classes) üçlüsü döndürür:
+    boxes (N, 4) float32 [x1, y1, x2, y2] orijinal resim koordinatlarında,
+    scores (N,) float32, classes (N,) int32.
+    """
+
+    name = ""
+
+    def __init__(self):
+        self.names = {}  # class_id -> sınıf adı
+
+    def predict(self, images, conf):
+        """Çözülmüş (BGR) resimler için tespitleri döndürür"""
+        raise NotImplementedError
+
+    def warm_up(self, size=DEFAULT_IMGSZ):
+        """Arka ucu boş bir resimle bir kez çalıştırır"""
+        self.predict([np.zeros((size, size, 3), dtype=np.uint8)], 0.25)
+
+
+class UltralyticsBackend(InferenceBackend):
+    """Ultralytics/PyTorch modelini doğrudan çalıştırır"""
+
+    name = "pytorch"
+
+    def __init__(self, model, device=None):
+        super().__init__()
+        self.model = model
+        self.device = device
+        self.names = dict(model.names)
+
+    def predict(self, images, conf):
+        kwargs = {"conf": conf, "verbose": False}
+        if self.device:
+            kwargs["device"] = self.device
+        results = self.model(images, **kwargs)
+        outputs = []
+        for result in results:
+            boxes = result.boxes
+            outputs.append(
+                (
+                    boxes.xyxy.cpu().numpy().astype(np.float32),
+                    boxes.conf.cpu().numpy().astype(np.float32),
+                    boxes.cls.cpu().numpy().astype(np.int32),
+                )
+            )
+        return outputs
+
+
+class OnnxBackend(InferenceBackend):
+    """
+    Dışa aktarılmış YOLOv8 ONNX modelini ONNX Runtime ile CPU'da çalıştırır
+
+    Ön işleme (letterbox) ve son işleme (eşik + sınıfa göre NMS) Ultralytics
+    ile aynı kurallarla numpy'da yapılır.
+    """
+
+    name = "onnx"
+
+    def __init__(self, onnx_path, names=None, iou=DEFAULT_IOU, threads=0):
+        """
+        Args:
+            onnx_path (str): .onnx model dosyası
+            names (dict): Sınıf adları; verilmezse model meta verisinden okunur
+            iou (float): NMS IoU eşiği
+            threads (int): ONNX Runtime iş parçacığı sayısı (0: otomatik)
+        """
+        super().__init__()
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(
+            onnx_path, options, providers=["CPUExecutionProvider"]
+        )
+        self.onnx_path = onnx_path
+        self.iou = iou
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        # Sabit boyutlu dışa aktarımda giriş boyutu modelden okunur
+        height, width = model_input.shape[2], model_input.shape[3]
+        self.imgsz = (
+            (height, width)
+            if isinstance(height, int) and isinstance(width, int)
+            else (DEFAULT_IMGSZ, DEFAULT_IMGSZ)
+        )
+        # Grup boyutu sabitse (1) resimler tek tek çalıştırılır
+        self.dynamic_batch = not isinstance(model_input.shape[0], int)
+
+        if names is None:
+            metadata = self.session.get_modelmeta().custom_metadata_map
+            names = ast.literal_eval(metadata["names"]) if "names" in metadata else {}
+        self.names = dict(names)
+
+    def predict(self, images, conf):
+        if not images:
+            return []
+        frames = []
+        metas = []
+        for image in images:
+            frame, ratio, pad = letterbox_image(image, self.imgsz)
+            frames.append(frame)
+            metas.append((ratio, pad, image.shape))
+        return self.predict_letterboxed(frames, metas, conf)
+
+    def predict_letterboxed(self, frames, metas, conf):
+        """
+        Önceden letterbox'lanmış (BGR uint8, imgsz boyutunda) resimler için
+        tespitleri döndürür
+
+        Args:
+            metas (list): Her resim için (ölçek, (sol, üst) dolgu, orijinal şekil)
+        """
+        if not frames:
+            return []
+        batch = [to_tensor(frame) for frame in frames]
+
+        if self.dynamic_batch:
+            predictions = self.session.run(None, {self.input_name: np.stack(batch)})[0]
+        else:
+            predictions = np.concatenate(
+                [
+                    self.session.run(None, {self.input_name: tensor[None]})[0]
+                    for tensor in batch
+                ]
+            )
+
+        outputs = []
+        for prediction, (ratio, pad, shape) in zip(predictions, metas):
+            boxes, scores, classes = postprocess(prediction, conf, self.iou)
+            outputs.append((scale_boxes(boxes, ratio, pad, shape), scores, classes))
+        return outputs
+
+
+def letterbox_image(image, imgsz=(DEFAULT_IMGSZ, DEFAULT_IMGSZ), color=114):
+    """
+    Resmi en-boy oranını koruyarak ölçekler ve kenarlarını doldurur
+
+    Returns:
+        tuple: (BGR uint8 resim (H, W, 3), ölçek, (sol, üst) dolgu)
+    """
+    import cv2
+
+    height, width = image.shape[:2]
+    ratio = min(imgsz[0] / height, imgsz[1] / width)
+    new_width, new_height = round(width * ratio), round(height * ratio)
+    pad_w = (imgsz[1] - new_width) / 2
+    pad_h = (imgsz[0] - new_height) / 2
+
+    if (width, height) != (new_width, new_height):
+        image = cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
+    top, bottom = round(pad_h - 0.1), round(pad_h + 0.1)
+    left, right = round(pad_w - 0.1), round(pad_w + 0.1)
+    image = cv2.copyMakeBorder(
+        image, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(color,) * 3
+    )
+    return image, ratio, (left, top)
+
+
+def to_tensor(image):
+    """BGR HWC uint8 resmi RGB CHW float32 (0-1) tensöre çevirir"""
+    tensor = image[:, :, ::-1].transpose(2, 0, 1).astype(np.float32) / 255.0
+    return np.ascontiguousarray(tensor)
+
+
+def letterbox(image, imgsz=(DEFAULT_IMGSZ, DEFAULT_IMGSZ), color=114):
+    """
+    Resmi letterbox'lar ve model girişine çevirir
+
+    Returns:
+        tuple: (tensor (3, H, W) float32 RGB 0-1, ölçek, (sol, üst) dolgu)
+    """
+    image, ratio, pad = letterbox_image(image, imgsz, color)
+    return to_tensor(image), ratio, pad
+
+
+def postprocess(prediction, conf, iou=DEFAULT_IOU):
+    """
+    Tek resmin ham YOLOv8 çıktısını (4 + nc, A) tespitlere çevirir
+
+    Returns:
+        tuple: (boxes (N, 4) xyxy letterbox koordinatlarında, scores, classes)
+    """
+    prediction = prediction.T  # (A, 4 + nc)
+    class_scores = prediction[:, 4:]
+    classes = class_scores.argmax(axis=1)
+    scores = class_scores[np.arange(len(classes)), classes]
+
+    keep = scores > conf
+    boxes, scores, classes = prediction[keep, :4], scores[keep], classes[keep]
+    if len(scores) > MAX_NMS_CANDIDATES:
+        top = scores.argsort()[::-1][:MAX_NMS_CANDIDATES]
+        boxes, scores, classes = boxes[top], scores[top], classes[top]
+
+    # Merkez-genişlik-yükseklik -> köşe koordinatları
+    xyxy = np.empty_like(boxes)
+    xyxy[:, :2] = boxes[:, :2] - boxes[:, 2:] / 2
+    xyxy[:, 2:] = boxes[:, :2] + boxes[:, 2:] / 2
+
+    # Farklı sınıfların kutuları birbirini bastırmasın
+    keep = nms(xyxy + classes[:, None] * _CLASS_OFFSET, scores, iou)[:MAX_DETECTIONS]
+    return (
+        xyxy[keep].astype(np.float32),
+        scores[keep].astype(np.float32),
+        classes[keep].astype(np.int32),
+    )
+
+
+def nms(boxes, scores, iou_threshold):
+    """Klasik açgözlü NMS; tutulan kutuların indekslerini skora göre sıralı döndürür"""
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = (x2 - x1) * (y2 - y1)
+    order = scores.argsort()[::-1]
+
+    keep = []
+    while order.size:
+        best = order[0]
+        keep.append(best)
+        rest = order[1:]
+        inter_w = np.maximum(0.0, np.minimum(x2[best], x2[rest]) - np.maximum(x1[best], x1[rest]))
+        inter_h = np.maximum(0.0, np.minimum(y2[best], y2[rest]) - np.maximum(y1[best], y1[rest]))
+        inter = inter_w * inter_h
+        overlap = inter / (areas[best] + areas[rest] - inter + 1e-9)
+        order = rest[overlap <= iou_threshold]
+    return np.array(keep, dtype=np.int64)
+
+
+def scale_boxes(boxes, ratio, pad, image_shape):
+    """Letterbox koordinatlarındaki kutuları orijinal resme geri çevirir"""
+    boxes = boxes.copy()
+    boxes[:, [0, 2]] = (boxes[:, [0, 2]] - pad[0]) / ratio
+    boxes[:, [1, 3]] = (boxes[:, [1, 3]] - pad[1]) / ratio
+    boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, image_shape[1])
+    boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, image_shape[0])
+    return boxes
+
+
+def onnx_path_for(model_path):
+    """Bir .pt modelinin dışa aktarılmış ONNX dosyasının yolu"""
+    return os.path.splitext(model_path)[0] + ".onnx"
+
+
+def export_onnx(model_path, imgsz=DEFAULT_IMGSZ, force=False):
+    """
+    Bir .pt modelini (çevrimdışı, bir kez) ONNX'e dışa aktarır
+
+    Dışa aktarılmış dosya modelden yeniyse yeniden kullanılır.
+
+    Returns:
+        str: .onnx dosyasının yolu
+    """
+    onnx_path = onnx_path_for(model_path)
+    if (
+        not force
+        and os.path.exists(onnx_path)
+        and os.path.getmtime(onnx_path) >= os.path.getmtime(model_path)
+    ):
+        return onnx_path
+
+    from ultralytics import YOLO
+
+    print(f"Model ONNX'e aktarılıyor: {model_path}")
+    exported = YOLO(model_path).export(format="onnx", imgsz=imgsz, dynamic=True)
+    if exported and os.path.abspath(exported) != os.path.abspath(onnx_path):
+        os.replace(exported, onnx_path)
+    return onnx_path
+
+
+def compare_outputs(reference, candidate, iou_threshold=0.9):
+    """
+    İki arka ucun tek resim için çıktılarını karşılaştırır
+
+    Aynı sınıftaki kutular IoU'ya göre eşleştirilir.
+
+    Returns:
+        dict: matched, missing (yalnızca referansta), extra (yalnızca adayda),
+        max_offset (eşleşen kutu köşeleri arasındaki en büyük fark, piksel)
+    """
+    ref_boxes, _, ref_classes = reference
+    cand_boxes, _, cand_classes = candidate
+    used = np.zeros(len(cand_boxes), dtype=bool)
+    matched = 0
+    max_offset = 0.0
+    for box, class_id in zip(ref_boxes, ref_classes):
+        candidates = np.flatnonzero((cand_classes == class_id) & ~used)
+        if not len(candidates):
+            continue
+        ious = box_iou(box, cand_boxes[candidates])
+        best = ious.argmax()
+        if ious[best] >= iou_threshold:
+            used[candidates[best]] = True
+            matched += 1
+            max_offset = max(
+                max_offset, float(np.abs(cand_boxes[candidates[best]] - box).max())
+            )
+    return {
+        "matched": matched,
+        "missing": len(ref_boxes) - matched,
+        "extra": int((~used).sum()),
+        "max_offset": max_offset,
+    }
+
+
+def box_iou(box, boxes):
+    """Bir kutunun bir kutu dizisiyle IoU değerleri"""
+    inter_w = np.maximum(0.0, np.minimum(box[2], boxes[:, 2]) - np.maximum(box[0], boxes[:, 0]))
+    inter_h = np.maximum(0.0, np.minimum(box[3], boxes[:, 3]) - np.maximum(box[1], boxes[:, 1]))
+    inter = inter_w * inter_h
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    return inter / (area + areas - inter + 1e-9)
+
+
+def benchmark(backends, images, conf=0.25, batch_size=8, repeats=3):
+    """
+    Arka uçların aynı resimlerdeki çıkarım hızını ve çıktı uyumunu ölçer
+
+    İlk arka uç referans alınır; diğerlerinin çıktıları onunla karşılaştırılır.
+
+    Args:
+        backends (list): InferenceBackend nesneleri
+        images (list): Çözülmüş (BGR) resimler
+
+    Returns:
+        list: Her arka uç için dict (name, seconds, images_per_second,
+        matched, missing, extra, max_offset)
+    """
+    report = []
+    reference = None
+    for backend in backends:
+        backend.warm_up()
+        best = None
+        outputs = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            outputs = []
+            for start in range(0, len(images), batch_size):
+                outputs.extend(backend.predict(images[start : start + batch_size], conf))
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+
+        row = {
+            "name": backend.name,
+            "seconds": best,
+            "images_per_second": len(images) / best if best else 0.0,
+            "matched": 0,
+            "missing": 0,
+            "extra": 0,
+            "max_offset": 0.0,
+        }
+        if reference is None:
+            reference = outputs
+            row["matched"] = sum(len(output[0]) for output in outputs)
+        else:
+            for ref, cand in zip(reference, outputs):
+                diff = compare_outputs(ref, cand)
+                for key in ("matched", "missing", "extra"):
+                    row[key] += diff[key]
+                row["max_offset"] = max(row["max_offset"], diff["max_offset"])
+        report.append(row)
+    return report
+
+
+def format_benchmark(report):
+    """benchmark() sonucunu yan yana okunabilir bir tabloya çevirir"""
+    lines = [f"{'Arka uç':<10} {'resim/sn':>9} {'eşleşen':>8} {'eksik':>6} {'fazla':>6} {'sapma(px)':>10}"]
+    for row in report:
+        lines.append(
+            f"{row['name']:<10} {row['images_per_second']:>9.1f} {row['matched']:>8} "
+            f"{row['missing']:>6} {row['extra']:>6} {row['max_offset']:>10.2f}"
+        )
+    return "\n".join(lines)
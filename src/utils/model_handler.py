@@ -1,7 +1,66 @@
 import os
-from ultralytics import YOLO
-import torch
-import cv2
+import threading
+
+import numpy as np
+
+from src.utils.annotation_store import xyxy_to_rectangles
+from src.utils.detection_cache import (
+    FLOOR_CONFIDENCE,
+    DetectionCache,
+    file_hash,
+    filter_raw,
+    pack_raw,
+)
+from src.utils.detection_pipeline import DetectionPipeline, merge_cached
+from src.utils.inference_backends import (
+    DEFAULT_IMGSZ,
+    DEFAULT_IOU,
+    OnnxBackend,
+    UltralyticsBackend,
+    benchmark,
+    export_onnx,
+    format_benchmark,
+)
+from src.utils.model_registry import ModelRegistry
+from src.utils.parallel_labeling import ParallelLabeler
+from src.utils.quantization import (
+    accuracy_report,
+    format_accuracy_report,
+    int8_path_for,
+    quantize_int8,
+    sample_images,
+)
+from src.utils.run_checkpoint import RunCheckpoint
+from src.utils.startup_timer import startup_timer
+
+# Klasör taramasında dikkate alınan resim uzantıları
+IMAGE_EXTENSIONS = [".jpg", ".jpeg", ".png", ".bmp", ".tiff"]
+
+# torch, cv2 ve ultralytics açılışı yavaşlattığı için ilk kullanımda yüklenir
+_ml_modules = {}
+_ml_lock = threading.Lock()
+
+
+def load_ml_stack():
+    """
+    Makine öğrenmesi kütüphanelerini (bir kez) içe aktarır
+
+    Returns:
+        dict: "cv2", "torch" ve "YOLO" anahtarlarıyla modüller
+    """
+    with _ml_lock:
+        if not _ml_modules:
+            modules = {
+                "cv2": startup_timer.timed_import("cv2"),
+                "torch": startup_timer.timed_import("torch"),
+            }
+            modules["YOLO"] = startup_timer.timed_import("ultralytics").YOLO
+            _ml_modules.update(modules)
+    return _ml_modules
+
+
+def is_ml_stack_loaded():
+    return bool(_ml_modules)
 
 
 class ModelHandler:
@@ -12,118 +71,680 @@ class ModelHandler:
         self.model = None
         self.model_path = ""
         self.confidence_threshold = 0.5  # Varsayılan eşik değeri
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.batch_size = 8  # Toplu işlemde tek ileri geçişteki resim sayısı
+        self.reader_threads = 2  # Resim çözen iş parçacığı sayısı
+        self.prefetch_depth = 16  # Çözülmüş resim kuyruğunun derinliği
+        self.write_queue_depth = 64  # Yazılmayı bekleyen sonuç kuyruğu derinliği
+        # 0'dan büyükse resimler ayrı işlemlerde çözülür ve paylaşılan bellek
+        # halkasından kopyasız okunur (iş parçacıklı okuyucuların yerine)
+        self.decode_processes = 0
+        self.ring_slots = 16  # Paylaşılan bellek halkasındaki yuva sayısı
+        # Toplu işlemde işçi işlem sayısı; 1'den büyükse her işlem modelin
+        # kendi kopyasını yükler (CPU'da tüm çekirdekleri kullanmak için)
+        self.processes = 1
+        self.threads_per_process = 0  # İşlem başına iş parçacığı (0: otomatik)
+        self.chunk_size = 4  # İşçilerin kuyruktan bir seferde aldığı resim sayısı
+        self._device = None
+        self._import_thread = None
+        # Yüklenmiş modeller; aralarında geçiş diskten yeniden yüklemez
+        self.registry = ModelRegistry()
+        # Çıkarım arka ucu: "pytorch" (ultralytics), "onnx" ya da "onnx_int8"
+        # (ONNX Runtime, CPU; INT8 modeli quantize_model ile oluşturulur)
+        self.backend_name = "pytorch"
+        self.backend = None
+        # Ham tespit önbelleği; eşik değişince model yeniden çalıştırılmaz
+        self.detection_cache = DetectionCache()
+        self._model_hashes = {}  # model_path -> (mtime_ns, hash)
+        # Toplu çalışmanın diskteki ilerlemesi; yarım kalan çalışma sürdürülebilir
+        self.checkpoint = RunCheckpoint()
+
+    @property
+    def device(self):
+        """Çıkarım cihazı ("cuda" ya da "cpu"); ilk erişimde torch yüklenir"""
+        if self._device is None:
+            torch = load_ml_stack()["torch"]
+            self._device = "cuda" if torch.cuda.is_available() else "cpu"
+        return self._device
+
+    def start_background_import(self):
+        """
+        Makine öğrenmesi kütüphanelerini arka planda yükler
+
+        Pencere gösterildikten sonra çağrılır; böylece ilk model yüklemesi
+        içe aktarmaları beklemez.
+        """
+        if is_ml_stack_loaded() or self._import_thread is not None:
+            return
+
+        def run():
+            try:
+                load_ml_stack()
+                startup_timer.report("Arka planda yüklenen kütüphaneler")
+            except Exception as e:
+                print(f"Model kütüphaneleri yüklenemedi: {e}")
+
+        self._import_thread = threading.Thread(
+            target=run, name="ml-import", daemon=True
+        )
+        self._import_thread.start()
 
     def load_model(self, model_path):
-        """Bir YOLOv8 modelini yükler"""
+        """
+        Bir YOLOv8 modelini yükler ve etkin model yapar
+
+        Model daha önce yüklenmişse bellekten alınır; yeni modeller yüklenir
+        ve ısınma geçişinden geçirilir.
+        """
         try:
+            if model_path.lower().endswith(".onnx"):
+                # Dışa aktarılmış model; torch/ultralytics gerekmez
+                model, cached = self.registry.load(model_path, OnnxBackend)
+                backend = model
+            else:
+                # Model yükleniyor (kütüphaneler henüz yüklenmediyse önce onlar)
+                YOLO = load_ml_stack()["YOLO"]
+                model, cached = self.registry.load(model_path, YOLO)
+                backend = self.create_backend(model_path, model)
+            self.model = model
+            self.backend = backend
             self.model_path = model_path
-
-            # Model yükleniyor
-            self.model = YOLO(model_path)
+            self.registry.pin(model_path)
 
             # Sınıf bilgilerini al
-            class_names = self.model.names
+            class_names = backend.names
 
             # Modelin sınıf isimlerini annotation manager'a aktar
-            self.annotation_manager.class_names = [
-                class_names[i] for i in range(len(class_names))
-            ]
+            self.annotation_manager.set_class_names(
+                [class_names[i] for i in range(len(class_names))]
+            )
 
             print(f"Model başarıyla yüklendi: {model_path}")
             print(f"Sınıflar: {self.annotation_manager.class_names}")
 
+            if cached:
+                return True, "Model bellekten etkinleştirildi"
             return True, "Model başarıyla yüklendi"
         except Exception as e:
             print(f"Model yüklenirken hata: {e}")
             return False, f"Model yüklenirken hata: {e}"
 
-    def detect_objects(self, image_path):
-        """Bir resimde nesneleri tespit eder ve annotation olarak kaydeder"""
-        if not self.model:
-            return False, "Model yüklenmedi"
+    def create_backend(self, model_path, model):
+        """Seçili arka uç için bir .pt modelinin çıkarım nesnesini oluşturur"""
+        if self.backend_name in ("onnx", "onnx_int8"):
+            # Dışa aktarma bir kez yapılır, sonra dosyadan yüklenir
+            onnx_path = export_onnx(model_path)
+            if self.backend_name == "onnx_int8":
+                onnx_path = int8_path_for(onnx_path)
+                if not os.path.exists(onnx_path):
+                    raise FileNotFoundError(
+                        "INT8 model bulunamadı, önce modeli nicemleyin (Quantize INT8)"
+                    )
+            # Arka uç, modelin kaydının altında tutulur (ayrı LRU kaydı değil)
+            backend, _ = self.registry.load_variant(
+                model_path, onnx_path, lambda path: OnnxBackend(path, names=model.names)
+            )
+            return backend
+        return UltralyticsBackend(model)
+
+    def set_backend(self, backend_name):
+        """
+        Çıkarım arka ucunu değiştirir; yüklü model varsa yeni arka uca taşınır
 
+        Returns:
+            tuple: (success, message)
+        """
+        previous = self.backend_name
+        self.backend_name = backend_name
+        if self.model is None or isinstance(self.model, OnnxBackend):
+            return True, f"Arka uç: {backend_name}"
         try:
-            # Resmi oku
-            image = cv2.imread(image_path)
-            if image is None:
-                return False, f"Resim okunamadı: {image_path}"
+            self.backend = self.create_backend(self.model_path, self.model)
+            return True, f"Arka uç: {backend_name}"
+        except Exception as e:
+            self.backend_name = previous
+            print(f"Arka uç değiştirilemedi: {e}")
+            return False, f"Arka uç değiştirilemedi: {e}"
+
+    def benchmark_backends(self, image_paths, limit=16, batch_size=None):
+        """
+        Yüklü .pt modelini PyTorch ve ONNX Runtime arka uçlarında yan yana ölçer
+
+        Returns:
+            tuple: (success, rapor metni)
+        """
+        if self.model is None or isinstance(self.model, OnnxBackend):
+            return False, "Karşılaştırma için bir .pt modeli yükleyin"
+
+        cv2 = load_ml_stack()["cv2"]
+        images = [cv2.imread(path) for path in image_paths[:limit]]
+        images = [image for image in images if image is not None]
+        if not images:
+            return False, "Ölçüm için resim bulunamadı"
+
+        try:
+            backends = [UltralyticsBackend(self.model, device="cpu")]
+            onnx_path = export_onnx(self.model_path)
+            backends.append(OnnxBackend(onnx_path, names=self.model.names))
+            report = benchmark(
+                backends,
+                images,
+                conf=self.confidence_threshold,
+                batch_size=batch_size or self.batch_size,
+            )
+        except Exception as e:
+            print(f"Arka uç karşılaştırması sırasında hata: {e}")
+            return False, f"Arka uç karşılaştırması sırasında hata: {e}"
 
-            # YOLOv8 nesne tespiti yap
-            results = self.model(image, conf=self.confidence_threshold)
+        text = format_benchmark(report)
+        print(text)
+        return True, text
 
-            # Sonuçları al
-            boxes = results[0].boxes.xyxy.cpu().numpy()  # x1, y1, x2, y2 formatında
-            classes = results[0].boxes.cls.cpu().numpy()  # Sınıf indeksleri
+    def quantize_model(self, image_paths, sample_size=64):
+        """
+        Yüklü modelin INT8 sürümünü açık klasördeki resimlerle kalibre ederek
+        oluşturur ve FP32 modelle karşılaştırır
 
-            # Resim boyutları
-            img_height, img_width = image.shape[:2]
+        Returns:
+            tuple: (success, doğruluk ve hız raporu)
+        """
+        if self.model is None:
+            return False, "Model yüklenmedi"
+        if not image_paths:
+            return False, "Kalibrasyon için resim bulunamadı"
 
-            # Önce mevcut annotationları temizle
-            self.annotation_manager.clear_rectangles(image_path)
+        try:
+            if isinstance(self.model, OnnxBackend):
+                fp32_path = self.model.onnx_path
+                if fp32_path.endswith(".int8.onnx"):
+                    return False, "Model zaten INT8"
+            else:
+                fp32_path = export_onnx(self.model_path)
 
-            # Her tespit edilen nesne için dikdörtgen ekle
-            for i, box in enumerate(boxes):
-                x1, y1, x2, y2 = box
+            fp32_backend = OnnxBackend(fp32_path, names=self.backend.names)
+            # Doğruluk, kalibrasyonda kullanılmayan resimlerle ölçülür
+            calibration_paths = sample_images(image_paths, sample_size)
+            int8_path = quantize_int8(
+                fp32_path, calibration_paths, sample_size, imgsz=fp32_backend.imgsz
+            )
+            int8_backend = OnnxBackend(int8_path, names=self.backend.names)
+            fp32_backend.warm_up()
+            int8_backend.warm_up()
+            report = accuracy_report(
+                fp32_backend,
+                int8_backend,
+                image_paths,
+                self.annotation_manager,
+                self.confidence_threshold,
+                sample_size,
+                exclude=calibration_paths,
+            )
+        except Exception as e:
+            print(f"INT8 nicemleme sırasında hata: {e}")
+            return False, f"INT8 nicemleme sırasında hata: {e}"
 
-                # Koordinatları integer'a çevir
-                x = int(x1)
-                y = int(y1)
-                w = int(x2 - x1)
-                h = int(y2 - y1)
+        text = format_accuracy_report(report)
+        print(text)
+        return True, text
 
-                # Sınıf indeksi
-                class_id = int(classes[i])
+    def detect_objects(self, image_path):
+        """Bir resimde nesneleri tespit eder ve annotation olarak kaydeder"""
+        if not self.model:
+            return False, "Model yüklenmedi"
 
-                # Dikdörtgeni ekle
-                self.annotation_manager.add_rectangle(image_path, x, y, w, h, class_id)
+        try:
+            # Önbellekte varsa resim hiç çözülmez; etiket yazarken gereken
+            # boyut başlıktan (ImageSizeCache) okunur
+            raw = self.cached_raw(image_path)
+            if raw is None:
+                # Resmi oku ve YOLOv8 nesne tespiti yap
+                image = load_ml_stack()["cv2"].imread(image_path)
+                if image is None:
+                    return False, f"Resim okunamadı: {image_path}"
+                raw = self.predict_raw([image], [image_path])[0]
+                self.detection_cache.flush()
+
+            num_objects = self.apply_detections(image_path, self.filter_detections(raw))
 
-            return True, f"{len(boxes)} nesne tespit edildi"
+            return True, f"{num_objects} nesne tespit edildi"
         except Exception as e:
             print(f"Nesne tespiti sırasında hata: {e}")
             return False, f"Nesne tespiti sırasında hata: {e}"
 
-    def process_folder(self, folder_path, progress_callback=None):
-        """Bir klasördeki tüm resimlerde nesne tespiti yapar"""
+    def detect_batch(
+        self,
+        image_paths,
+        batch_size=None,
+        progress_callback=None,
+        save_format=None,
+        resume=False,
+    ):
+        """
+        Resimleri gruplar halinde okur, her grup için tek ileri geçiş yapar
+
+        resume True ise aynı model ve eşikle yapılmış son çalışmada etiketi
+        yazılmış resimler atlanır.
+        """
         if not self.model:
             return False, "Model yüklenmedi"
 
-        # Klasördeki resim dosyalarını bul
-        image_extensions = [
-            ".jpg",
-            ".jpeg",
-            ".png",
-            ".bmp",
-            ".tiff",
-            ".JPG",
-            ".JPEG",
-            ".PNG",
-        ]
-        image_files = []
+        image_paths, writer, skipped = self.begin_run(image_paths, save_format, resume)
+        total = len(image_paths)
+        done = 0
+        total_objects = 0
+        failed = 0
+
+        completed = False
+        detections_iter = self.iter_detections(image_paths, batch_size, writer=writer)
+        try:
+            for image_path, detections in detections_iter:
+                done += 1
+                if detections is None:
+                    failed += 1
+                    num_objects = -1
+                else:
+                    num_objects = self.apply_detections(
+                        image_path, detections, persisted=writer is not None
+                    )
+                    total_objects += num_objects
+
+                if progress_callback:
+                    progress_callback(done, total, image_path, num_objects)
+            completed = done == total and not failed
+        finally:
+            # Bekleyen yazmalar günlüğe işlendikten sonra çalışma kapatılır
+            detections_iter.close()
+            self.finish_run(completed)
+
+        message = (
+            f"İşlem tamamlandı: {total} resimde toplam {total_objects} nesne tespit edildi"
+        )
+        if skipped:
+            message += f", {skipped} resim önceki çalışmadan atlandı"
+        if failed:
+            message += f" ({failed} resim işlenemedi)"
+        return True, message
+
+    def run_signature(self, save_format):
+        """Bir çalışmanın sürdürülebilmesi için aynı kalması gereken ayarlar"""
+        return {
+            "model": self.cache_model_key(),
+            "confidence": self.confidence_threshold,
+            "format": save_format,
+        }
+
+    def begin_run(self, image_paths, save_format, resume=False):
+        """
+        Toplu çalışmayı kontrol noktasıyla başlatır
+
+        Etiketi yazılan her resim çalışma günlüğüne eklenir. Çıktı klasörü ya
+        da yazma biçimi yoksa kontrol noktası tutulmaz.
+
+        Returns:
+            tuple: (işlenecek resimler, yazıcı, atlanan resim sayısı)
+        """
+        writer = self.label_writer(save_format)
+        if writer is None:
+            return list(image_paths), None, 0
+
+        done = self.checkpoint.start(
+            self.annotation_manager.output_dir,
+            self.run_signature(save_format),
+            image_paths,
+            resume,
+        )
+        remaining = [path for path in image_paths if path not in done]
+
+        def write(image_path, detections, image_size):
+            writer(image_path, detections, image_size)
+            self.checkpoint.mark_done(image_path)
+
+        return remaining, write, len(image_paths) - len(remaining)
+
+    def finish_run(self, completed):
+        """
+        Çalışmayı kapatır; completed False ise (iptal, hata) sürdürülebilir kalır
+        """
+        self.checkpoint.finish(completed)
+        self.detection_cache.flush()
+
+    def resumable_run(self):
+        """Çıktı klasöründe yarım kalmış çalışmanın bilgileri, yoksa None"""
+        return RunCheckpoint.resumable(self.annotation_manager.output_dir)
 
+    def iter_detections(self, image_paths, batch_size=None, writer=None):
+        """
+        Resimleri okuma → çıkarım → yazma hattından geçirir ve her resim
+        için sonucu üretir
+
+        Annotation manager'a dokunmaz; bu sayede arka plan iş parçacıklarından
+        güvenle çağrılabilir.
+
+        Yields:
+            tuple: (image_path, detections) - detections (N, 5)
+            [x, y, w, h, class_id] dizisidir, resim işlenemediyse None
+        """
+        # Önbellekte sonucu olan resimler modelden geçirilmez; özet ve arama
+        # okuyucu iş parçacıklarında, resimler işlenirken yapılır
+        cache = self.open_detection_cache()
+        lookup = None
+        if cache is not None:
+            model_key = self.cache_model_key()
+
+            def lookup(image_path):
+                try:
+                    return cache.get(image_path, model_key)
+                except Exception as e:
+                    print(f"Tespit önbelleği okunamadı: {e} - {image_path}")
+                    return None
+
+        try:
+            if self.processes > 1:
+                yield from self.iter_parallel_detections(image_paths, writer, lookup)
+                return
+
+            pipeline = DetectionPipeline(
+                self,
+                reader_threads=self.reader_threads,
+                prefetch_depth=self.prefetch_depth,
+                write_depth=self.write_queue_depth,
+                writer=writer,
+                decode_processes=self.decode_processes,
+                ring_slots=self.ring_slots,
+                letterbox_size=(
+                    self.backend.imgsz if isinstance(self.backend, OnnxBackend) else None
+                ),
+                lookup=lookup,
+            )
+            yield from pipeline.run(image_paths, batch_size)
+        finally:
+            if cache is not None:
+                cache.flush()
+
+    def worker_model(self):
+        """
+        İşçi işlemlerin yükleyeceği model dosyası ve arka uç türü
+
+        Returns:
+            tuple: (model_path, "pytorch" ya da "onnx")
+        """
+        if isinstance(self.backend, OnnxBackend):
+            return self.backend.onnx_path, "onnx"
+        return self.model_path, "pytorch"
+
+    def iter_parallel_detections(self, image_paths, writer=None, lookup=None):
+        """
+        Resimleri işçi işlemlerde etiketler; sonuçlar bu işlemde birleştirilir
+
+        Ham sonuçlar önbelleğe bu işlemde yazılır, etiket dosyaları da
+        buradan yazılır. lookup verilirse önbellek araması iş parçacıklarında
+        yapılır ve işçilere yalnızca önbellekte olmayan resimler gider.
+        iter_detections ile aynı biçimde sonuç üretir.
+        """
+        model_path, backend_kind = self.worker_model()
+        labeler = ParallelLabeler(
+            model_path,
+            backend_kind,
+            processes=self.processes,
+            threads_per_process=self.threads_per_process,
+            chunk_size=self.chunk_size,
+            floor=FLOOR_CONFIDENCE,
+        )
+
+        cache = self.open_detection_cache()
+        model_key = self.cache_model_key() if cache is not None else None
+        stop_event = threading.Event()
+
+        def produce(paths):
+            for image_path, raw in labeler.run(paths, stop_event):
+                if raw is not None and cache is not None:
+                    cache.put(image_path, model_key, raw)
+                yield image_path, raw
+
+        if lookup is None:
+            results = produce(image_paths)
+        else:
+            results = merge_cached(
+                image_paths,
+                lookup,
+                produce,
+                lambda image_path, raw: (image_path, raw),
+                threads=self.reader_threads,
+                depth=self.prefetch_depth,
+                stop_event=stop_event,
+            )
+
+        try:
+            for image_path, raw in results:
+                if raw is None:
+                    yield image_path, None
+                    continue
+
+                detections = self.filter_detections(raw)
+                if writer is not None:
+                    try:
+                        writer(image_path, detections, None)
+                    except Exception as e:
+                        print(f"Etiket dosyası yazılırken hata: {e} - {image_path}")
+                yield image_path, detections
+        finally:
+            stop_event.set()
+            results.close()
+
+    def predict_images(self, images, image_paths=None, letterbox_meta=None):
+        """
+        Çözülmüş resimler için tek ileri geçiş yapar
+
+        image_paths verilirse ham sonuçlar önbelleğe de yazılır.
+        letterbox_meta verilirse resimler ONNX arka ucu için önceden
+        letterbox'lanmıştır.
+
+        Returns:
+            list: Her resim için (N, 5) [x, y, w, h, class_id] dizisi, hata olursa None
+        """
+        try:
+            raws = self.predict_raw(images, image_paths, letterbox_meta)
+        except Exception as e:
+            print(f"Toplu nesne tespiti sırasında hata: {e}")
+            return None
+
+        return [self.filter_detections(raw) for raw in raws]
+
+    def predict_raw(self, images, image_paths=None, letterbox_meta=None):
+        """
+        Tüm grup için tek ileri geçiş yapar; sonuçlar en düşük eşikte tutulur
+
+        Returns:
+            list: Her resim için (N, 6) [x1, y1, x2, y2, score, class_id] dizisi
+        """
+        if letterbox_meta is not None:
+            outputs = self.backend.predict_letterboxed(
+                images, letterbox_meta, FLOOR_CONFIDENCE
+            )
+        else:
+            outputs = self.backend.predict(images, FLOOR_CONFIDENCE)
+        raws = [pack_raw(output) for output in outputs]
+
+        cache = self.open_detection_cache()
+        if cache is not None and image_paths is not None:
+            model_key = self.cache_model_key()
+            for image_path, raw in zip(image_paths, raws):
+                cache.put(image_path, model_key, raw)
+        return raws
+
+    def filter_detections(self, raw, conf=None):
+        """Ham tespitleri eşiğe göre süzer ve (N, 5) [x, y, w, h, class_id] yapar"""
+        if conf is None:
+            conf = self.confidence_threshold
+        return self._to_rectangles(filter_raw(raw, conf))
+
+    def open_detection_cache(self):
+        """Çıktı klasörünün tespit önbelleğini açar; klasör yoksa None"""
+        output_dir = self.annotation_manager.output_dir
+        if not output_dir or self.model is None:
+            return None
+        self.detection_cache.open(os.path.join(output_dir, DetectionCache.FILENAME))
+        return self.detection_cache
+
+    def cache_model_key(self):
+        """Model dosyasının özeti ve sonucu etkileyen çıkarım ayarları"""
+        try:
+            mtime_ns = os.stat(self.model_path).st_mtime_ns
+        except OSError:
+            mtime_ns = 0
+        entry = self._model_hashes.get(self.model_path)
+        if entry is None or entry[0] != mtime_ns:
+            entry = (mtime_ns, file_hash(self.model_path))
+            self._model_hashes[self.model_path] = entry
+
+        imgsz = getattr(self.backend, "imgsz", DEFAULT_IMGSZ)
+        iou = getattr(self.backend, "iou", DEFAULT_IOU)
+        return f"{entry[1]}|{self.backend_name}|{imgsz}|{iou}|{FLOOR_CONFIDENCE}"
+
+    def cached_raw(self, image_path):
+        """Resmin etkin model için önbellekteki ham tespitleri, yoksa None"""
+        cache = self.open_detection_cache()
+        if cache is None:
+            return None
+        return cache.get(image_path, self.cache_model_key())
+
+    def matches_auto_labels(self, image_path, conf):
+        """
+        Resmin mevcut kutuları, önbellekteki tespitlerin conf eşiğiyle süzülmüş
+        haliyle aynı mı (otomatik etiketlemeden sonra elle düzenlenmemiş mi)
+
+        Etiket dosyasından (YOLO) okunan kutular yuvarlama nedeniyle bir iki
+        piksel farklı olabilir.
+        """
+        raw = self.cached_raw(image_path)
+        if raw is None:
+            return False
+        expected = self.filter_detections(raw, conf)
+        boxes, classes = self.annotation_manager.get_annotation_arrays(image_path)
+        if len(boxes) != len(expected):
+            return False
+        return np.array_equal(classes, expected[:, 4]) and np.allclose(
+            boxes, expected[:, :4], atol=2
+        )
+
+    def refilter(self, image_paths, conf=None):
+        """
+        Önbellekteki ham tespitleri yeni eşikle süzüp annotationlara uygular
+
+        Model çalıştırılmaz; önbellekte sonucu olmayan resimler atlanır.
+
+        Returns:
+            int: Güncellenen resim sayısı
+        """
+        cache = self.open_detection_cache()
+        if cache is None:
+            return 0
+
+        model_key = self.cache_model_key()
+        updated = 0
+        for image_path in image_paths:
+            raw = cache.get(image_path, model_key)
+            if raw is None:
+                continue
+            self.apply_detections(image_path, self.filter_detections(raw, conf))
+            updated += 1
+        return updated
+
+    def label_writer(self, save_format):
+        """Yazma aşaması için etiket dosyası yazıcısını döndürür"""
+        if save_format is None or not self.annotation_manager.output_dir:
+            return None
+
+        def write(image_path, detections, image_size):
+            try:
+                if len(detections):
+                    written = self.annotation_manager.write_label_file(
+                        image_path, detections, save_format, image_size
+                    )
+                    if not written:
+                        raise ValueError("resim boyutu okunamadı")
+                else:
+                    self.annotation_manager.remove_label_file(image_path)
+            except Exception:
+                # Yazılamayan resim bir sonraki kayıtta yeniden denenir
+                self.annotation_manager.mark_dirty(image_path)
+                raise
+
+        return write
+
+    def _to_rectangles(self, output):
+        """Arka uç çıktısını (N, 5) [x, y, w, h, class_id] dizisine çevirir"""
+        boxes, _, classes = output  # x1, y1, x2, y2 formatında kutular
+        return xyxy_to_rectangles(boxes, classes)
+
+    def apply_detections(self, image_path, detections, persisted=False):
+        """
+        Tespitleri, resmin mevcut annotationlarının yerine yazar
+
+        persisted True ise etiket dosyasını yazma aşaması yazar; resim
+        değişmiş olarak işaretlenmez. Yazma başarısız olursa resmi yazıcı
+        işaretler; sonuç yazmadan önce ya da sonra gelse de işaret kaybolmaz.
+        """
+        # Mevcut annotationları tek düzenlemede tespitlerle değiştir
+        self.annotation_manager.set_rectangles(
+            image_path, detections, persisted=persisted
+        )
+
+        return len(detections)
+
+    def find_images(self, folder_path):
+        """Bir klasördeki (alt klasörler dahil) resim dosyalarını bulur"""
+        image_files = []
         for root, _, files in os.walk(folder_path):
             for file in files:
-                if any(file.lower().endswith(ext) for ext in image_extensions):
+                if any(file.lower().endswith(ext) for ext in IMAGE_EXTENSIONS):
                     image_files.append(os.path.join(root, file))
+        return image_files
+
+    def process_folder(
+        self,
+        folder_path,
+        progress_callback=None,
+        batch_size=None,
+        save_format="yolo",
+        processes=None,
+        threads_per_process=None,
+        resume=False,
+    ):
+        """
+        Bir klasördeki tüm resimlerde nesne tespiti yapar
+
+        processes 1'den büyükse resimler o kadar işçi işlemde, her biri
+        threads_per_process iş parçacığıyla işlenir. resume True ise yarım
+        kalan son çalışma kaldığı yerden sürdürülür.
+        """
+        if not self.model:
+            return False, "Model yüklenmedi"
+
+        if processes is not None:
+            self.processes = max(1, int(processes))
+        if threads_per_process is not None:
+            self.threads_per_process = max(0, int(threads_per_process))
+
+        # Klasördeki resim dosyalarını bul
+        image_files = self.find_images(folder_path)
 
         if not image_files:
             return False, "Klasörde resim bulunamadı"
 
-        # Her resim için nesne tespiti yap
-        total_objects = 0
-        for i, image_path in enumerate(image_files):
-            success, message = self.detect_objects(image_path)
-            if success:
-                num_objects = len(self.annotation_manager.get_annotations(image_path))
-                total_objects += num_objects
-
-                # İlerleme geri çağrısı
-                if progress_callback:
-                    progress_callback(i + 1, len(image_files), image_path, num_objects)
-            else:
-                print(f"Hata: {message} - {image_path}")
+        def on_progress(done, total, image_path, num_objects):
+            if num_objects < 0:
+                print(f"Hata: Nesne tespiti başarısız - {image_path}")
+            elif progress_callback:
+                progress_callback(done, total, image_path, num_objects)
 
-        return (
-            True,
-            f"İşlem tamamlandı: {len(image_files)} resimde toplam {total_objects} nesne tespit edildi",
+        # Resimleri gruplar halinde işle, etiketleri bittikçe yaz
+        result = self.detect_batch(
+            image_files,
+            batch_size=batch_size,
+            progress_callback=on_progress,
+            save_format=save_format,
+            resume=resume,
         )
+        if save_format is not None and self.annotation_manager.classes_file:
+            self.annotation_manager.save_classes()
+        return result
@@ -0,0 +1,208 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+def model_nbytes(model, model_path=""):
+    """
+    Yüklü bir modelin bellekte kapladığı yaklaşık bayt
+
+    PyTorch modüllerinde parametre ve tampon boyutları toplanır; bu
+    mümkün değilse model dosyasının boyutu kullanılır.
+    """
+    module = getattr(model, "model", model)
+    try:
+        total = 0
+        for tensor in list(module.parameters()) + list(module.buffers()):
+            total += tensor.numel() * tensor.element_size()
+        if total:
+            return total
+    except Exception:
+        pass
+    try:
+        return os.path.getsize(model_path)
+    except OSError:
+        return 0
+
+
+class ModelRegistry:
+    """
+    Yüklenmiş modelleri tutan, boyuta göre sınırlı LRU
+
+    Modeller dosya yolu ve değiştirilme zamanıyla eşleştirilir; dosya
+    değiştiyse yeniden yüklenir. Yeni yüklenen model bir ısınma geçişinden
+    geçirilir, böylece ilk gerçek çıkarım ilk çalıştırma maliyetini ödemez.
+    Model sayısı ya da toplam bellek sınırı aşılınca en uzun süredir
+    kullanılmayan model atılır; etkin model (pin) ve en son yüklenen model
+    atılmaz. Bir modelin arka uç sürümleri (ör. ONNX, INT8) ayrı kayıt
+    değil, modelin kaydının altında tutulur ve onunla birlikte atılır.
+    """
+
+    def __init__(self, max_models=3, max_bytes=2 * 1024 * 1024 * 1024, warmup_size=640):
+        """
+        Args:
+            max_models (int): Aynı anda bellekte tutulacak en fazla model
+            max_bytes (int): Modellerin toplam bellek sınırı
+            warmup_size (int): Isınma geçişindeki boş resmin kenar uzunluğu,
+                0 ise ısınma yapılmaz
+        """
+        self.max_models = max_models
+        self.max_bytes = max_bytes
+        self.warmup_size = warmup_size
+        # key -> [model, nbytes, model_path, {variant_path: (variant, nbytes)}]
+        self._models = OrderedDict()
+        self._total = 0
+        self._pinned = ""  # Etkin modelin mutlak yolu
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def model_key(model_path):
+        path = os.path.abspath(model_path)
+        try:
+            return path, os.stat(path).st_mtime_ns
+        except OSError:
+            return path, 0
+
+    def get(self, model_path):
+        """Yüklüyse modeli döndürür (en son kullanılan yapar), yoksa None"""
+        key = self.model_key(model_path)
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is None:
+                return None
+            self._models.move_to_end(key)
+            return entry[0]
+
+    def load(self, model_path, loader):
+        """
+        Modeli önbellekten döndürür ya da loader(model_path) ile yükler
+
+        Returns:
+            tuple: (model, cached) - cached, model önbellekten geldiyse True
+        """
+        model = self.get(model_path)
+        if model is not None:
+            return model, True
+
+        started = time.perf_counter()
+        model = loader(model_path)
+        self.warm_up(model)
+        nbytes = model_nbytes(model, model_path)
+        print(
+            f"Model yüklendi ve ısındı: {os.path.basename(model_path)}, "
+            f"{nbytes / (1024 * 1024):.1f} MB, {time.perf_counter() - started:.2f} sn"
+        )
+
+        key = self.model_key(model_path)
+        with self._lock:
+            # Aynı dosyanın eski sürümleri artık geçersiz
+            for old_key in [k for k in self._models if k[0] == key[0]]:
+                self._discard(old_key)
+            self._models[key] = [model, nbytes, model_path, {}]
+            self._total += nbytes
+            self._evict()
+        return model, False
+
+    def load_variant(self, model_path, variant_path, loader):
+        """
+        Yüklü bir modelin arka uç sürümünü döndürür ya da loader ile yükler
+
+        Sürüm, modelin kaydında tutulur ve belleği modelinkine eklenir;
+        model atılınca sürümleri de atılır.
+
+        Returns:
+            tuple: (variant, cached)
+        """
+        key = self.model_key(model_path)
+        variant_key = self.model_key(variant_path)
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is None:
+                raise KeyError(f"Model yüklü değil: {model_path}")
+            self._models.move_to_end(key)
+            cached = entry[3].get(variant_key)
+            if cached is not None:
+                return cached[0], True
+
+        started = time.perf_counter()
+        variant = loader(variant_path)
+        self.warm_up(variant)
+        nbytes = model_nbytes(variant, variant_path)
+        print(
+            f"Arka uç yüklendi ve ısındı: {os.path.basename(variant_path)}, "
+            f"{nbytes / (1024 * 1024):.1f} MB, {time.perf_counter() - started:.2f} sn"
+        )
+
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is None:
+                # Bu arada model atıldıysa sürüm önbelleğe alınmaz
+                return variant, False
+            variants = entry[3]
+            # Aynı dosyanın eski sürümleri artık geçersiz
+            for old_key in [k for k in variants if k[0] == variant_key[0]]:
+                entry[1] -= variants[old_key][1]
+                self._total -= variants.pop(old_key)[1]
+            variants[variant_key] = (variant, nbytes)
+            entry[1] += nbytes
+            self._total += nbytes
+            self._evict()
+        return variant, False
+
+    def pin(self, model_path):
+        """Etkin modeli işaretler; etkin model bellekten atılmaz"""
+        with self._lock:
+            self._pinned = os.path.abspath(model_path) if model_path else ""
+            self._evict()
+
+    def warm_up(self, model):
+        """Modeli boş bir resimle bir kez çalıştırır"""
+        if not self.warmup_size:
+            return
+        try:
+            # Çıkarım arka uçları kendi ısınma geçişini yapar
+            if hasattr(model, "warm_up"):
+                model.warm_up(self.warmup_size)
+                return
+            image = np.zeros((self.warmup_size, self.warmup_size, 3), dtype=np.uint8)
+            model(image, verbose=False)
+        except Exception as e:
+            print(f"Model ısınma geçişi başarısız: {e}")
+
+    def _evict(self):
+        # Etkin model ve en son yüklenen model her zaman kalır
+        while len(self._models) > self.max_models or self._total > self.max_bytes:
+            newest = next(reversed(self._models))
+            key = next(
+                (k for k in self._models if k != newest and k[0] != self._pinned),
+                None,
+            )
+            if key is None:
+                break
+            print(f"Model bellekten çıkarıldı: {os.path.basename(key[0])}")
+            self._discard(key)
+
+    def _discard(self, key):
+        entry = self._models.pop(key, None)
+        if entry is not None:
+            self._total -= entry[1]
+
+    def remove(self, model_path):
+        with self._lock:
+            self._discard(self.model_key(model_path))
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+            self._total = 0
+
+    def loaded_paths(self):
+        """Yüklü modellerin yolları (en son kullanılan en sonda, sürümler hariç)"""
+        with self._lock:
+            return [entry[2] for entry in self._models.values()]
+
+    def total_bytes(self):
+        return self._total
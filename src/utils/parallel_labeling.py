@@ -0,0 +1,249 @@
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+
+# Görev kuyruğunda işçiye bitişi bildiren işaret
+_STOP = None
+
+
+def default_threads(processes):
+    """İşlem başına iş parçacığı: çekirdekler işlemlere eşit bölünür"""
+    return max(1, (os.cpu_count() or 1) // max(1, processes))
+
+
+def _set_thread_env(threads):
+    # Kütüphaneler yüklenmeden önce ayarlanmalı; aksi halde her işlem tüm
+    # çekirdekleri kullanmaya çalışır ve işlemler birbirini yavaşlatır
+    for name in (
+        "OMP_NUM_THREADS",
+        "MKL_NUM_THREADS",
+        "OPENBLAS_NUM_THREADS",
+        "NUMEXPR_NUM_THREADS",
+    ):
+        os.environ[name] = str(threads)
+
+
+def _create_backend(model_path, backend_kind, threads):
+    """İşçi işleminde modelin kendi kopyasını yükler"""
+    from src.utils.inference_backends import OnnxBackend, UltralyticsBackend
+
+    if backend_kind == "onnx":
+        return OnnxBackend(model_path, threads=threads)
+
+    import torch
+    from ultralytics import YOLO
+
+    torch.set_num_threads(threads)
+    torch.set_num_interop_threads(1)
+    return UltralyticsBackend(YOLO(model_path), device="cpu")
+
+
+def _worker_main(model_path, backend_kind, threads, floor, task_queue, result_queue):
+    """
+    İşçi işlemi: görev kuyruğundan resim grupları alır, ham tespitleri döndürür
+
+    Kuyruk tüm işçilerce paylaşılır; işini bitiren işçi bir sonraki grubu
+    alır, böylece yavaş resimler bir işçide birikmez.
+    """
+    _set_thread_env(threads)
+    import cv2
+
+    from src.utils.detection_cache import pack_raw
+
+    cv2.setNumThreads(1)
+    try:
+        backend = _create_backend(model_path, backend_kind, threads)
+    except Exception as e:
+        result_queue.put(("error", f"Model yüklenemedi: {e}"))
+        return
+    result_queue.put(("ready", os.getpid()))
+
+    while True:
+        chunk = task_queue.get()
+        if chunk is _STOP:
+            break
+
+        paths = []
+        images = []
+        results = []
+        for image_path in chunk:
+            image = cv2.imread(image_path)
+            if image is None:
+                results.append((image_path, None))
+            else:
+                paths.append(image_path)
+                images.append(image)
+
+        if images:
+            try:
+                outputs = backend.predict(images, floor)
+                results.extend(
+                    (image_path, pack_raw(output))
+                    for image_path, output in zip(paths, outputs)
+                )
+            except Exception as e:
+                print(f"İşçi {os.getpid()}: nesne tespiti sırasında hata: {e}")
+                results.extend((image_path, None) for image_path in paths)
+        result_queue.put(("results", results))
+
+
+class ParallelLabeler:
+    """
+    Resimleri birden fazla işlemde, her biri kendi model kopyasıyla etiketler
+
+    Resim listesi küçük gruplara bölünüp paylaşılan bir kuyruğa konur; boşta
+    kalan işçi sıradaki grubu alır (iş çalma yerine dinamik yük dengeleme).
+    Sonuçlar ana işleme ham (N, 6) diziler olarak döner ve orada
+    birleştirilir. Toplam çekirdek kullanımı işlem × iş parçacığıdır.
+    """
+
+    def __init__(
+        self,
+        model_path,
+        backend_kind="pytorch",
+        processes=2,
+        threads_per_process=0,
+        chunk_size=4,
+        floor=0.05,
+    ):
+        """
+        Args:
+            model_path (str): İşçilerin yükleyeceği model (.pt ya da .onnx)
+            backend_kind (str): "pytorch" ya da "onnx"
+            processes (int): İşçi işlem sayısı
+            threads_per_process (int): İşlem başına çıkarım iş parçacığı (0: otomatik)
+            chunk_size (int): Bir görevdeki resim sayısı (aynı zamanda grup boyutu)
+            floor (float): Ham tespitlerin tutulduğu en düşük güven eşiği
+        """
+        self.model_path = model_path
+        self.backend_kind = backend_kind
+        self.processes = max(1, int(processes))
+        self.threads_per_process = int(threads_per_process) or default_threads(
+            self.processes
+        )
+        self.chunk_size = max(1, int(chunk_size))
+        self.floor = floor
+
+    def run(self, image_paths, stop_event=None):
+        """
+        Resimleri işler ve her resim için (image_path, raw) üretir
+
+        raw, (N, 6) [x1, y1, x2, y2, score, class_id] dizisidir; resim
+        okunamadıysa ya da işlenemediyse None olur. Sonuçların sırası
+        işlerin bitiş sırasıdır. image_paths bir liste ya da yolları
+        sırayla üreten bir yineleyici olabilir; yineleyiciden yollar bir
+        besleme iş parçacığıyla, geldikçe gruplanıp kuyruğa konur.
+        """
+        paths = iter(image_paths)
+        first = next(paths, None)
+        if first is None:
+            return
+        if hasattr(image_paths, "__len__"):
+            process_count = min(
+                self.processes, -(-len(image_paths) // self.chunk_size)
+            )
+        else:
+            process_count = self.processes
+
+        # Ana işlem Qt vb. iş parçacıkları taşıdığından fork yerine spawn
+        context = multiprocessing.get_context("spawn")
+        task_queue = context.Queue()
+        result_queue = context.Queue()
+
+        workers = []
+        for _ in range(process_count):
+            process = context.Process(
+                target=_worker_main,
+                args=(
+                    self.model_path,
+                    self.backend_kind,
+                    self.threads_per_process,
+                    self.floor,
+                    task_queue,
+                    result_queue,
+                ),
+                daemon=True,
+            )
+            process.start()
+            workers.append(process)
+        print(
+            f"Paralel etiketleme: {len(workers)} işlem × "
+            f"{self.threads_per_process} iş parçacığı"
+        )
+
+        submitted = []  # Kuyruğa konan resimler (besleme sırasıyla)
+        unsent = []  # Besleme durdurulunca kuyruğa konamayanlar
+        fed_all = threading.Event()
+        feed_stop = threading.Event()
+
+        def feed():
+            chunk = []
+            try:
+                for image_path in itertools.chain([first], paths):
+                    chunk.append(image_path)
+                    if feed_stop.is_set() or (
+                        stop_event is not None and stop_event.is_set()
+                    ):
+                        unsent.extend(chunk)
+                        return
+                    if len(chunk) >= self.chunk_size:
+                        submitted.extend(chunk)
+                        task_queue.put(chunk)
+                        chunk = []
+                if chunk:
+                    submitted.extend(chunk)
+                    task_queue.put(chunk)
+            finally:
+                for _ in workers:
+                    task_queue.put(_STOP)
+                fed_all.set()
+
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+
+        received = set()
+        failed_workers = 0
+        try:
+            while not (fed_all.is_set() and len(received) >= len(submitted)):
+                if stop_event is not None and stop_event.is_set():
+                    break
+                try:
+                    kind, payload = result_queue.get(timeout=0.5)
+                except queue.Empty:
+                    if not any(process.is_alive() for process in workers):
+                        print("Tüm işçi işlemler sonlandı")
+                        break
+                    continue
+
+                if kind == "error":
+                    print(payload)
+                    failed_workers += 1
+                    if failed_workers == len(workers):
+                        break
+                elif kind == "results":
+                    for image_path, raw in payload:
+                        received.add(image_path)
+                        yield image_path, raw
+
+            if stop_event is not None and stop_event.is_set():
+                return
+
+            # İşçiler sonlandıysa kalan resimler işlenemedi
+            feed_stop.set()
+            feeder.join()
+            for image_path in itertools.chain(submitted, unsent, paths):
+                if image_path not in received:
+                    received.add(image_path)
+                    yield image_path, None
+        finally:
+            feed_stop.set()
+            for process in workers:
+                if process.is_alive():
+                    process.terminate()
+            for process in workers:
+                process.join(timeout=5)
+            feeder.join(timeout=5)
+            task_queue.cancel_join_thread()
+            result_queue.cancel_join_thread()
@@ -0,0 +1,207 @@
+import os
+import random
+import time
+
+import numpy as np
+
+from src.utils.inference_backends import box_iou, compare_outputs, letterbox
+
+
+def int8_path_for(onnx_path):
+    """FP32 ONNX modelinin INT8 karşılığının yolu"""
+    return os.path.splitext(onnx_path)[0] + ".int8.onnx"
+
+
+def sample_images(image_paths, sample_size, seed=0):
+    """Klasördeki resimlerden tekrarlanabilir bir örneklem seçer"""
+    if len(image_paths) <= sample_size:
+        return list(image_paths)
+    return random.Random(seed).sample(list(image_paths), sample_size)
+
+
+def _calibration_reader(input_name, image_paths, imgsz):
+    """Kalibrasyon resimlerini letterbox'lanmış tensörler olarak veren okuyucu"""
+    import cv2
+    from onnxruntime.quantization import CalibrationDataReader
+
+    class _Reader(CalibrationDataReader):
+        def __init__(self):
+            self._paths = iter(image_paths)
+
+        def get_next(self):
+            for path in self._paths:
+                image = cv2.imread(path)
+                if image is None:
+                    print(f"Kalibrasyon resmi okunamadı: {path}")
+                    continue
+                tensor, _, _ = letterbox(image, imgsz)
+                return {input_name: tensor[None]}
+            return None
+
+    return _Reader()
+
+
+def quantize_int8(onnx_path, image_paths, sample_size=64, imgsz=(640, 640), output_path=None):
+    """
+    FP32 ONNX modelini statik INT8'e dönüştürür
+
+    Aktivasyon aralıkları açık klasörden seçilen resimlerle kalibre edilir;
+    ağırlıklar kanal başına nicemlenir (QDQ biçimi).
+
+    Returns:
+        str: INT8 modelin yolu
+    """
+    import onnxruntime as ort
+    from onnxruntime.quantization import (
+        CalibrationMethod,
+        QuantFormat,
+        QuantType,
+        quantize_static,
+    )
+
+    output_path = output_path or int8_path_for(onnx_path)
+    calibration_paths = sample_images(image_paths, sample_size)
+    if not calibration_paths:
+        raise ValueError("Kalibrasyon için resim yok")
+
+    session = ort.InferenceSession(onnx_path, providers=["CPUExecutionProvider"])
+    input_name = session.get_inputs()[0].name
+    del session
+
+    started = time.perf_counter()
+    print(f"INT8 kalibrasyonu: {len(calibration_paths)} resim")
+    quantize_static(
+        onnx_path,
+        output_path,
+        _calibration_reader(input_name, calibration_paths, imgsz),
+        quant_format=QuantFormat.QDQ,
+        per_channel=True,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        calibrate_method=CalibrationMethod.MinMax,
+    )
+    print(f"INT8 model yazıldı: {output_path} ({time.perf_counter() - started:.1f} sn)")
+    return output_path
+
+
+def match_ground_truth(output, gt_boxes, gt_classes, iou_threshold=0.5):
+    """
+    Tespitleri mevcut annotationlarla eşleştirir
+
+    Args:
+        output (tuple): Arka uç çıktısı (boxes xyxy, scores, classes)
+        gt_boxes (np.ndarray): (N, 4) [x, y, w, h] annotation kutuları
+
+    Returns:
+        tuple: (doğru tespit, tespit sayısı, annotation sayısı)
+    """
+    boxes, scores, classes = output
+    gt = np.asarray(gt_boxes, dtype=np.float64).reshape(-1, 4)
+    gt_xyxy = np.concatenate([gt[:, :2], gt[:, :2] + gt[:, 2:]], axis=1)
+    gt_classes = np.asarray(gt_classes).reshape(-1)
+
+    used = np.zeros(len(gt_xyxy), dtype=bool)
+    true_positives = 0
+    # Yüksek skorlu tespitler önce eşleşir
+    for index in np.argsort(-scores):
+        candidates = np.flatnonzero((gt_classes == classes[index]) & ~used)
+        if not len(candidates):
+            continue
+        ious = box_iou(boxes[index], gt_xyxy[candidates])
+        best = ious.argmax()
+        if ious[best] >= iou_threshold:
+            used[candidates[best]] = True
+            true_positives += 1
+    return true_positives, len(boxes), len(gt_xyxy)
+
+
+def accuracy_report(
+    fp32_backend, int8_backend, image_paths, annotation_manager, conf, sample_size=64, exclude=()
+):
+    """
+    INT8 modeli FP32 modelle ve mevcut annotationlarla karşılaştırır
+
+    exclude içindeki resimler (kalibrasyon örneklemi) değerlendirmeye
+    alınmaz; aksi halde INT8 model kalibre edildiği resimlerle ölçülürdü.
+
+    Returns:
+        dict: Her model için hız, annotationlara göre kesinlik/duyarlılık ve
+        INT8'in FP32'ye göre eşleşme istatistikleri
+    """
+    import cv2
+
+    excluded = set(exclude)
+    candidates = [path for path in image_paths if path not in excluded]
+    # Değerlendirme yalnızca etiketi olan resimlerde yapılır
+    labeled = [
+        path for path in candidates if len(annotation_manager.get_annotation_arrays(path)[0])
+    ]
+    paths = sample_images(labeled or candidates, sample_size, seed=1)
+
+    stats = {
+        name: {"seconds": 0.0, "tp": 0, "detections": 0, "annotations": 0}
+        for name in ("fp32", "int8")
+    }
+    agreement = {"matched": 0, "missing": 0, "extra": 0, "max_offset": 0.0}
+    images = 0
+    for path in paths:
+        image = cv2.imread(path)
+        if image is None:
+            continue
+        images += 1
+        gt_boxes, gt_classes = annotation_manager.get_annotation_arrays(path)
+
+        outputs = {}
+        for name, backend in (("fp32", fp32_backend), ("int8", int8_backend)):
+            started = time.perf_counter()
+            outputs[name] = backend.predict([image], conf)[0]
+            stats[name]["seconds"] += time.perf_counter() - started
+            tp, detections, annotations = match_ground_truth(
+                outputs[name], gt_boxes, gt_classes
+            )
+            stats[name]["tp"] += tp
+            stats[name]["detections"] += detections
+            stats[name]["annotations"] += annotations
+
+        diff = compare_outputs(outputs["fp32"], outputs["int8"], iou_threshold=0.5)
+        for key in ("matched", "missing", "extra"):
+            agreement[key] += diff[key]
+        agreement["max_offset"] = max(agreement["max_offset"], diff["max_offset"])
+
+    for row in stats.values():
+        row["images_per_second"] = images / row["seconds"] if row["seconds"] else 0.0
+        row["precision"] = row["tp"] / row["detections"] if row["detections"] else 0.0
+        row["recall"] = row["tp"] / row["annotations"] if row["annotations"] else 0.0
+    return {"images": images, "labeled": bool(labeled), "models": stats, "agreement": agreement}
+
+
+def format_accuracy_report(report):
+    """accuracy_report() sonucunu okunabilir metne çevirir"""
+    fp32 = report["models"]["fp32"]
+    int8 = report["models"]["int8"]
+    agreement = report["agreement"]
+    if not report["images"]:
+        return "Doğruluk ölçülemedi: kalibrasyonda kullanılmayan, okunabilen resim yok."
+    speedup = (
+        int8["images_per_second"] / fp32["images_per_second"]
+        if fp32["images_per_second"]
+        else 0.0
+    )
+    reference = "mevcut annotationlar" if report["labeled"] else "annotation yok"
+
+    lines = [
+        f"{report['images']} resim ({reference})",
+        f"{'Model':<6} {'resim/sn':>9} {'kesinlik':>9} {'duyarlılık':>11}",
+    ]
+    for name, row in (("FP32", fp32), ("INT8", int8)):
+        lines.append(
+            f"{name:<6} {row['images_per_second']:>9.1f} "
+            f"{row['precision']:>9.3f} {row['recall']:>11.3f}"
+        )
+    lines.append(f"Hızlanma: {speedup:.2f}x")
+    lines.append(
+        f"INT8 / FP32 uyumu: {agreement['matched']} eşleşen, "
+        f"{agreement['missing']} eksik, {agreement['extra']} fazla, "
+        f"en büyük sapma {agreement['max_offset']:.1f} px"
+    )
+    return "\n".join(lines)
@@ -0,0 +1,147 @@
+import json
+import os
+import threading
+import time
+
+
+class RunCheckpoint:
+    """
+    Toplu etiketleme çalışmasının ilerlemesini diskte tutar
+
+    Çalışma bilgileri (model anahtarı, güven eşiği, biçim) bir JSON
+    dosyasında, etiketi yazılmış resimler de yalnızca eklenen bir günlükte
+    saklanır. Etiket dosyaları zaten resim bittikçe yazıldığından, çökme ya
+    da yeniden başlatmadan sonra aynı model ve eşikle devam edilince
+    günlükteki resimler atlanır.
+    """
+
+    FILENAME = ".run_checkpoint.json"
+    LOG_FILENAME = ".run_checkpoint.log"
+
+    def __init__(self, sync_interval=1.0):
+        """
+        Args:
+            sync_interval (float): Günlüğün diske zorla yazılması (fsync)
+                arasındaki en az süre (sn); süreç çökse de satırlar işletim
+                sistemine her resimde aktarılır
+        """
+        self.sync_interval = sync_interval
+        self.output_dir = ""
+        self.meta = None
+        self._log = None
+        self._last_sync = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load_meta(cls, output_dir):
+        """Klasördeki son çalışmanın bilgileri, yoksa None"""
+        if not output_dir:
+            return None
+        try:
+            with open(os.path.join(output_dir, cls.FILENAME), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @classmethod
+    def resumable(cls, output_dir):
+        """Yarım kalmış bir çalışma varsa bilgilerini döndürür, yoksa None"""
+        meta = cls.load_meta(output_dir)
+        if meta is None or meta.get("finished"):
+            return None
+        return meta
+
+    @classmethod
+    def read_done(cls, output_dir):
+        """Günlükteki tamamlanmış resim yolları"""
+        try:
+            with open(os.path.join(output_dir, cls.LOG_FILENAME), "r", encoding="utf-8") as f:
+                # Çökmede yarım kalan son satır hiçbir resimle eşleşmez
+                return {line.rstrip("\n") for line in f if line.endswith("\n")}
+        except OSError:
+            return set()
+
+    def start(self, output_dir, signature, image_paths, resume=False):
+        """
+        Bir çalışma başlatır ya da son çalışmayı sürdürür
+
+        Yalnızca son çalışma aynı ayarlarla (signature) yapılmışsa sürdürülür;
+        aksi halde yeni bir çalışma başlar ve eski günlük silinir.
+
+        Returns:
+            set: Atlanacak (önceden tamamlanmış) resim yolları
+        """
+        self.close()
+        self.output_dir = output_dir
+
+        done = set()
+        previous = self.load_meta(output_dir)
+        if resume and previous is not None and previous.get("signature") == signature:
+            done = self.read_done(output_dir) & set(image_paths)
+            self.meta = previous
+            self.meta["finished"] = False
+            mode = "a"
+            print(f"Önceki çalışma sürdürülüyor: {len(done)} resim atlanacak")
+        else:
+            if resume:
+                print("Sürdürülecek uygun çalışma yok, yeni çalışma başlatılıyor")
+            self.meta = {
+                "signature": signature,
+                "total": len(image_paths),
+                "started": time.time(),
+                "finished": False,
+            }
+            mode = "w"
+
+        self.meta["updated"] = time.time()
+        self._write_meta()
+        self._log = open(
+            os.path.join(output_dir, self.LOG_FILENAME), mode, encoding="utf-8"
+        )
+        self._last_sync = time.monotonic()
+        return done
+
+    def mark_done(self, image_path):
+        """Resmin etiketinin yazıldığını günlüğe ekler"""
+        with self._lock:
+            if self._log is None:
+                return
+            self._log.write(image_path + "\n")
+            self._log.flush()
+            now = time.monotonic()
+            if now - self._last_sync >= self.sync_interval:
+                os.fsync(self._log.fileno())
+                self._last_sync = now
+
+    def finish(self, completed=True):
+        """
+        Çalışmayı kapatır
+
+        completed True ise çalışma bitmiş sayılır ve artık sürdürülemez;
+        iptal edilen ya da hatalı resimleri olan çalışmalar sürdürülebilir kalır.
+        """
+        if self.meta is None:
+            return
+        self.meta["finished"] = bool(completed)
+        self.meta["updated"] = time.time()
+        self.close()
+        self._write_meta()
+
+    def close(self):
+        with self._lock:
+            if self._log is None:
+                return
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._log.close()
+            self._log = None
+
+    def _write_meta(self):
+        # Yarım yazılmış dosya kalmaması için önce geçici dosyaya yazılır
+        path = os.path.join(self.output_dir, self.FILENAME)
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self.meta, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
@@ -0,0 +1,54 @@
+import importlib
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    """
+    Açılış aşamalarının ve modül içe aktarmalarının sürelerini ölçer
+
+    Süreler ilk oluşturulma anından itibaren kaydedilir; report() hangi
+    aşamanın ya da içe aktarmanın ne kadar sürdüğünü yazdırır. Arka plan
+    iş parçacıklarından da güvenle çağrılabilir.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.entries = []  # (etiket, süre sn, iş parçacığı adı)
+        self._lock = threading.Lock()
+
+    def record(self, label, seconds):
+        with self._lock:
+            self.entries.append((label, seconds, threading.current_thread().name))
+
+    @contextmanager
+    def measure(self, label):
+        """with bloğunun süresini label adıyla kaydeder"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(label, time.perf_counter() - started)
+
+    def timed_import(self, module_name):
+        """Bir modülü içe aktarır ve süresini kaydeder"""
+        with self.measure(f"import {module_name}"):
+            return importlib.import_module(module_name)
+
+    def elapsed(self):
+        """Ölçümün başından beri geçen süre (sn)"""
+        return time.perf_counter() - self.start
+
+    def report(self, title="Açılış süreleri"):
+        """Kaydedilen süreleri tablo olarak yazdırır"""
+        with self._lock:
+            entries = list(self.entries)
+        print(f"{title} (toplam {self.elapsed() * 1000:.0f} ms):")
+        for label, seconds, thread_name in entries:
+            where = "" if thread_name == "MainThread" else f" [{thread_name}]"
+            print(f"  {seconds * 1000:8.1f} ms  {label}{where}")
+
+
+# Uygulama genelinde paylaşılan ölçüm nesnesi
+startup_timer = StartupTimer()